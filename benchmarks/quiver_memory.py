@@ -0,0 +1,47 @@
+"""Measure the peak memory of building and serializing a large Quiver.
+
+Usage: python benchmarks/quiver_memory.py [--count 10000000]
+"""
+import os, sys, argparse, time, tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from volum.objects import Quiver
+from volum.core.buffers import BufferStore, pack_array
+
+
+def measure(name: str, make_args, count: int):
+    """Build a Quiver from fresh input arrays and serialize it for the viewer, reporting the peak memory beyond the inputs."""
+    args = make_args(count)
+    input_size = sum(arg.nbytes for arg in args)
+
+    tracemalloc.start() # NumPy reports its allocations to tracemalloc
+    start = time.perf_counter()
+    quiver = Quiver(*args)
+    _, build_peak = tracemalloc.get_traced_memory()
+    build_time = time.perf_counter() - start
+
+    tracemalloc.reset_peak()
+    store = BufferStore()
+    with store.collect():
+        quiver.to_dict()
+    current, serialize_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mb = 1024 ** 2
+    print(f"{name:28s} input {input_size / mb:7.0f} MB | build peak {build_peak / mb:7.0f} MB ({build_time:.2f} s)"
+          f" | serialize peak {serialize_peak / mb:7.0f} MB | retained {current / mb:7.0f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Quiver memory benchmark")
+    parser.add_argument("--count", type=int, default=10**7, help="Number of arrows")
+    count = parser.parse_args().count
+    rng = np.random.default_rng(0)
+
+    measure("6 float64 arrays (X..W)", lambda n: tuple(rng.random(n) for _ in range(6)), count)
+    measure("2 float64 (N, 3) arrays", lambda n: (rng.random((n, 3)), rng.random((n, 3))), count)
+    measure("2 float32 (N, 3) arrays", lambda n: (rng.random((n, 3), dtype=np.float32), rng.random((n, 3), dtype=np.float32)), count)
+    measure("2 float64 (N, 2) arrays", lambda n: (rng.random((n, 2)), rng.random((n, 2))), count)
+
+if __name__ == "__main__":
+    main()
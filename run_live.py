@@ -57,6 +57,18 @@ def main():
         "--port", type=int, default=8000,
         help="Port number for the server"
     )
+    parser.add_argument(
+        "--reload-mode", choices=["worker", "subprocess"], default="worker",
+        help="How the python script is re-run on changes: in a warm worker process (fast) or a fresh python3 process"
+    )
+    parser.add_argument(
+        "--render-workers", type=int, default=min(4, os.cpu_count() or 1),
+        help="Number of processes rendering matplotlib plots in the background, 0 renders them when the scene is served"
+    )
+    parser.add_argument(
+        "--plot-cache-dir",
+        help="Optional: directory to keep rendered matplotlib plots in, so unchanged plots aren't rendered again after a restart"
+    )
     parser.add_argument(
         "--debug", action="store_true",
         help="Enable debug mode for more verbose output"
@@ -80,6 +92,9 @@ def main():
     runtime_config.scene_path = scene_path
     runtime_config.python_path = Path(args.python_path).resolve() if args.python_path else None
     runtime_config.debug = args.debug
+    runtime_config.reload_mode = args.reload_mode
+    runtime_config.render_workers = max(0, args.render_workers)
+    runtime_config.plot_cache_dir = Path(args.plot_cache_dir).resolve() if args.plot_cache_dir else None
 
     uvicorn_args = {
         "app": "volum.api:app",
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from volum.api.endpoints import router
+from volum.api.scene import scene
+from volum.core.bricks import brick_box, brick_counts, downsample, pyramid_shapes
+from volum.objects.contour import Contour
+
+client = TestClient(FastAPI())
+client.app.include_router(router)
+
+
+def test_downsample_pools_blocks_and_repeats_odd_edges():
+    field = np.arange(5 * 4 * 3, dtype=np.float64).reshape(5, 4, 3)
+    mean, maximum = downsample(field, "mean"), downsample(field, "max")
+    assert mean.shape == maximum.shape == (3, 2, 2)
+    assert mean.dtype == np.float32 and maximum.dtype == field.dtype
+
+    padded = np.pad(field, [(0, 1), (0, 0), (0, 1)], mode="edge")
+    blocks = padded.reshape(3, 2, 2, 2, 2, 2)
+    np.testing.assert_allclose(mean, blocks.mean(axis=(1, 3, 5)))
+    np.testing.assert_array_equal(maximum, blocks.max(axis=(1, 3, 5)))
+    with pytest.raises(ValueError):
+        downsample(field, "median")
+
+def test_pyramid_halves_until_one_brick():
+    assert pyramid_shapes((100, 40, 9), 16) == [(100, 40, 9), (50, 20, 5), (25, 10, 3), (13, 5, 2)]
+    assert pyramid_shapes((8, 8), 16) == [(8, 8)]
+    assert brick_counts((100, 40, 9), 16) == (7, 3, 1)
+
+def test_bricks_overlap_by_one_sample_and_cover_the_field():
+    shape, size = (37, 20), 8
+    covered = np.zeros(shape, dtype=int)
+    for i in range(brick_counts(shape, size)[0]):
+        for j in range(brick_counts(shape, size)[1]):
+            box = brick_box(shape, (i, j), size)
+            assert all(s.stop - s.start <= size + 1 for s in box)
+            covered[box] += 1
+    assert covered.min() >= 1
+    assert covered[8, 3] == 2 and covered[8, 8] == 4 # shared faces and corners
+
+    for index in [(5, 0), (-1, 0), (0,)]:
+        with pytest.raises(ValueError):
+            brick_box(shape, index, size)
+
+def test_contour_bricks_come_from_the_pyramid_levels():
+    field = np.random.default_rng(0).normal(size=(40, 24, 10)).astype(np.float32)
+    contour = Contour(field, pyramid="max", brick_size=8)
+    pyramid = contour.pyramid_dict()
+    assert pyramid["shapes"] == [[40, 24, 10], [20, 12, 5], [10, 6, 3], [5, 3, 2]]
+    assert pyramid["bricks"] == [[5, 3, 2], [3, 2, 1], [2, 1, 1], [1, 1, 1]]
+
+    np.testing.assert_array_equal(contour.brick(0, (1, 2, 1)), field[8:17, 16:24, 8:10])
+    np.testing.assert_array_equal(contour.brick(1, (0, 0, 0)), downsample(field, "max")[:9, :9, :9])
+    assert contour.brick(3, (0, 0, 0)).dtype == np.float32
+    for level, index in [(4, (0, 0, 0)), (1, (3, 0, 0))]:
+        with pytest.raises(ValueError):
+            contour.brick(level, index)
+
+def test_contour_pyramid_is_rebuilt_after_changes():
+    contour = Contour(np.zeros((20, 20, 20)), pyramid="mean", brick_size=8)
+    assert contour.brick(2, (0, 0, 0)).max() == 0
+    contour.values = np.ones((20, 20, 20))
+    assert contour.brick(2, (0, 0, 0)).min() == 1
+
+def test_brick_endpoint_sends_x_fastest_values():
+    field = np.random.default_rng(1).normal(size=(20, 12, 6)).astype(np.float32)
+    scene.clear()
+    scene.add_object(Contour(field, pyramid="mean", brick_size=8), id="field")
+
+    response = client.get("/object/field/bricks/0/1,0,0")
+    assert response.status_code == 200
+    assert response.headers["x-volum-shape"] == "9,9,6"
+    values = np.frombuffer(response.content, dtype=response.headers["x-volum-dtype"]).reshape(6, 9, 9)
+    np.testing.assert_array_equal(values.transpose(), field[8:17, :9, :])
+
+    assert client.get("/object/field/bricks/0/9,0,0").status_code == 404
+    assert client.get("/object/field/bricks/0/a,b").status_code == 404
+    scene.clear()
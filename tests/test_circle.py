@@ -0,0 +1,27 @@
+import numpy as np
+from volum.core import Scene
+from volum.objects import Circle
+
+
+def circle_geometry_vertices(radius: float, segments: int = 32) -> np.ndarray:
+    """The vertices of three.js' CircleGeometry(radius, segments), the centre and its rim in the z = 0 plane."""
+    theta = np.linspace(0, 2 * np.pi, segments + 1)
+    rim = np.stack([radius * np.cos(theta), radius * np.sin(theta), np.zeros_like(theta)], axis=1)
+    return np.vstack([[0, 0, 0], rim])
+
+def test_geometry_vertices_lie_on_the_surface():
+    vertices = circle_geometry_vertices(1.5)
+    np.testing.assert_allclose(Circle(1.5).distance_to_many(vertices), 0, atol=1e-9)
+
+def test_geometry_within_bounds():
+    vertices = circle_geometry_vertices(1.5)
+    lower, upper = Circle(1.5).bounds()
+    np.testing.assert_allclose(lower, vertices.min(axis=0), atol=1e-9)
+    np.testing.assert_allclose(upper, vertices.max(axis=0), atol=1e-9)
+
+def test_raycast_hits_the_rendered_circle():
+    scene = Scene()
+    circle_id = scene.add_object(Circle(1.0))
+    hits = scene.raycast([0, 0.5, -5], [0, 0, 1]) # towards the back face
+    assert hits and hits[0][0] == circle_id and np.isclose(hits[0][1], 5.0, atol=1e-3)
+    assert scene.raycast([0, 5, 0.5], [0, -1, 0]) == [] # parallel, in front of the disk
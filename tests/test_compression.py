@@ -0,0 +1,53 @@
+import gzip
+from unittest import mock
+
+import pytest
+
+from volum.api import compression
+from volum.api.compression import CompressionCache, compress, negotiate_encoding
+
+
+@pytest.fixture
+def gzip_only():
+    with mock.patch.object(compression, "brotli", None), mock.patch.object(compression, "zstandard", None):
+        yield
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, None),
+    ("", None),
+    ("gzip", "gzip"),
+    ("GZIP ; q=0.5", "gzip"),
+    ("deflate, gzip;q=0", None),
+    ("*", "gzip"),
+    ("*;q=0, gzip", "gzip"),
+    ("gzip;q=abc", None),
+    ("identity", None),
+])
+def test_negotiate_encoding(gzip_only, accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+def test_negotiate_encoding_prefers_weights_then_server_order():
+    brotli = mock.Mock()
+    with mock.patch.object(compression, "brotli", brotli), mock.patch.object(compression, "zstandard", None):
+        assert negotiate_encoding("gzip, br") == "br"
+        assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+
+def test_compress_round_trip(gzip_only):
+    data = b"volum" * 1000
+    assert gzip.decompress(compress(data, "gzip")) == data
+    with pytest.raises(ValueError):
+        compress(data, "br")
+
+def test_compression_cache_is_lru():
+    cache = CompressionCache(max_entries=2)
+    compute = mock.Mock(side_effect=lambda: b"data")
+    cache.get("a", compute)
+    cache.get("b", compute)
+    cache.get("a", compute) # refreshes "a"
+    cache.get("c", compute) # evicts "b"
+    assert compute.call_count == 3
+
+    cache.get("a", compute)
+    assert compute.call_count == 3
+    cache.get("b", compute)
+    assert compute.call_count == 4
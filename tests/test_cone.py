@@ -0,0 +1,36 @@
+import numpy as np
+from volum.core import Scene
+from volum.objects import Cone
+
+
+def cone_geometry_vertices(radius: float, height: float, radial_segments: int = 32) -> np.ndarray:
+    """The vertices of three.js' ConeGeometry(radius, height, radial_segments), i.e. a CylinderGeometry with a top
+    radius of 0, centred on the origin: the apex at y = height / 2, the base ring and centre at y = -height / 2."""
+    theta = np.linspace(0, 2 * np.pi, radial_segments + 1)
+    ring = np.stack([radius * np.sin(theta), np.full_like(theta, -height / 2), radius * np.cos(theta)], axis=1)
+    return np.vstack([[0, height / 2, 0], ring, [0, -height / 2, 0]])
+
+def test_geometry_vertices_lie_on_the_surface():
+    cone = Cone(radius=1.5, height=2.0)
+    vertices = cone_geometry_vertices(1.5, 2.0)
+    np.testing.assert_allclose(cone.distance_to_many(vertices), 0, atol=1e-9)
+
+def test_geometry_within_bounds():
+    cone = Cone(radius=1.5, height=2.0)
+    vertices = cone_geometry_vertices(1.5, 2.0)
+    lower, upper = cone.bounds()
+    assert np.all(vertices >= lower - 1e-9) and np.all(vertices <= upper + 1e-9)
+    np.testing.assert_allclose(lower, vertices.min(axis=0), atol=1e-9)
+    np.testing.assert_allclose(upper, vertices.max(axis=0), atol=1e-9)
+
+def test_distances_outside_apex_and_base():
+    cone = Cone(radius=1.0, height=2.0)
+    assert np.isclose(cone.distance_to([0, 2.0, 0]), 1.0) # above the apex
+    assert np.isclose(cone.distance_to([0, -2.0, 0]), 1.0) # below the base centre
+
+def test_raycast_hits_the_rendered_cone():
+    scene = Scene()
+    cone_id = scene.add_object(Cone(radius=1.0, height=2.0))
+    hits = scene.raycast([0, -5, 0], [0, 1, 0]) # up through the base
+    assert hits and hits[0][0] == cone_id and np.isclose(hits[0][1], 4.0, atol=1e-3)
+    assert scene.raycast([0, 1.5, 5], [0, 0, -1]) == [] # passes above the apex
@@ -0,0 +1,32 @@
+from volum.core import Scene, StandardMaterial
+from volum.objects import Box
+from volum.api.diff import diff_scenes, is_empty_patch
+
+
+def build_scene(color: str) -> Scene:
+    scene = Scene()
+    scene.add_object(Box(1, 1, 1, material=StandardMaterial(color=color)))
+    scene.add_object(Box(2, 1, 1))
+    return scene
+
+def test_edited_object_is_changed():
+    previous = build_scene("red").serialize("scene.json", binary=True)
+    current = build_scene("blue").serialize("scene.json", binary=True)
+
+    patch = diff_scenes(previous, current)
+    assert list(patch["changed"]) == ["Box-0"]
+    assert patch["added"] == {}
+    assert patch["removed"] == []
+
+def test_unchanged_scene_gives_empty_patch():
+    previous = build_scene("red").serialize("scene.json")
+    current = build_scene("red").serialize("scene.json")
+    assert is_empty_patch(diff_scenes(previous, current))
+
+def test_digests_find_the_same_changes():
+    previous = build_scene("red").serialize_digests("scene.json")
+    current = build_scene("blue").serialize_digests("scene.json")
+
+    patch = diff_scenes(previous, current)
+    assert list(patch["changed"]) == ["Box-0"]
+    assert is_empty_patch(diff_scenes(current, build_scene("blue").serialize_digests("scene.json")))
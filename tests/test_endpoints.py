@@ -0,0 +1,124 @@
+import json
+from unittest import mock
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from volum.api import endpoints
+from volum.api.endpoints import LiveFileHandler, router
+from volum.api.scene import scene
+from volum.objects import Line
+from volum.objects.object_array import ObjectArray
+from volum.objects.quiver import Quiver
+from volum.objects.sphere import Sphere
+from volum.objects.volume import Volume
+
+client = TestClient(FastAPI())
+client.app.include_router(router)
+
+
+def test_update_object_without_truthiness():
+    scene.clear()
+    line = scene.add_object(Line([[0, 0, 0], [1, 0, 0]]))
+    empty = scene.add_object(ObjectArray(Sphere(1.0), positions=np.zeros((0, 3))))
+
+    assert client.put(f"/object/{line}", json={"type": "Line", "width": 2.0}).status_code == 200
+    assert client.put(f"/object/{empty}", json={"type": "ObjectArray", "position": [1, 2, 3]}).status_code == 200
+    assert client.put("/object/missing", json={"type": "Box"}).status_code == 404
+    scene.clear()
+
+
+def test_scene_is_serialized_once_per_request():
+    scene.clear()
+    scene.add_object(Line(np.random.default_rng(0).uniform(size=(1000, 3))))
+
+    with mock.patch.object(scene.buffers, "collect", wraps=scene.buffers.collect) as collect:
+        response = client.get("/", params={"binary": True})
+    assert response.status_code == 200
+    assert collect.call_count == 1
+
+    etag = response.headers["etag"]
+    assert client.get("/", params={"binary": True}, headers={"If-None-Match": etag}).status_code == 304
+    scene.clear()
+
+
+def test_buffers_are_compressed_and_revalidated():
+    scene.clear()
+    scene.add_object(Line(np.random.default_rng(0).uniform(size=(1000, 3))))
+    buffer_id = client.get("/", params={"binary": True}).json()["objects"][0]["args"][0]["buffer"]
+
+    plain = client.get(f"/buffers/{buffer_id}", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    compressed = client.get(f"/buffers/{buffer_id}", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.content == plain.content # decoded by the client
+
+    etag = plain.headers["etag"]
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        assert client.get(f"/buffers/{buffer_id}", headers={"If-None-Match": if_none_match}).status_code == 304
+    assert client.get(f"/buffers/{buffer_id}", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert client.get("/buffers/missing").status_code == 404
+    scene.clear()
+
+
+def test_lod_etag_follows_content_across_reloads():
+    rng = np.random.default_rng(0)
+    scene.clear()
+    scene.add_object(Quiver(rng.uniform(size=(500, 3)), rng.normal(size=(500, 3)), lod="grid", lod_levels=2), id="field")
+    response = client.get("/object/field/lod/1")
+    etag = response.headers["etag"]
+    assert client.get("/object/field/lod/1", headers={"If-None-Match": etag}).status_code == 304
+
+    scene.clear() # a reload rebuilds the object with a fresh revision
+    scene.add_object(Quiver(rng.uniform(size=(500, 3)), rng.normal(size=(500, 3)), lod="grid", lod_levels=2), id="field")
+    reloaded = client.get("/object/field/lod/1", headers={"If-None-Match": etag})
+    assert reloaded.status_code == 200
+    assert reloaded.content != response.content
+    scene.clear()
+
+
+def test_brick_etag_follows_content_across_reloads(tmp_path):
+    path = str(tmp_path / "volume.npy")
+    np.save(path, np.zeros((8, 8, 8), dtype=np.float32))
+    scene.clear()
+    scene.add_object(Volume(1, 1, 1, path), id="volume")
+    response = client.get("/object/volume/bricks/0/0,0,0")
+    etag = response.headers["etag"]
+    assert client.get("/object/volume/bricks/0/0,0,0", headers={"If-None-Match": etag}).status_code == 304
+
+    np.save(path, np.ones((8, 8, 8), dtype=np.float32))
+    scene.clear() # a reload rebuilds the object with a fresh revision
+    scene.add_object(Volume(1, 1, 1, path), id="volume")
+    reloaded = client.get("/object/volume/bricks/0/0,0,0", headers={"If-None-Match": etag})
+    assert reloaded.status_code == 200
+    assert np.all(np.frombuffer(reloaded.content, dtype="<f4") == 1)
+    scene.clear()
+
+
+def test_reload_serializes_changed_scenes_once():
+    scene.clear()
+    scene.add_object(Line([[0, 0, 0], [1, 0, 0]]), id="line")
+    handler = LiveFileHandler("scene.json", "reload")
+
+    def reload(points):
+        def rebuild():
+            scene.clear()
+            scene.add_object(Line(points), id="line")
+        with mock.patch.object(endpoints, "get_main_event_loop"), \
+             mock.patch.object(endpoints.asyncio, "run_coroutine_threadsafe", side_effect=lambda coroutine, loop: coroutine.close()), \
+             mock.patch.object(endpoints.manager, "broadcast") as broadcast, \
+             mock.patch.object(scene.buffers, "collect", wraps=scene.buffers.collect) as collect:
+            handler._reload_scene(rebuild)
+        return broadcast, collect.call_count
+
+    broadcast, passes = reload([[0, 0, 0], [1, 0, 0]])
+    assert not broadcast.called and passes == 0
+
+    broadcast, passes = reload([[0, 0, 0], [2, 0, 0]])
+    assert passes == 1
+    assert list(json.loads(broadcast.call_args[0][0])["changed"]) == ["line"]
+    scene.clear()
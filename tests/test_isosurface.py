@@ -0,0 +1,63 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+from volum.core.isosurface import surface_nets, quantize_positions
+from volum.objects.contour import Contour
+
+
+def sphere_field(size: int = 24, radius: float = 7.0) -> np.ndarray:
+    """The signed distance to a sphere in the middle of a size^3 grid, negative inside."""
+    axis = np.arange(size) - (size - 1) / 2
+    x, y, z = np.meshgrid(axis, axis, axis, indexing="ij")
+    return np.sqrt(x**2 + y**2 + z**2) - radius
+
+def test_vertices_lie_on_the_sphere():
+    vertices, triangles = surface_nets(sphere_field())
+    distances = np.linalg.norm(vertices - 11.5, axis=1)
+    assert len(vertices) > 100 and len(triangles) > 100
+    np.testing.assert_allclose(distances, 7.0, atol=0.25)
+
+def test_surface_is_closed_and_faces_outwards():
+    vertices, triangles = surface_nets(sphere_field())
+    # every edge is shared by exactly two triangles, traversed once in each direction
+    edges = Counter(tuple(edge) for triangle in triangles for edge in (triangle[[0, 1]], triangle[[1, 2]], triangle[[2, 0]]))
+    assert all(count == 1 and edges[(b, a)] == 1 for (a, b), count in edges.items())
+
+    corners = vertices[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    assert np.all(np.sum(normals * (corners.mean(axis=1) - 11.5), axis=1) > 0) # towards increasing values
+
+def test_level_offsets_the_surface():
+    vertices, _ = surface_nets(sphere_field(), level=2.0)
+    np.testing.assert_allclose(np.linalg.norm(vertices - 11.5, axis=1), 9.0, atol=0.25)
+
+def test_plane_crossing_is_interpolated():
+    field = np.broadcast_to(np.array([-1.0, -1.0, 3.0, 3.0])[:, None, None], (4, 5, 5))
+    vertices, triangles = surface_nets(field)
+    np.testing.assert_allclose(vertices[:, 0], 1.25) # a quarter of the way from -1 to 3
+    assert len(vertices) == 16 and len(triangles) == 2 * 9 # the quads of the interior edges
+
+def test_fields_without_crossings_have_no_surface():
+    vertices, triangles = surface_nets(np.ones((4, 4, 4)))
+    assert vertices.shape == (0, 3) and triangles.shape == (0, 3)
+
+@pytest.mark.parametrize("shape", [(4, 4), (1, 4, 4), (2, 2, 2, 2)])
+def test_invalid_fields(shape):
+    with pytest.raises(ValueError):
+        surface_nets(np.zeros(shape))
+
+def test_quantize_positions_spans_the_grid():
+    positions = quantize_positions(np.array([[0, 0, 0], [9, 4.5, 19], [-1, 10, 30]], dtype=np.float32), (10, 10, 20))
+    assert positions.dtype == np.uint16
+    np.testing.assert_array_equal(positions, [[0, 0, 0], [65535, 32768, 65535], [0, 65535, 65535]])
+
+def test_contour_isosurface_is_cached_until_changed():
+    contour = Contour(sphere_field(), levels=[0.0], precompute=True)
+    positions, triangles = contour.isosurface(0.0)
+    assert positions.dtype == np.uint16 and triangles.dtype == np.uint16
+    assert contour.isosurface(0.0)[0] is positions
+
+    contour.values = sphere_field(radius=5.0)
+    assert contour.isosurface(0.0)[0] is not positions
+    assert len(contour.isosurface(0.0)[0]) < len(positions)
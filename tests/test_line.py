@@ -0,0 +1,18 @@
+import numpy as np
+from volum.objects import Line
+
+
+def test_distance_to_2d_point():
+    line = Line([[0, 0], [1, 0]])
+    assert line.distance_to([0, 1]) == 1.0
+    assert line.distance_to([2, 0]) == 1.0
+
+def test_distance_to_many_3d_points():
+    line = Line([[0, 0, 0], [1, 0, 0]])
+    np.testing.assert_allclose(line.distance_to_many([[0.5, 2, 0], [-1, 0, 0]]), [2.0, 1.0])
+
+def test_len_is_point_count():
+    line = Line([[0, 0, 0], [3, 0, 0], [3, 4, 0]])
+    assert len(line) == 3
+    assert line.length() == 7.0
+    assert Line([[0, 0, 0], [0, 0, 0]])
@@ -0,0 +1,9 @@
+import numpy as np
+
+from volum.objects.object_array import ObjectArray
+from volum.objects.sphere import Sphere
+
+
+def test_distance_with_non_uniform_scales():
+    ellipsoids = ObjectArray(Sphere(1.0), positions=[[0, 0, 0], [20, 0, 0]], scales=[[1, 2, 3], [1, 1, 1]])
+    np.testing.assert_allclose(ellipsoids.distance_to_many([[0, 0, 5], [4, 0, 0], [22, 0, 0]]), [2, 3, 1])
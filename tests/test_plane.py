@@ -0,0 +1,26 @@
+import numpy as np
+from volum.core import Scene
+from volum.objects import Plane
+
+
+def plane_geometry_vertices(width: float, height: float, segments: int = 4) -> np.ndarray:
+    """The vertices of three.js' PlaneGeometry(width, height, segments, segments), which lies in the z = 0 plane."""
+    x, y = np.meshgrid(np.linspace(-width / 2, width / 2, segments + 1), np.linspace(height / 2, -height / 2, segments + 1))
+    return np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+
+def test_geometry_vertices_lie_on_the_surface():
+    vertices = plane_geometry_vertices(3.0, 2.0)
+    np.testing.assert_allclose(Plane(3.0, 2.0).distance_to_many(vertices), 0, atol=1e-9)
+
+def test_geometry_within_bounds():
+    vertices = plane_geometry_vertices(3.0, 2.0)
+    lower, upper = Plane(3.0, 2.0).bounds()
+    np.testing.assert_allclose(lower, vertices.min(axis=0), atol=1e-9)
+    np.testing.assert_allclose(upper, vertices.max(axis=0), atol=1e-9)
+
+def test_raycast_hits_the_rendered_plane():
+    scene = Scene()
+    plane_id = scene.add_object(Plane(3.0, 2.0))
+    hits = scene.raycast([0.5, 0.5, 5], [0, 0, -1]) # towards the front face
+    assert hits and hits[0][0] == plane_id and np.isclose(hits[0][1], 5.0, atol=1e-3)
+    assert scene.raycast([0, 1.5, 5], [0, 0, -1]) == [] # passes above the top edge
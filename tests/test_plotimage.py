@@ -0,0 +1,44 @@
+from unittest import mock
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+import volum.objects.plotimage as plotimage
+
+
+def test_figure_stale_flag_is_left_alone():
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [1, 0])
+    plot = plotimage.PlotImage(fig)
+
+    with mock.patch.object(plotimage, "render_figure", wraps=plotimage.render_figure) as render:
+        fig.stale = True
+        image = plot.image
+        assert plot.image == image
+        assert render.call_count == 1
+
+        ax.set_title("changed")
+        assert fig.stale
+        plot.figure_key()
+        assert fig.stale
+        assert plot.image != image
+        assert render.call_count == 2
+    plt.close(fig)
+
+
+def test_figure_key_is_only_recomputed_after_changes():
+    fig, ax = plt.subplots()
+    line, = ax.plot([0, 1], [1, 0])
+    plot = plotimage.PlotImage(fig)
+    key = plot.figure_key()
+
+    with mock.patch.object(plotimage, "figure_fingerprint", wraps=plotimage.figure_fingerprint) as fingerprint:
+        assert fig.stale
+        assert plot.figure_key() == key
+        assert fingerprint.call_count == 0
+
+        line.set_color("red")
+        assert plot.figure_key() != key
+        assert fingerprint.call_count == 1
+    plt.close(fig)
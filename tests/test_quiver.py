@@ -0,0 +1,25 @@
+import numpy as np
+
+from volum.core.buffers import BufferStore
+from volum.objects.quiver import Quiver
+
+
+def test_magnitudes_are_cached_per_version():
+    rng = np.random.default_rng(0)
+    quiver = Quiver(rng.uniform(size=(1000, 3)), rng.normal(size=(1000, 3)), lod="grid", lod_levels=3)
+    magnitudes = quiver.magnitudes()
+    np.testing.assert_allclose(magnitudes, np.linalg.norm(quiver.vectors, axis=1), rtol=1e-6)
+    assert quiver.lod_counts()[0] == 1000
+    assert quiver.magnitudes() is magnitudes
+
+    quiver.vectors *= 2
+    quiver.mark_dirty()
+    np.testing.assert_allclose(quiver.magnitudes(), 2 * magnitudes, rtol=1e-6)
+
+
+def test_empty_quiver_serializes_without_levels():
+    quiver = Quiver(np.zeros((0, 3)), np.zeros((0, 3)), lod="grid", precompute=True)
+    with BufferStore().collect():
+        data = quiver.to_dict()
+    assert data["magnitude_range"] == [0.0, 0.0]
+    assert "lod_counts" not in data and "lod_level" not in data
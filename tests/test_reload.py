@@ -0,0 +1,60 @@
+import threading
+import time
+
+from volum.api.reload import ReloadScheduler
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_bursts_are_coalesced_on_the_trailing_edge():
+    scheduler = ReloadScheduler(debounce=0.1)
+    runs = []
+    try:
+        for i in range(5):
+            scheduler.submit("scene.py", lambda cancelled, i=i: runs.append((i, time.monotonic())))
+            last_submit = time.monotonic()
+            time.sleep(0.02)
+        wait_for(lambda: scheduler.metrics()["completed"] == 1)
+        time.sleep(0.2)
+
+        assert [i for i, _ in runs] == [4]
+        assert runs[0][1] - last_submit >= 0.09 # only after the quiet time
+        assert scheduler.metrics()["coalesced"] == 4
+    finally:
+        scheduler.close()
+
+def test_newer_submission_cancels_the_running_job():
+    scheduler = ReloadScheduler(debounce=0.01)
+    started, aborted, results = threading.Event(), [], []
+
+    def slow(cancelled):
+        started.set()
+        cancelled.wait(5)
+        results.append(("slow", cancelled.is_set()))
+
+    try:
+        scheduler.submit("scene.py", slow, cancel=lambda: aborted.append(True))
+        assert started.wait(5)
+        scheduler.submit("scene.py", lambda cancelled: results.append(("fresh", cancelled.is_set())))
+        wait_for(lambda: scheduler.metrics()["completed"] == 1)
+
+        assert aborted == [True]
+        assert results == [("slow", True), ("fresh", False)]
+        assert scheduler.metrics()["cancelled"] == 1
+    finally:
+        scheduler.close()
+
+def test_failed_job_doesnt_stop_the_scheduler():
+    scheduler = ReloadScheduler(debounce=0.01)
+    try:
+        scheduler.submit("a", lambda cancelled: 1 / 0)
+        wait_for(lambda: scheduler.metrics()["failed"] == 1)
+        scheduler.submit("b", lambda cancelled: None)
+        wait_for(lambda: scheduler.metrics()["completed"] == 1)
+        assert scheduler.queue_depth == 0
+    finally:
+        scheduler.close()
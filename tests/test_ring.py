@@ -0,0 +1,26 @@
+import numpy as np
+from volum.core import Scene
+from volum.objects import Ring
+
+
+def ring_geometry_vertices(inner_radius: float, outer_radius: float, theta_segments: int = 32, phi_segments: int = 2) -> np.ndarray:
+    """The vertices of three.js' RingGeometry(inner_radius, outer_radius, theta_segments, phi_segments), in the z = 0 plane."""
+    radius, theta = np.meshgrid(np.linspace(inner_radius, outer_radius, phi_segments + 1), np.linspace(0, 2 * np.pi, theta_segments + 1))
+    return np.stack([(radius * np.cos(theta)).ravel(), (radius * np.sin(theta)).ravel(), np.zeros(radius.size)], axis=1)
+
+def test_geometry_vertices_lie_on_the_surface():
+    vertices = ring_geometry_vertices(0.5, 1.5)
+    np.testing.assert_allclose(Ring(0.5, 1.5).distance_to_many(vertices), 0, atol=1e-9)
+
+def test_geometry_within_bounds():
+    vertices = ring_geometry_vertices(0.5, 1.5)
+    lower, upper = Ring(0.5, 1.5).bounds()
+    np.testing.assert_allclose(lower, vertices.min(axis=0), atol=1e-9)
+    np.testing.assert_allclose(upper, vertices.max(axis=0), atol=1e-9)
+
+def test_raycast_hits_the_rendered_ring():
+    scene = Scene()
+    ring_id = scene.add_object(Ring(0.5, 1.5))
+    hits = scene.raycast([0, 1.0, 5], [0, 0, -1]) # through the ring itself
+    assert hits and hits[0][0] == ring_id and np.isclose(hits[0][1], 5.0, atol=1e-3)
+    assert scene.raycast([0, 0, 5], [0, 0, -1]) == [] # through the hole
@@ -0,0 +1,33 @@
+import pickle
+
+import numpy as np
+
+from volum.core.scene import Scene
+from volum.objects import Line
+from volum.objects.box import Box
+from volum.objects.sphere import Sphere
+
+
+def test_pickle_round_trip():
+    scene = Scene()
+    box = scene.add_object(Box(1, 2, 3))
+    sphere = scene.add_object(Sphere(1.0).transform(position=[5, 0, 0]))
+    scene.add_object(Line(np.random.default_rng(0).uniform(size=(100, 3))))
+    data = scene.serialize("scene.json", binary=True)
+    assert scene.nearest_object([5, 0, 2])[0] == sphere
+
+    copy = pickle.loads(pickle.dumps(scene))
+    assert list(copy.objects) == list(scene.objects)
+    assert copy.serialize("scene.json", binary=True) == data
+    assert copy.nearest_object([5, 0, 2])[0] == sphere
+    assert copy.nearest_object([0, 0, 0])[0] == box
+    with copy.lock:
+        copy.add_object(Box(1, 1, 1))
+
+
+def test_stable_ids_skip_supplied_ids():
+    scene = Scene()
+    assert scene.add_object(Box(1, 1, 1), id="Box-2") == "Box-2"
+    assert scene.add_object(Box(1, 1, 1)) == "Box-1" # supplied IDs count in the construction order, too
+    assert scene.add_object(Box(1, 1, 1)) == "Box-3"
+    assert scene.add_object(Box(1, 1, 1)) == "Box-4"
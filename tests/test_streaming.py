@@ -0,0 +1,49 @@
+import io
+import json
+
+import pytest
+
+from volum.api.streaming import JSONStream, iter_scene_file
+
+
+def test_values_split_across_chunks():
+    values = [1.25e-3, -42, "a [string], with {brackets}", {"nested": [1, 2, {"x": None}]}, [], True]
+    stream = JSONStream(io.StringIO(json.dumps(values)), chunk_size=3)
+    assert list(stream.iter_array()) == values
+
+def test_scene_keys_in_file_order(tmp_path):
+    path = tmp_path / "scene.json"
+    path.write_text(json.dumps({"file": "scene.json", "plugins": ["A"], "objects": [{"type": "Box"}, {"type": "Sphere"}]}))
+
+    items = iter_scene_file(str(path), chunk_size=4)
+    assert next(items) == ("file", "scene.json")
+    assert next(items) == ("plugins", ["A"])
+    key, objects = next(items)
+    assert key == "objects" and next(objects) == {"type": "Box"} # the rest is skipped unread
+    assert list(items) == []
+
+def test_top_level_array_is_the_objects(tmp_path):
+    path = tmp_path / "scene.json"
+    path.write_text('[{"type": "Box"}]')
+    assert [(key, list(value)) for key, value in iter_scene_file(str(path))] == [("objects", [{"type": "Box"}])]
+
+@pytest.mark.parametrize("content", [
+    '{"plugins": [], "objects": [{"type": "Box"}, {"type": "Sph',  # truncated, e.g. still being written
+    '{"plugins": [] "objects": []}',  # missing comma
+    '{"plugins": [], "objects": [1 2]}',
+    '{"plugins": []} {}',  # extra data
+    '',
+])
+def test_malformed_files_raise(tmp_path, content):
+    path = tmp_path / "scene.json"
+    path.write_text(content)
+    with pytest.raises(json.JSONDecodeError):
+        for _, value in iter_scene_file(str(path), chunk_size=8):
+            if not isinstance(value, (str, list, dict)):
+                list(value)
+
+def test_other_top_level_values_are_rejected(tmp_path):
+    path = tmp_path / "scene.json"
+    path.write_text("42")
+    with pytest.raises(ValueError):
+        list(iter_scene_file(str(path)))
@@ -0,0 +1,28 @@
+import numpy as np
+from volum.core import Scene
+from volum.objects import Torus
+
+
+def torus_geometry_vertices(radius: float, tube_radius: float, radial_segments: int = 16, tubular_segments: int = 48) -> np.ndarray:
+    """The vertices of three.js' TorusGeometry(radius, tube_radius, radial_segments, tubular_segments), whose tube
+    follows a circle in the z = 0 plane."""
+    v, u = np.meshgrid(np.linspace(0, 2 * np.pi, radial_segments + 1), np.linspace(0, 2 * np.pi, tubular_segments + 1))
+    ring = radius + tube_radius * np.cos(v)
+    return np.stack([(ring * np.cos(u)).ravel(), (ring * np.sin(u)).ravel(), (tube_radius * np.sin(v)).ravel()], axis=1)
+
+def test_geometry_vertices_lie_on_the_surface():
+    vertices = torus_geometry_vertices(2.0, 0.5)
+    np.testing.assert_allclose(Torus(2.0, 0.5).distance_to_many(vertices), 0, atol=1e-9)
+
+def test_geometry_within_bounds():
+    vertices = torus_geometry_vertices(2.0, 0.5)
+    lower, upper = Torus(2.0, 0.5).bounds()
+    np.testing.assert_allclose(lower, vertices.min(axis=0), atol=1e-9)
+    np.testing.assert_allclose(upper, vertices.max(axis=0), atol=1e-9)
+
+def test_raycast_hits_the_rendered_torus():
+    scene = Scene()
+    torus_id = scene.add_object(Torus(2.0, 0.5))
+    hits = scene.raycast([2.0, 0, 5], [0, 0, -1]) # down onto the tube
+    assert hits and hits[0][0] == torus_id and np.isclose(hits[0][1], 4.5, atol=1e-3)
+    assert scene.raycast([0, 0, 5], [0, 0, -1]) == [] # through the hole
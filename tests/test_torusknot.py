@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from volum.objects.torusknot import TorusKnot
+
+
+def torus_knot_curve(radius: float, p: int, q: int, samples: int) -> np.ndarray:
+    """Points on the center curve of three.js' TorusKnotGeometry (calculatePositionOnCurve) for u in [0, 2 pi p)."""
+    u = np.linspace(0, 2 * np.pi * p, samples, endpoint=False)
+    quOverP = q / p * u
+    cs = np.cos(quOverP)
+    return np.stack([radius * (2 + cs) * 0.5 * np.cos(u), radius * (2 + cs) * 0.5 * np.sin(u), radius * np.sin(quOverP) * 0.5], axis=1)
+
+def brute_force_distances(points: np.ndarray, radius: float, tube_radius: float, p: int, q: int) -> np.ndarray:
+    curve = torus_knot_curve(radius, p, q, 200_000)
+    distances = np.array([np.sqrt(np.min(np.sum((curve - point)**2, axis=1))) for point in points])
+    return distances - tube_radius
+
+@pytest.mark.parametrize("p, q", [(2, 3), (3, 7), (1, 4)])
+def test_distances_match_brute_force_sampling(p, q):
+    knot = TorusKnot(2.0, 0.3, p=p, q=q)
+    points = np.random.default_rng(p * q).uniform(-4, 4, size=(100, 3))
+    # the dense sampling overestimates by at most half its spacing, squared over the curvature radius
+    np.testing.assert_allclose(knot.distance_to_many(points), brute_force_distances(points, 2.0, 0.3, p, q), atol=1e-5)
+
+def test_points_on_the_curve_are_a_tube_radius_inside():
+    knot = TorusKnot(2.0, 0.3)
+    curve = torus_knot_curve(2.0, 2, 3, 97)
+    np.testing.assert_allclose(knot.distance_to_many(curve), -0.3, atol=1e-9)
+
+def test_curve_derivatives_match_finite_differences():
+    knot = TorusKnot(1.5, 0.2, p=3, q=5)
+    t, h = np.linspace(0, 2 * np.pi, 50), 1e-5
+    _, first, second = knot._curve(t, derivatives=True)
+    np.testing.assert_allclose(first, (knot._curve(t + h) - knot._curve(t - h)) / (2 * h), atol=1e-6)
+    np.testing.assert_allclose(second, (knot._curve(t + h) - 2 * knot._curve(t) + knot._curve(t - h)) / h**2, atol=1e-3)
+
+def test_geometry_within_bounds():
+    knot = TorusKnot(2.0, 0.3, p=3, q=7)
+    curve = torus_knot_curve(2.0, 3, 7, 10_000)
+    lower, upper = knot.bounds()
+    assert np.all(curve - 0.3 >= lower - 1e-9) and np.all(curve + 0.3 <= upper + 1e-9)
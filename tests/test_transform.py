@@ -0,0 +1,34 @@
+import numpy as np
+
+from volum.core.scene import Scene
+from volum.objects.sphere import Sphere
+from volum.objects.transform import Transform
+
+
+def test_distance_with_non_uniform_scale():
+    ellipsoid = Transform(Sphere(1.0), scale=[1, 2, 3])
+    assert np.isclose(ellipsoid.distance_to([0, 0, 5]), 2)
+    assert np.isclose(ellipsoid.distance_to([4, 0, 0]), 3)
+
+
+def test_distance_matches_sampled_surface():
+    rng = np.random.default_rng(0)
+    ellipsoid = Transform(Sphere(1.0), position=[1, -2, 0.5], rotation=[30, 45, 60], scale=[0.5, 2, 3])
+    directions = rng.normal(size=(200000, 3))
+    surface = ellipsoid.transform_points(directions / np.linalg.norm(directions, axis=1, keepdims=True))
+
+    points = rng.uniform(-8, 8, size=(50, 3))
+    points = points[ellipsoid.distance_to_many(points) > 0]
+    expected = np.array([np.min(np.linalg.norm(surface - point, axis=1)) for point in points])
+    assert np.allclose(ellipsoid.distance_to_many(points), expected, atol=1e-2)
+
+
+def test_spatial_index_follows_in_place_moves():
+    scene = Scene()
+    near = scene.add_object(Transform(Sphere(1.0), position=[0, 0, 0]))
+    far = scene.add_object(Transform(Sphere(1.0), position=[10, 0, 0]))
+    assert scene.nearest_object([9, 0, 0])[0] == far
+
+    scene[far].position = [-10, 0, 0]
+    assert scene.nearest_object([9, 0, 0])[0] == near
+    assert scene.objects_in_box([-11, -1, -1], [-9, 1, 1]) == [far]
@@ -0,0 +1,36 @@
+import pytest
+
+from volum.api.scene import scene
+from volum.api.utils import create_scene_from_path
+from volum.core.scene import Scene
+from volum.objects.box import Box
+from volum.objects.sphere import Sphere
+from volum.plugins import BaseMaterialsPlugin, BaseShapesPlugin
+
+
+def save_scene(path) -> None:
+    saved = Scene()
+    saved.load_plugins([BaseShapesPlugin(), BaseMaterialsPlugin()])
+    saved.add_object(Box(1, 2, 3))
+    saved.add_object(Sphere(0.5), id="ball")
+    saved.save(str(path))
+
+def test_load_scene_file(tmp_path):
+    path = tmp_path / "scene.json"
+    save_scene(path)
+    create_scene_from_path(str(path))
+    assert sorted(scene.objects) == ["Box-0", "ball"]
+    assert scene["ball"].radius == 0.5
+    scene.clear()
+
+def test_truncated_file_leaves_the_scene(tmp_path):
+    path = tmp_path / "scene.json"
+    save_scene(path)
+    create_scene_from_path(str(path))
+
+    content = path.read_text()
+    path.write_text(content[:content.index('"ball"')])
+    with pytest.raises(RuntimeError):
+        create_scene_from_path(str(path), retries=2, delay=0)
+    assert sorted(scene.objects) == ["Box-0", "ball"]
+    scene.clear()
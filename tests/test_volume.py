@@ -0,0 +1,63 @@
+import numpy as np
+
+from volum.core.buffers import BufferStore
+from volum.core.scene import Scene
+from volum.objects.volume import Volume
+
+
+def test_statistics_are_computed_by_prepare(tmp_path):
+    path = str(tmp_path / "volume.npy")
+    np.save(path, np.arange(4 * 4 * 4, dtype=np.float32).reshape(4, 4, 4))
+    volume = Volume(1, 1, 1, path, statistics=True)
+
+    with BufferStore().collect():
+        assert volume.to_dict()["statistics"] is True # not computed while serializing
+
+    Scene().add_object(volume)
+    with BufferStore().collect():
+        assert volume.to_dict()["statistics"]["range"] == [0.0, 63.0]
+
+def test_invalidate_returns_the_dirty_bricks(tmp_path):
+    path = str(tmp_path / "volume.npy")
+    np.save(path, np.zeros((20, 20, 20), dtype=np.float32))
+    volume = Volume(1, 1, 1, path, brick_size=8) # bricks start at 0, 8 and 16
+
+    assert volume.invalidate([9, 0, 0], [10, 1, 1]) == [(1, 0, 0)]
+    assert volume.invalidate([8, 0, 0], [9, 1, 1]) == [(0, 0, 0), (1, 0, 0)] # shared with the previous brick
+    assert volume.invalidate([15, 15, 17], [30, 17, 30]) == [(1, 1, 2), (1, 2, 2), (2, 1, 2), (2, 2, 2)]
+    assert volume.invalidate([4, 4, 4], [4, 10, 10]) == []
+    assert len(volume.invalidate()) == 27
+
+def test_invalidate_updates_the_coarser_levels(tmp_path):
+    path = str(tmp_path / "volume.npy")
+    data = np.random.default_rng(0).uniform(size=(20, 20, 20)).astype(np.float32)
+    np.save(path, data)
+    volume = Volume(1, 1, 1, path, brick_size=4)
+    coarsest = volume.pyramid_level(3).copy()
+    revision = volume.revision()
+
+    data[0:2, 10:11, 3:7] += 10 # stored [z, y, x]
+    np.save(path, data)
+    assert volume.invalidate([3, 10, 0], [7, 11, 2]) == [(0, 2, 0), (1, 2, 0)]
+    assert volume.revision() != revision
+
+    fresh = Volume(1, 1, 1, path, brick_size=4)
+    for level in range(4):
+        np.testing.assert_allclose(volume.pyramid_level(level), fresh.pyramid_level(level), rtol=1e-6)
+    assert not np.allclose(volume.pyramid_level(3), coarsest)
+
+def test_invalidate_rescaled_or_resized_volumes(tmp_path):
+    path = str(tmp_path / "volume.npy")
+    np.save(path, np.zeros((16, 16, 16), dtype=np.float32))
+    volume = Volume(1, 1, 1, path, brick_size=8, quantize="uint8")
+    volume.value_range()
+
+    data = np.zeros((16, 16, 16), dtype=np.float32)
+    data[0, 0, 0] = 1 # a new maximum scales every brick differently
+    np.save(path, data)
+    assert len(volume.invalidate([0, 0, 0], [1, 1, 1])) == 8
+
+    volume.pyramid_level(1)
+    np.save(path, np.ones((16, 16, 24), dtype=np.float32)) # stored [z, y, x]
+    assert len(volume.invalidate()) == 3 * 2 * 2
+    np.testing.assert_array_equal(volume.pyramid_level(1), np.ones((12, 8, 8)))
@@ -0,0 +1,28 @@
+import os
+
+from volum.api.worker import ScriptWorker
+from volum.core.scene import Scene
+
+SCRIPT = """
+from volum.core.scene import Scene
+from volum.objects.box import Box
+
+scene = Scene()
+scene.add_object(Box(1, 2, 3))
+scene.save({path!r})
+"""
+
+
+def test_run_returns_scene(tmp_path):
+    script = tmp_path / "scene.py"
+    script.write_text(SCRIPT.format(path=str(tmp_path / "scene.json")))
+    worker = ScriptWorker(timeout=60)
+    try:
+        scene, path = worker.run(str(script))
+    finally:
+        worker.stop()
+
+    assert isinstance(scene, Scene)
+    assert list(scene.objects) == ["Box-0"]
+    assert path == str(tmp_path / "scene.json")
+    assert not os.path.exists(path) # handed back, not written
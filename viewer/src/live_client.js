@@ -5,7 +5,7 @@
 import * as THREE               from '/static/three-proxy.js';
 import { PointerLockControls }  from '/static/three-proxy.js';
 import { OrbitControls }        from '/static/three-proxy.js';
-import { loadSceneFromJSON }    from '/static/scene_loader.js';
+import { loadSceneFromJSON, applyScenePatch, updateLevelsOfDetail, updateVolumeBricks } from '/static/scene_loader.js';
 import { RoomEnvironment }      from '/static/three-proxy.js';
 import { RGBELoader }           from '/static/three-proxy.js';
 import { indoorEnv, outdoorEnv }from '/static/assets/index.js';
@@ -300,32 +300,73 @@ function clearScene() {
     scene.children.slice().forEach(c => scene.remove(c));
 }
 
-// Live-update socket
-const ws = new WebSocket(`ws://${location.host}/api/scene/ws`);
-ws.onmessage = async ({ data }) => {
+let sceneETag = null; // ETag of the last fully loaded scene
+
+/**
+ * Fetches the scene and rebuilds it from scratch.
+ * @param {boolean} [onlyIfChanged=false] - Skip the rebuild if the scene's ETag matches the loaded scene.
+ */
+async function reloadScene(onlyIfChanged = false) {
+    const response = await fetch('/api/scene?binary=true');
+    const etag = response.headers.get('ETag');
+    if (onlyIfChanged && etag && etag === sceneETag) {
+        console.log('Scene unchanged, skipping reload');
+        return;
+    }
+    sceneETag = etag;
+    const json = await response.json();
+    clearScene();
+    await loadSceneFromJSON(json, scene);
+
+    toggleAllLights(scene, checkboxLight.checked);
+    toggleAllLightShadows(scene, checkboxShadows.checked);
+    toggleGridHelper(scene, checkboxGrid.checked);
+    toggleAxesHelper(scene, checkboxAxes.checked);
+    console.log('Scene reloaded');
+}
+
+// Live-update socket, reconnects after connection loss
+let socketConnected = false;
+function connectLiveSocket() {
+    const ws = new WebSocket(`ws://${location.host}/api/scene/ws`);
+    ws.onmessage = onLiveMessage;
+    ws.onopen = () => {
+        console.log('Live socket open');
+        if (socketConnected) reloadScene(true); // catch up on changes missed while disconnected
+        socketConnected = true;
+    };
+    ws.onclose = () => {
+        console.warn('Live socket closed, reconnecting...');
+        setTimeout(connectLiveSocket, 1000);
+    };
+}
+
+async function onLiveMessage({ data }) {
     if (data === 'scene_updated') {
         console.log('Scene updated, reloading...');
-        const json = await fetch('/api/scene').then(r => r.json());
-        clearScene();
-        await loadSceneFromJSON(json, scene);
-
-        toggleAllLights(scene, checkboxLight.checked);
-        toggleAllLightShadows(scene, checkboxShadows.checked);
-        toggleGridHelper(scene, checkboxGrid.checked);
-        toggleAxesHelper(scene, checkboxAxes.checked);
-        console.log('Scene reloaded');
+        await reloadScene();
     }
-    if (data === 'volume_updated') {
-        const tex = await loadVolumeTexture('/scene/volume', { width, height, depth });
-        volumeMesh.material.uniforms.uDataTex.value = tex;
+    else if (data.startsWith('{')) {
+        const message = JSON.parse(data);
+        if (message.event === 'scene_patch') {
+            await applyScenePatch(message, scene);
+
+            toggleAllLights(scene, checkboxLight.checked);
+            toggleAllLightShadows(scene, checkboxShadows.checked);
+            populateSceneInspector();
+        }
+        else if (message.event === 'volume_updated') {
+            await updateVolumeBricks(message, scene);
+        }
     }
-};
-ws.onopen  = () => console.log('Live socket open');
-ws.onclose = () => console.warn('Live socket closed');
+}
+connectLiveSocket();
 
 // Initial load
 (async function init() {
-    const json = await fetch('/api/scene').then(r => r.json());
+    const response = await fetch('/api/scene?binary=true');
+    sceneETag = response.headers.get('ETag');
+    const json = await response.json();
     await loadSceneFromJSON(json, scene);
 
     toggleAllLights(scene, checkboxLight.checked); // check for lights
@@ -426,6 +467,7 @@ export class Animation {
 
 const clock = new THREE.Clock();
 let time = 0;
+let frame = 0;
 
 export let animations = [] // where functions for all scene animations are stored
 
@@ -463,6 +505,11 @@ function animate() {
         controls.update(); // for enabled damping
     }
 
+    // switch levels of detail every 30 frames
+    if (++frame % 30 === 0) {
+        updateLevelsOfDetail(scene, camera);
+    }
+
     // scale axes helper based on camera distance
     let axesHelper = scene.getObjectByName('axesHelper');
     if (axesHelper) {
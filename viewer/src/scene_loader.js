@@ -4,7 +4,7 @@
  */
 import * as THREE from './three-proxy.js';
 import { threetone } from '/static/assets/index.js';
-import { viridis, magma, plasma, inferno, inferno_volumetric } from './shaders/index.js';
+import { viridis, magma, plasma, inferno, inferno_volumetric, instance_colors } from './shaders/index.js';
 import { surfaceNets } from './three-proxy.js';
 import { Animation, animations } from './live_client.js';
 
@@ -17,6 +17,9 @@ const typeMap = {
   PointLight: (props) => new THREE.PointLight(new THREE.Color(props.color ?? 0xffffff), props.intensity ?? 1),
   Cylinder: (props) => new THREE.CylinderGeometry(props.radius_top, props.radius_bottom, props.height, props.radial_segments ?? 32, props.height_segments ?? 1, props.open_ended ?? false, props.theta_start ?? 0, props.theta_length ?? Math.PI * 2),
   Line: (props) => {
+    if (ArrayBuffer.isView(props.args[0])) {
+      return new THREE.BufferGeometry().setAttribute('position', new THREE.BufferAttribute(toVec3Array(props.args[0]), 3));
+    }
     const points = props.args[0].map(p => new THREE.Vector3(...p));
     return new THREE.BufferGeometry().setFromPoints(points);
   },
@@ -159,41 +162,523 @@ const materialMap = {
   }
 };
 
+// Typed array constructors for binary buffers served by /api/scene/buffers/{id}
+const bufferTypes = {
+  float32: Float32Array,
+  float64: Float64Array,
+  int8: Int8Array,
+  int16: Int16Array,
+  int32: Int32Array,
+  uint8: Uint8Array,
+  uint16: Uint16Array,
+  uint32: Uint32Array,
+  float16: Uint16Array // decoded to Float32Array, see halfToFloat()
+};
+
+/**
+ * Decodes IEEE 754 half precision floats, which have no typed array.
+ * @param {Uint16Array} halves - The raw half precision values.
+ * @returns {Float32Array} The values as single precision floats.
+ */
+function halfToFloat(halves) {
+  const floats = new Float32Array(halves.length);
+  for (let i = 0; i < halves.length; i++) {
+    const h = halves[i];
+    const sign = h & 0x8000 ? -1 : 1;
+    const exponent = (h >> 10) & 0x1f;
+    const fraction = h & 0x3ff;
+    if (exponent === 0) floats[i] = sign * fraction * 2 ** -24; // subnormal
+    else if (exponent === 0x1f) floats[i] = fraction ? NaN : sign * Infinity;
+    else floats[i] = sign * (1 + fraction / 1024) * 2 ** (exponent - 15);
+  }
+  return floats;
+}
+
+/**
+ * Replaces binary buffer references ({ buffer, dtype, shape }) in the scene JSON with typed arrays.
+ * The fetched data is wrapped as is, the shape is attached to the typed array.
+ * @param {*} value - The (part of the) scene JSON to resolve.
+ * @param {Map<string, Promise<ArrayBuffer>>} [requests] - Pending buffer requests, to fetch shared buffers once.
+ * @returns {Promise<*>} The value with all buffer references resolved.
+ */
+export async function resolveBuffers(value, requests = new Map()) {
+  if (Array.isArray(value)) {
+    if (value.length === 0 || typeof value[0] === 'number') return value; // plain number lists can't hold references
+    return Promise.all(value.map(v => resolveBuffers(v, requests)));
+  }
+  if (!value || typeof value !== 'object' || ArrayBuffer.isView(value)) return value;
+
+  if (typeof value.buffer === 'string' && typeof value.dtype === 'string' && Array.isArray(value.shape)) {
+    const TypedArray = bufferTypes[value.dtype];
+    if (!TypedArray) {
+      console.warn(`Unsupported buffer dtype: ${value.dtype}`);
+      return null;
+    }
+    if (!requests.has(value.buffer)) {
+      requests.set(value.buffer, fetch(`/api/scene/buffers/${value.buffer}`).then(r => {
+        if (!r.ok) throw new Error(`Failed to fetch buffer ${value.buffer}: ${r.status}`);
+        return r.arrayBuffer();
+      }));
+    }
+    let array = new TypedArray(await requests.get(value.buffer));
+    if (value.dtype === 'float16') array = halfToFloat(array);
+    array.shape = value.shape;
+    return array;
+  }
+
+  for (const key of Object.keys(value)) {
+    value[key] = await resolveBuffers(value[key], requests);
+  }
+  return value;
+}
+
 /**
  * Loads a 3D scene from a JSON object.
  * @param {Object} sceneJSON - The JSON representation of the scene.
  * @param {THREE.Scene} scene - The Three.js scene to populate.
  */
 export async function loadSceneFromJSON(sceneJSON, scene) {
+  await resolveBuffers(sceneJSON);
+
   // Lights
   scene.add(new THREE.AmbientLight(0xffffff, 0.3));
 
   // Objects
   console.log(sceneJSON.objects.length, "objects in scene");
-  for (const obj of sceneJSON.objects) {
-    let threeObjects = await buildObject(obj);
-
-    if (threeObjects) {
-      if (!Array.isArray(threeObjects)) threeObjects = [threeObjects];
-      threeObjects.forEach(threeObject => {
-        if (threeObject.material && 'envMap' in threeObject.material) {
-          threeObject.material.envMap = scene.environment; // set environment map for physical materials
-          threeObject.material.needsUpdate = true; // ensure material is updated
-        }
-        scene.add(threeObject);
-        threeObject.meta = {
-          name: obj.type,
-          material: obj.material ? obj.material.type : ''
-        };
-        console.log(`Added object: ${obj.type}`, threeObject);
+  scene.userData.volumObjects = new Map(); // object key -> built Three.js objects, used to apply patches
+  const keys = objectKeys(sceneJSON.objects);
+  for (let i = 0; i < sceneJSON.objects.length; i++) {
+    await addObject(sceneJSON.objects[i], keys[i], scene);
+  }
+}
+
+/**
+ * Applies a scene patch (see volum/api/diff.py) in place. Only added and changed objects are (re)built.
+ * @param {Object} patch - The patch, holding the added, changed and removed objects by key.
+ * @param {THREE.Scene} scene - The Three.js scene, previously populated by loadSceneFromJSON.
+ */
+export async function applyScenePatch(patch, scene) {
+  const built = scene.userData.volumObjects ?? (scene.userData.volumObjects = new Map());
+  await resolveBuffers(patch.added);
+  await resolveBuffers(patch.changed);
+
+  for (const key of [...patch.removed, ...Object.keys(patch.changed)]) {
+    removeObject(key, scene);
+  }
+  for (const [key, obj] of [...Object.entries(patch.added), ...Object.entries(patch.changed)]) {
+    await addObject(obj, key, scene);
+  }
+  console.log(`Scene patched: ${Object.keys(patch.added).length} added, ${Object.keys(patch.changed).length} changed, ${patch.removed.length} removed (${built.size} objects)`);
+}
+
+// Maximum number of instances of a level of detail the viewer loads, see updateLevelsOfDetail()
+const LOD_INSTANCE_BUDGET = 200000;
+
+/**
+ * Switches objects with levels of detail (downsampled Quivers) to the level matching the camera distance,
+ * fields with a pyramid (Contours) are refined by updateFieldBricks().
+ * Each level holds about a quarter of the arrows of the previous one, i.e. it suits twice the distance.
+ * The finest level shown is the finest one within LOD_INSTANCE_BUDGET instances.
+ * @param {THREE.Scene} scene - The Three.js scene, previously populated by loadSceneFromJSON.
+ * @param {THREE.Camera} camera - The camera.
+ */
+export function updateLevelsOfDetail(scene, camera) {
+  const built = scene.userData.volumObjects;
+  if (!built) return;
+
+  for (const [key, threeObjects] of built) {
+    if (threeObjects[0]?.userData.pyramid) {
+      updateFieldBricks(key, threeObjects, scene, camera);
+      continue;
+    }
+    const lod = threeObjects[0]?.userData.lod;
+    if (!lod || lod.loading) continue;
+
+    const [min_x, min_y, min_z, max_x, max_y, max_z] = lod.bounds;
+    const center = new THREE.Vector3((min_x + max_x) / 2, (min_y + max_y) / 2, (min_z + max_z) / 2);
+    const size = Math.max(new THREE.Vector3(max_x - min_x, max_y - min_y, max_z - min_z).length(), 1e-6);
+
+    let finest = lod.counts.findIndex(count => count <= LOD_INSTANCE_BUDGET);
+    if (finest < 0) finest = lod.counts.length - 1;
+    const level = Math.min(finest + Math.max(0, Math.floor(Math.log2(camera.position.distanceTo(center) / size))), lod.counts.length - 1);
+    if (level === lod.level) continue;
+
+    lod.loading = true;
+    fetch(`/api/scene/object/${encodeURIComponent(key)}/lod/${level}`)
+      .then(r => {
+        if (!r.ok) throw new Error(`Failed to fetch level of detail ${level} of ${key}: ${r.status}`);
+        return r.json();
+      })
+      .then(async data => {
+        if (built.get(key) !== threeObjects) return; // replaced meanwhile, e.g. by a live reload
+        const mesh = await buildObject({ ...lod.obj, args: data.args, shape: data.shape, lod_level: data.level, lengths: data.lengths, colors: data.colors });
+        if (!mesh || built.get(key) !== threeObjects) return;
+        removeObject(key, scene);
+        mesh.userData.lod.key = key;
+        mesh.meta = threeObjects[0].meta;
+        scene.add(mesh);
+        built.set(key, [mesh]);
+      })
+      .catch(error => {
+        console.warn(error);
+        lod.level = level; // don't retry on every update
+      })
+      .finally(() => { lod.loading = false; });
+  }
+}
+
+// Maximum number of samples of a pyramid level the viewer refines, see updateFieldBricks()
+const FIELD_SAMPLE_BUDGET = 128 ** 3;
+
+/**
+ * Refines the coarse preview of a field with a pyramid (e.g. a Contour) by the bricks of the level matching the camera
+ * distance that are in view. The preview is shown until a brick of that level has been loaded.
+ * @param {string} key - The object's key.
+ * @param {Array<THREE.Object3D>} threeObjects - The object's meshes, the preview ones first.
+ * @param {THREE.Scene} scene - The Three.js scene.
+ * @param {THREE.Camera} camera - The camera.
+ */
+function updateFieldBricks(key, threeObjects, scene, camera) {
+  const pyramid = threeObjects[0].userData.pyramid;
+  const [min_x, min_y, min_z, max_x, max_y, max_z] = pyramid.bounds;
+  const extent = new THREE.Vector3(max_x - min_x, max_y - min_y, max_z - min_z);
+  const size = Math.max(extent.length(), 1e-6);
+  const coarsest = pyramid.shapes.length - 1;
+
+  let finest = pyramid.shapes.findIndex(shape => shape.reduce((a, b) => a * b, 1) <= FIELD_SAMPLE_BUDGET);
+  if (finest < 0) finest = coarsest;
+  const level = Math.min(finest + Math.max(0, Math.floor(Math.log2(camera.position.length() / size))), coarsest);
+
+  if (level !== pyramid.level) {
+    // drop the bricks of the previous level, their material is the preview's
+    for (const meshes of pyramid.bricks.values()) {
+      meshes.forEach(mesh => {
+        scene.remove(mesh);
+        mesh.geometry.dispose();
+        threeObjects.splice(threeObjects.indexOf(mesh), 1);
       });
-    } else {
-      console.warn(`Failed to build object(s) of type ${obj.type} with properties`, obj);
-      continue; // skip this object if it failed to build
+    }
+    pyramid.bricks.clear();
+    pyramid.level = level;
+  }
+  const previews = threeObjects.filter(mesh => !mesh.userData.brick);
+  previews.forEach(mesh => { mesh.visible = pyramid.bricks.size === 0; });
+  if (level === coarsest) return;
+
+  const shape = pyramid.shapes[level];
+  const step = shape.map((n, axis) => extent.getComponent(axis) / Math.max(n - 1, 1));
+  const frustum = new THREE.Frustum().setFromProjectionMatrix(new THREE.Matrix4().multiplyMatrices(camera.projectionMatrix, camera.matrixWorldInverse));
+  const [cx, cy, cz] = pyramid.brick_counts[level];
+  for (let i = 0; i < cx; i++) for (let j = 0; j < cy; j++) for (let k = 0; k < cz; k++) {
+    const brick = `${i},${j},${k}`;
+    if (pyramid.bricks.has(brick) || pyramid.pending.has(`${level}/${brick}`)) continue;
+
+    const start = [i, j, k].map(index => index * pyramid.brick_size);
+    const stop = start.map((first, axis) => Math.min(first + pyramid.brick_size, shape[axis] - 1));
+    const box = new THREE.Box3(
+      new THREE.Vector3(...start.map((first, axis) => first * step[axis] - extent.getComponent(axis) / 2)),
+      new THREE.Vector3(...stop.map((last, axis) => last * step[axis] - extent.getComponent(axis) / 2))
+    );
+    if (!frustum.intersectsBox(box)) continue;
+
+    pyramid.pending.add(`${level}/${brick}`);
+    fetch(`/api/scene/object/${encodeURIComponent(key)}/bricks/${level}/${brick}`)
+      .then(async r => {
+        if (!r.ok) throw new Error(`Failed to fetch brick ${brick} of level ${level} of ${key}: ${r.status}`);
+        const TypedArray = bufferTypes[r.headers.get('X-Volum-Dtype')] ?? Float32Array;
+        return { values: new TypedArray(await r.arrayBuffer()), shape: r.headers.get('X-Volum-Shape').split(',').map(Number) };
+      })
+      .then(({ values, shape: brickShape }) => {
+        if (scene.userData.volumObjects.get(key) !== threeObjects || pyramid.level !== level) return; // replaced or switched meanwhile
+        const meshes = buildScalarFieldMesh(previews[0].material, null, values, pyramid.obj.levels, ...pyramid.bounds, pyramid.obj.colormap ?? 'magnitude', brickShape);
+        meshes.forEach(mesh => {
+          mesh.position.set(...start.map((first, axis) => first * step[axis] - extent.getComponent(axis) / 2));
+          mesh.scale.set(...step);
+          mesh.userData.brick = brick;
+          mesh.meta = threeObjects[0].meta;
+          scene.add(mesh);
+          threeObjects.push(mesh);
+        });
+        pyramid.bricks.set(brick, meshes);
+        previews.forEach(mesh => { mesh.visible = false; });
+      })
+      .catch(error => console.warn(error))
+      .finally(() => pyramid.pending.delete(`${level}/${brick}`));
+  }
+}
+
+// Maximum number of samples of a volume level the viewer loads, see refineVolume()
+const VOLUME_SAMPLE_BUDGET = 256 ** 3;
+
+/**
+ * Fetches a brick of a pyramid level of an object, see GET /api/scene/object/{id}/bricks/{level}/{brick}.
+ * @param {string} key - The object's key (its ID).
+ * @param {number} level - The pyramid level.
+ * @param {Array<number>} index - The brick index along each axis.
+ * @returns {Promise<{values: TypedArray, shape: Array<number>, range: Array<number>|null}>} The brick's samples (x-fastest),
+ *   shape and, for bricks quantized by their own range, that range.
+ */
+async function fetchBrick(key, level, index) {
+  const r = await fetch(`/api/scene/object/${encodeURIComponent(key)}/bricks/${level}/${index.join(',')}`);
+  if (!r.ok) throw new Error(`Failed to fetch brick ${index} of level ${level} of ${key}: ${r.status}`);
+  const TypedArray = bufferTypes[r.headers.get('X-Volum-Dtype')] ?? Float32Array;
+  const range = r.headers.get('X-Volum-Range');
+  return {
+    values: new TypedArray(await r.arrayBuffer()),
+    shape: r.headers.get('X-Volum-Shape').split(',').map(Number),
+    range: range ? range.split(',').map(Number) : null
+  };
+}
+
+/**
+ * Copies a brick into the samples of a volume level, row by row. Integer samples are normalized to [0, 1] like
+ * those of an 8-bit texture, floats are copied as they are. Bricks quantized by their own range are rescaled
+ * to the volume's range.
+ * @param {TypedArray} target - The level's samples, x-fastest.
+ * @param {Array<number>} shape - The level's shape.
+ * @param {TypedArray} values - The brick's samples, x-fastest.
+ * @param {Array<number>} brickShape - The brick's shape.
+ * @param {Array<number>} start - The brick's first sample within the level.
+ * @param {Array<number>|null} [brickRange=null] - The range the brick was quantized from, see fetchBrick().
+ * @param {Array<number>|null} [volumeRange=null] - The volume's range, required with brickRange.
+ */
+function writeBrick(target, shape, values, brickShape, start, brickRange = null, volumeRange = null) {
+  const [nx, ny] = shape;
+  const [bx, by, bz] = brickShape;
+  const isFloat = values instanceof Float32Array || values instanceof Float64Array;
+  const top = isFloat ? 1 : 2 ** (8 * values.BYTES_PER_ELEMENT) - 1;
+  const targetTop = target instanceof Uint8Array ? 255 : 1;
+
+  // sample -> target value, as scale * sample + offset
+  let scale = isFloat ? 1 : targetTop / top, offset = 0;
+  if (brickRange && volumeRange) {
+    const [low, high] = brickRange;
+    const [volumeLow, volumeHigh] = volumeRange;
+    const extent = volumeHigh > volumeLow ? volumeHigh - volumeLow : 1;
+    scale = (high - low) / top / extent * targetTop;
+    offset = (low - volumeLow) / extent * targetTop;
+  }
+  const round = target instanceof Uint8Array;
+
+  for (let z = 0; z < bz; z++) {
+    for (let y = 0; y < by; y++) {
+      const row = values.subarray((z * by + y) * bx, (z * by + y + 1) * bx);
+      const first = start[0] + (start[1] + y) * nx + (start[2] + z) * nx * ny;
+      if (scale === 1 && offset === 0) target.set(row, first);
+      else if (round) for (let x = 0; x < bx; x++) target[first + x] = Math.min(255, Math.max(0, Math.round(row[x] * scale + offset)));
+      else for (let x = 0; x < bx; x++) target[first + x] = row[x] * scale + offset;
     }
   }
 }
 
+/**
+ * Loads a level of a volume served in bricks into a 3D texture.
+ * @param {string} key - The object's key (its ID).
+ * @param {Object} pyramid - The volume's pyramid, as described by Volume.pyramid_dict().
+ * @param {number} level - The pyramid level.
+ * @returns {Promise<THREE.Data3DTexture>} The texture.
+ */
+async function loadVolumeLevel(key, pyramid, level) {
+  const shape = pyramid.shapes[level];
+  const [cx, cy, cz] = pyramid.bricks[level];
+  const data = pyramid.dtype === 'uint8' ? new Uint8Array(shape[0] * shape[1] * shape[2]) : new Float32Array(shape[0] * shape[1] * shape[2]);
+
+  const requests = [];
+  for (let i = 0; i < cx; i++) for (let j = 0; j < cy; j++) for (let k = 0; k < cz; k++) {
+    const index = [i, j, k];
+    requests.push(fetchBrick(key, level, index).then(({ values, shape: brickShape, range }) => {
+      writeBrick(data, shape, values, brickShape, index.map(n => n * pyramid.brick_size), range, pyramid.range);
+    }));
+  }
+  await Promise.all(requests);
+  return createVolumeTexture(data, shape);
+}
+
+/**
+ * Wraps x-fastest volume samples in a 3D texture.
+ * @param {Uint8Array|Float32Array} data - The samples.
+ * @param {Array<number>} shape - The sample counts (x, y, z).
+ * @returns {THREE.Data3DTexture} The texture.
+ */
+function createVolumeTexture(data, shape) {
+  const texture = new THREE.Data3DTexture(data, ...shape);
+  texture.format = THREE.RedFormat;
+  texture.type = data instanceof Uint8Array ? THREE.UnsignedByteType : THREE.FloatType;
+  texture.minFilter = THREE.LinearFilter;
+  texture.magFilter = THREE.LinearFilter;
+  texture.unpackAlignment = 1;
+  texture.needsUpdate = true;
+  return texture;
+}
+
+/**
+ * Loads a volume file the server doesn't serve, e.g. from a URL.
+ * @param {string} url - The volume file, raw samples stored x-fastest.
+ * @param {Object} options - The volume's shape (x, y, z) and dtype ('uint8' or 'float32').
+ * @returns {Promise<THREE.Data3DTexture|null>} The texture, or null if the volume can't be loaded.
+ */
+async function loadVolumeTexture(url, { shape, dtype = 'uint8' }) {
+  if (!Array.isArray(shape) || shape.length !== 3) {
+    console.warn(`Volume: the shape of ${url} is required, got ${shape}`);
+    return null;
+  }
+  const r = await fetch(url);
+  if (!r.ok) {
+    console.warn(`Volume: failed to fetch ${url}: ${r.status}`);
+    return null;
+  }
+  const TypedArray = bufferTypes[dtype] ?? Uint8Array;
+  const values = new TypedArray(await r.arrayBuffer());
+  const data = values instanceof Uint8Array ? values : new Float32Array(values.length);
+  if (data !== values) writeBrick(data, shape, values, shape, [0, 0, 0]);
+  return createVolumeTexture(data, shape);
+}
+
+/**
+ * Builds the proxy box a volume is rendered on.
+ * @param {THREE.Data3DTexture} texture - The volume texture.
+ * @param {Object} options - The volume's width, height and depth in the scene.
+ * @returns {THREE.Mesh} The mesh.
+ */
+function createVolumeProxyMesh(texture, { width, height, depth }) {
+  const image = texture.image;
+  const mesh = new THREE.Mesh(new THREE.BoxGeometry(2, 2, 2), inferno_volumetric(texture, [image.width, image.height, image.depth]));
+  mesh.scale.set(width / 2, height / 2, depth / 2); // the shader maps the box [-1, 1] to texture coordinates
+  return mesh;
+}
+
+/**
+ * Refines a volume level by level, down to the finest level within VOLUME_SAMPLE_BUDGET samples.
+ * @param {string} key - The volume's key (its ID).
+ * @param {THREE.Mesh} mesh - The volume's proxy mesh.
+ */
+async function refineVolume(key, mesh) {
+  const volume = mesh.userData.volume;
+  const { shapes } = volume.pyramid;
+  let target = shapes.findIndex(shape => shape[0] * shape[1] * shape[2] <= VOLUME_SAMPLE_BUDGET);
+  if (target < 0) target = shapes.length - 1;
+
+  for (let level = volume.level - 1; level >= target; level--) {
+    try {
+      const texture = await loadVolumeLevel(key, volume.pyramid, level);
+      if (!mesh.parent) { // removed meanwhile
+        texture.dispose();
+        return;
+      }
+      const uniforms = mesh.material.uniforms;
+      uniforms.uField.value.dispose();
+      uniforms.uField.value = texture;
+      uniforms.uSize.value.set(...shapes[level]);
+      volume.level = level;
+    } catch (error) {
+      console.warn(error);
+      return;
+    }
+  }
+}
+
+/**
+ * Reloads the changed bricks of a volume, as announced by a volume_updated event.
+ * The bricks are those of level 0, the viewer reloads the bricks of its level covering them.
+ * @param {Object} message - The event, holding the volume's id and its dirty bricks.
+ * @param {THREE.Scene} scene - The Three.js scene.
+ */
+export async function updateVolumeBricks(message, scene) {
+  const mesh = scene.userData.volumObjects?.get(String(message.id))?.[0];
+  const volume = mesh?.userData.volume;
+  if (!volume) return;
+
+  const level = volume.level;
+  const factor = 2 ** level;
+  const bricks = new Map(message.bricks.map(index => {
+    const scaled = index.map(n => Math.floor(n / factor));
+    return [scaled.join(','), scaled];
+  }));
+
+  const texture = mesh.material.uniforms.uField.value;
+  await Promise.all([...bricks.values()].map(async index => {
+    try {
+      const { values, shape, range } = await fetchBrick(String(message.id), level, index);
+      if (volume.level !== level) return; // refined meanwhile, the new level is up to date
+      writeBrick(texture.image.data, volume.pyramid.shapes[level], values, shape, index.map(n => n * volume.pyramid.brick_size), range, volume.pyramid.range);
+      texture.needsUpdate = true;
+    } catch (error) {
+      console.warn(error);
+    }
+  }));
+}
+
+/**
+ * Derives the stable key of each object, i.e. its ID or else its type and occurrence among objects of the same type.
+ * Mirrors object_keys() in volum/api/diff.py.
+ * @param {Array<Object>} objects - The serialized scene objects.
+ * @returns {Array<string>} The object keys.
+ */
+function objectKeys(objects) {
+  const counts = {};
+  return objects.map(obj => {
+    if (obj.id != null) return String(obj.id);
+    const index = counts[obj.type] ?? 0;
+    counts[obj.type] = index + 1;
+    return `${obj.type}-${index}`;
+  });
+}
+
+/**
+ * Builds a serialized object and adds the result to the scene, registered under its key.
+ * @param {Object} obj - The JSON object describing the 3D object.
+ * @param {string} key - The stable key of the object.
+ * @param {THREE.Scene} scene - The Three.js scene to populate.
+ */
+async function addObject(obj, key, scene) {
+  let threeObjects = await buildObject(obj);
+
+  if (threeObjects) {
+    if (!Array.isArray(threeObjects)) threeObjects = [threeObjects];
+    threeObjects.forEach(threeObject => {
+      if (threeObject.material && 'envMap' in threeObject.material) {
+        threeObject.material.envMap = scene.environment; // set environment map for physical materials
+        threeObject.material.needsUpdate = true; // ensure material is updated
+      }
+      scene.add(threeObject);
+      if (threeObject.userData.lod) threeObject.userData.lod.key = key;
+      threeObject.meta = {
+        name: obj.type,
+        material: obj.material ? obj.material.type : ''
+      };
+      console.log(`Added object: ${obj.type}`, threeObject);
+    });
+    scene.userData.volumObjects.set(key, threeObjects);
+  } else {
+    console.warn(`Failed to build object(s) of type ${obj.type} with properties`, obj);
+  }
+}
+
+/**
+ * Removes the Three.js objects registered under a key from the scene and frees their GPU resources.
+ * @param {string} key - The stable key of the object.
+ * @param {THREE.Scene} scene - The Three.js scene.
+ */
+function removeObject(key, scene) {
+  const threeObjects = scene.userData.volumObjects.get(key);
+  if (!threeObjects) return;
+
+  threeObjects.forEach(threeObject => {
+    scene.remove(threeObject);
+    threeObject.traverse(child => {
+      if (child.geometry) child.geometry.dispose();
+      if (child.material) {
+        const materials = Array.isArray(child.material) ? child.material : [child.material];
+        materials.forEach(material => {
+          if (material.map) material.map.dispose();
+          material.dispose();
+        });
+      }
+    });
+  });
+  scene.userData.volumObjects.delete(key);
+}
+
 /**
  * Builds a Three.js object from a JSON representation.
  * @param {Object} obj - The JSON object describing the 3D object.
@@ -218,12 +703,28 @@ async function buildObject(obj) {
     return child;
   }
 
+  else if (obj.type === 'ObjectArray') {
+    const template = await buildObject(obj.object); // built once, shared by all instances
+    if (!template) return null;
+    return buildInstancedMesh(template, obj.positions, obj.rotations, obj.scales, obj.colors);
+  }
+
   else if (obj.type === 'Volume') {
+    if (obj.pyramid) {
+      // served by the server in bricks, the coarsest level first, refined in the background
+      const coarsest = obj.pyramid.shapes.length - 1;
+      const tex = await loadVolumeLevel(String(obj.id), obj.pyramid, coarsest);
+      const mesh = createVolumeProxyMesh(tex, { width: obj.width, height: obj.height, depth: obj.depth, color: obj.color ?? 0xffffff });
+      mesh.userData.volume = { pyramid: obj.pyramid, level: coarsest, statistics: obj.statistics ?? null }; // histograms for transfer functions
+      refineVolume(String(obj.id), mesh);
+      return mesh;
+    }
+
     const tex = await loadVolumeTexture(obj.file_path, {
-      width: obj.width,
-      height: obj.height,
-      depth: obj.depth
+      shape: obj.shape,
+      dtype: obj.dtype
     });
+    if (!tex) return null;
     return createVolumeProxyMesh(tex, {
       width: obj.width,
       height: obj.height,
@@ -319,6 +820,15 @@ async function buildObject(obj) {
       return null;
     }
 
+    if (obj.lengths) {
+      // arrow lengths and colors were computed by the server, see Quiver(precompute=True)
+      const mesh = buildPrecomputedVectorFieldMesh(geometry, obj.colors ? instance_colors.clone() : material, obj.args[0], obj.args[1], obj.lengths, obj.colors);
+      if (mesh && obj.lod_counts) {
+        mesh.userData.lod = { obj: { ...obj, args: null, lengths: null, colors: null }, level: obj.lod_level, counts: obj.lod_counts, bounds: obj.bounds, loading: false };
+      }
+      return mesh;
+    }
+
     const originalPos = obj.args[0];
     const originalVec = obj.args[1];
 
@@ -342,7 +852,12 @@ async function buildObject(obj) {
 
     console.assert(material, "Quiver: material must be defined");
 
-    return buildVectorFieldMesh(geometry, material, positionArray, vectorArray, obj.bounds, obj.min_length ?? 0.1, obj.max_length ?? 1, obj.colormap ?? 'magnitude');
+    const mesh = buildVectorFieldMesh(geometry, material, positionArray, vectorArray, obj.bounds, obj.min_length ?? 0.1, obj.max_length ?? 1, obj.colormap ?? 'magnitude', false, obj.magnitude_range);
+    if (mesh && obj.lod_counts) {
+      // the server sent a downsampled level, see updateLevelsOfDetail()
+      mesh.userData.lod = { obj: { ...obj, args: null }, level: obj.lod_level, counts: obj.lod_counts, bounds: obj.bounds, loading: false };
+    }
+    return mesh;
   }
 
   else if (obj.type === 'Contour') {
@@ -361,6 +876,11 @@ async function buildObject(obj) {
     }
 
 
+    if (obj.surfaces) {
+      // isosurfaces extracted by the server, see Contour(precompute=True)
+      return buildIsosurfaceMeshes(mat_or_col, obj.surfaces, ...obj.bounds);
+    }
+
     const positionArray = obj.args[0]
     const valueArray = obj.args[1];
 
@@ -371,7 +891,7 @@ async function buildObject(obj) {
 
     let shape = null;
     // reconstruct points using shape and convert positions and vectors to THREE.Vector3
-    if (positionArray.length > 0)  {
+    if (positionArray.length > 0 || obj.pyramid)  {
       shape = obj.shape ? obj.shape : [(obj.args[0].length) ** (1/3), (obj.args[0].length) ** (1/3), (obj.args[0].length) ** (1/3)];
       if (!Array.isArray(shape) || shape.length !== 3 || shape[0] <= 0 || shape[1] <= 0 || shape[2] <= 0) {
         console.warn(`Contour: Invalid shape: ${shape}`);
@@ -381,7 +901,16 @@ async function buildObject(obj) {
 
     console.assert(mat_or_col, "Contour: material must be defined");
 
-    return buildScalarFieldMesh(mat_or_col, positionArray.length > 0 ? positionArray : null, valueArray, obj.levels, ...obj.bounds ?? [0], obj.colormap ?? 'magnitude', shape);
+    const meshes = buildScalarFieldMesh(mat_or_col, positionArray.length > 0 ? positionArray : null, valueArray, obj.levels, ...obj.bounds ?? [0], obj.colormap ?? 'magnitude', shape);
+    if (meshes?.length && obj.pyramid) {
+      // a coarse preview, the bricks in view are refined by updateLevelsOfDetail()
+      const levels = obj.pyramid.shapes.length;
+      meshes[0].userData.pyramid = {
+        obj: { ...obj, args: null }, bounds: obj.bounds, shapes: obj.pyramid.shapes, brick_size: obj.pyramid.brick_size, brick_counts: obj.pyramid.bricks,
+        level: levels - 1, bricks: new Map(), pending: new Set()
+      };
+    }
+    return meshes;
   }
 
   else {
@@ -417,6 +946,77 @@ function buildObjectDefault(obj, castShadow = true, receiveShadow = true) {
   return mesh;
 }
 
+/**
+ * Builds a single instanced mesh that places copies of a template mesh.
+ * @param {THREE.Object3D} template - The built object to instance, its own transform is applied before the instance's.
+ * @param {Float32Array|number[][]} positions - The (n, 3) instance positions.
+ * @param {Float32Array|number[][]} rotations - The (n, 3) instance rotations, Euler angles in degrees.
+ * @param {Float32Array|number[][]} scales - The (n, 3) instance scales.
+ * @param {Uint8Array|number[][]|null} colors - The optional (n, 3) instance colors, RGB in [0, 255].
+ * @returns {THREE.InstancedMesh|null} The instanced mesh or null if invalid.
+ */
+function buildInstancedMesh(template, positions, rotations, scales, colors = null) {
+  if (!template.isMesh) {
+    console.warn(`ObjectArray: can only instance meshes, got ${template.type}`);
+    return null;
+  }
+
+  const flat = (array) => ArrayBuffer.isView(array) ? array : array.flat();
+  positions = flat(positions);
+  rotations = flat(rotations);
+  scales = flat(scales);
+  colors = colors ? flat(colors) : null;
+
+  const count = positions.length / 3;
+  if (rotations.length !== positions.length || scales.length !== positions.length || (colors && colors.length !== positions.length)) {
+    console.warn(`ObjectArray: positions, rotations, scales and colors must have the same length`);
+    return null;
+  }
+
+  const mesh = new THREE.InstancedMesh(template.geometry, template.material, count);
+  mesh.castShadow = template.castShadow;
+  mesh.receiveShadow = template.receiveShadow;
+
+  template.updateMatrix();
+  const dummy = new THREE.Object3D();
+  const matrix = new THREE.Matrix4();
+  const color = new THREE.Color();
+  for (let i = 0; i < count; i++) {
+    dummy.position.set(positions[i * 3], positions[i * 3 + 1], positions[i * 3 + 2]);
+    dummy.rotation.set(...toRadians([rotations[i * 3], rotations[i * 3 + 1], rotations[i * 3 + 2]]));
+    dummy.scale.set(scales[i * 3], scales[i * 3 + 1], scales[i * 3 + 2]);
+    dummy.updateMatrix();
+    mesh.setMatrixAt(i, matrix.multiplyMatrices(dummy.matrix, template.matrix));
+
+    if (colors) {
+      mesh.setColorAt(i, color.setRGB(colors[i * 3] / 255, colors[i * 3 + 1] / 255, colors[i * 3 + 2] / 255, THREE.SRGBColorSpace));
+    }
+  }
+
+  mesh.instanceMatrix.needsUpdate = true;
+  if (mesh.instanceColor) mesh.instanceColor.needsUpdate = true;
+  return mesh;
+}
+
+/**
+ * Helper function that pads a typed (n, 2) point array to (n, 3). (n, 3) arrays are returned as is.
+ * @param {Float32Array} points - The flat point array, with its shape attached.
+ * @returns {Float32Array} The flat (n, 3) point array.
+ */
+function toVec3Array(points) {
+  const itemSize = points.shape ? points.shape[1] : 3;
+  if (itemSize === 3) return points;
+
+  const count = points.length / itemSize;
+  const padded = new Float32Array(count * 3);
+  for (let i = 0; i < count; i++) {
+    for (let j = 0; j < Math.min(itemSize, 3); j++) {
+      padded[i * 3 + j] = points[i * itemSize + j];
+    }
+  }
+  return padded;
+}
+
 /**
  * Helper function that converts an array of angles in degrees to radians.
  * @param {number[]} degrees - The angles in degrees.
@@ -426,6 +1026,15 @@ function toRadians(degrees) {
   return degrees.map(d => d * Math.PI / 180);
 }
 
+/**
+ * Helper function that checks for plain or typed arrays.
+ * @param {*} value - The value to check.
+ * @returns {boolean} Whether the value is an array or typed array.
+ */
+function isArrayLike(value) {
+  return Array.isArray(value) || ArrayBuffer.isView(value);
+}
+
 
 // --- Custom Geometry Builders ---
 function buildPyramidGeometry({ base = 1, height = 1 }) {
@@ -463,7 +1072,7 @@ function buildPyramidGeometry({ base = 1, height = 1 }) {
  * @param {number} [max_length=1] - Maximum length of the vectors.
  * @returns {THREE.InstancedMesh|null} The created instanced mesh or null if there was an error.
  */
-function buildVectorFieldMesh(geometry, mat_or_col, positionArray, vectorArray, bounds, min_length = 0.1, max_length = 1, colormap = 'magnitude', animated = false) {
+function buildVectorFieldMesh(geometry, mat_or_col, positionArray, vectorArray, bounds, min_length = 0.1, max_length = 1, colormap = 'magnitude', animated = false, magnitude_range = null) {
   // center at origin
   if (geometry instanceof THREE.BufferGeometry) {
     geometry.center();
@@ -500,9 +1109,15 @@ function buildVectorFieldMesh(geometry, mat_or_col, positionArray, vectorArray,
 
   const mesh = new THREE.InstancedMesh(geometry.rotateX(Math.PI / 2), (mat_or_col instanceof THREE.Material) ? mat_or_col : null, positionArray.length);
   // Benchmarks for normalization and coloring
-  const lengths = vectorArray.map(v => v.length());
-  const min_vec_len = Math.min(...lengths);
-  const max_vec_len = Math.max(...lengths);
+  // a downsampled field is scaled by the magnitudes of the full field, if given
+  let min_vec_len, max_vec_len;
+  if (magnitude_range) {
+    [min_vec_len, max_vec_len] = magnitude_range;
+  } else {
+    const lengths = vectorArray.map(v => v.length());
+    min_vec_len = lengths.reduce((a, b) => Math.min(a, b), Infinity); // no spread, which overflows the stack for large fields
+    max_vec_len = lengths.reduce((a, b) => Math.max(a, b), -Infinity);
+  }
   
   buildVectorFieldMeshCPU(mesh, mat_or_col, positionArray, vectorArray, ...bounds, min_vec_len, max_vec_len, min_length, max_length, colormap, animated);
   return mesh;
@@ -609,6 +1224,78 @@ function buildVectorFieldMeshCPU(mesh, mat_or_col, positionArray, vectorArray, m
   return mesh;
 }
 
+/**
+ * Builds a vector field mesh from precomputed arrow lengths (and colors), straight from the flat arrays.
+ * @param {THREE.BufferGeometry} geometry - The arrow geometry.
+ * @param {THREE.Material} material - The material, the instance_colors shader if colors are given.
+ * @param {ArrayLike<number>} positions - The flat arrow positions (x, y, z, ...).
+ * @param {ArrayLike<number>} vectors - The flat arrow vectors, only their directions are used.
+ * @param {ArrayLike<number>} lengths - The visual arrow lengths.
+ * @param {ArrayLike<number>|null} colors - The flat arrow colors as RGB bytes, or null.
+ * @returns {THREE.InstancedMesh|null} The created instanced mesh or null if there was an error.
+ */
+function buildPrecomputedVectorFieldMesh(geometry, material, positions, vectors, lengths, colors = null) {
+  const count = lengths.length;
+  if (!(material instanceof THREE.Material)) {
+    console.warn(`buildPrecomputedVectorFieldMesh: material is not a THREE.Material, got ${material}`);
+    return null;
+  }
+  if (count === 0 || positions.length !== 3 * count || vectors.length !== 3 * count || (colors && colors.length !== 3 * count)) {
+    console.warn(`buildPrecomputedVectorFieldMesh: expected ${count} positions, vectors and colors, got ${positions.length / 3}, ${vectors.length / 3} and ${colors ? colors.length / 3 : 0}`);
+    return null;
+  }
+
+  geometry.center();
+  const mesh = new THREE.InstancedMesh(geometry.rotateX(Math.PI / 2), material, count);
+  if (colors) {
+    mesh.geometry.setAttribute('instanceRGB', new THREE.InstancedBufferAttribute(Uint8Array.from(colors), 3, true));
+  }
+
+  const dummy = new THREE.Object3D();
+  const target = new THREE.Vector3();
+  for (let i = 0; i < count; i++) {
+    dummy.position.set(positions[3 * i], positions[3 * i + 1], positions[3 * i + 2]);
+    target.set(vectors[3 * i], vectors[3 * i + 1], vectors[3 * i + 2]).add(dummy.position);
+    dummy.lookAt(target);
+    dummy.scale.setScalar(lengths[i]);
+    dummy.updateMatrix();
+    mesh.setMatrixAt(i, dummy.matrix);
+  }
+  return mesh;
+}
+
+/**
+ * Builds the meshes of isosurfaces extracted by the server, placed like those of buildScalarFieldMesh.
+ * @param {THREE.Material|string} mat_or_col - The material, or a colorscheme name (which falls back to the default material).
+ * @param {Array<Object>} surfaces - Per level the quantized vertex positions (uint16, within the grid) and triangle indices.
+ * @param {number} min_x - Minimum x coordinate of the bounding box.
+ * @param {number} min_y - Minimum y coordinate of the bounding box.
+ * @param {number} min_z - Minimum z coordinate of the bounding box.
+ * @param {number} max_x - Maximum x coordinate of the bounding box.
+ * @param {number} max_y - Maximum y coordinate of the bounding box.
+ * @param {number} max_z - Maximum z coordinate of the bounding box.
+ * @returns {Array<THREE.Mesh>} One mesh per level.
+ */
+function buildIsosurfaceMeshes(mat_or_col, surfaces, min_x, min_y, min_z, max_x, max_y, max_z) {
+  return surfaces.map(surface => {
+    const geo = new THREE.BufferGeometry();
+    // normalized, so the GPU maps the quantized positions to [0, 1] within the grid
+    const { positions, indices } = surface;
+    geo.setAttribute('position', new THREE.BufferAttribute(ArrayBuffer.isView(positions) ? positions : Uint16Array.from(positions), 3, true));
+    geo.setIndex(new THREE.BufferAttribute(ArrayBuffer.isView(indices) ? indices : Uint32Array.from(indices), 1));
+    geo.computeVertexNormals();
+
+    const mesh = new THREE.Mesh(geo, mat_or_col instanceof THREE.Material ? mat_or_col : undefined);
+    mesh.position.set(
+      -Math.abs(max_x - min_x) / 2,
+      -Math.abs(max_y - min_y) / 2,
+      -Math.abs(max_z - min_z) / 2
+    );
+    mesh.scale.set(max_x - min_x, max_y - min_y, max_z - min_z);
+    return mesh;
+  });
+}
+
 
 function buildScalarFieldMesh(mat_or_col, positionArray, valueArray, levels, min_x, min_y, min_z, max_x, max_y, max_z, colormap = 'magnitude', shape = null, animated = false) {
   if (positionArray != null) {
@@ -617,7 +1304,7 @@ function buildScalarFieldMesh(mat_or_col, positionArray, valueArray, levels, min
       return null;
     }
 
-    if (!Array.isArray(positionArray) || !Array.isArray(valueArray)) {
+    if (!isArrayLike(positionArray) || !isArrayLike(valueArray)) {
       console.warn(`buildScalarFieldMesh: positionArray and valueArray must be arrays, got ${typeof positionArray}, ${typeof valueArray}`);
       return null;
     }
@@ -625,7 +1312,7 @@ function buildScalarFieldMesh(mat_or_col, positionArray, valueArray, levels, min
     if ((positionArray[0] instanceof THREE.Vector3 || positionArray[0] instanceof THREE.Vector2) && positionArray.length !== valueArray.length) {
       console.warn(`buildScalarFieldMesh: positionArray and valueArray must have the same length, got ${positionArray.length}, ${valueArray.length}`);
       return null;
-    } else if (!Array.isArray(valueArray) || (valueArray.length !== positionArray.length && valueArray.length !== positionArray.length / 3)) {
+    } else if (!isArrayLike(valueArray) || (valueArray.length !== positionArray.length && valueArray.length !== positionArray.length / 3)) {
       console.warn(`buildScalarFieldMeshGPU: valueArray must be an array with the same length as positionArray, got ${valueArray.length} vs ${positionArray.length}`);
       return null;
     }
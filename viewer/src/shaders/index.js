@@ -3,5 +3,6 @@ import { material as magma } from './magma.js';
 import { material as plasma } from './plasma.js';
 import { material as inferno } from './inferno.js';
 import { material as inferno_volumetric } from './volumetric/inferno.js';
+import { material as instance_colors } from './instance_colors.js';
 
-export { viridis, magma, plasma, inferno, inferno_volumetric };
\ No newline at end of file
+export { viridis, magma, plasma, inferno, inferno_volumetric, instance_colors };
\ No newline at end of file
@@ -0,0 +1,27 @@
+import { ShaderMaterial, DoubleSide } from '/static/three-proxy.js';
+
+
+// Colors instances by a per-instance RGB attribute, e.g. colormapped by the server
+export const material = new ShaderMaterial({
+    vertexShader: /* glsl */`
+        attribute vec3 instanceRGB;
+        varying vec3 vColor;
+
+        void main() {
+            vColor = instanceRGB;
+            vec4 modelViewPosition = modelViewMatrix * instanceMatrix * vec4(position, 1.0);
+            gl_Position = projectionMatrix * modelViewPosition;
+            gl_PointSize = 1.0;
+        }
+    `,
+
+    fragmentShader: /* glsl */`
+        varying vec3 vColor;
+
+        void main() {
+            gl_FragColor = vec4(vColor, 1.0);
+        }
+    `,
+    transparent: true,
+    side: DoubleSide
+});
\ No newline at end of file
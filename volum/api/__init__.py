@@ -10,8 +10,9 @@ from contextlib import asynccontextmanager
 
 
 from volum.api.endpoints import router as scene_router
-from volum.api.endpoints import observer
+from volum.api.endpoints import observer, script_worker, reload_scheduler
 from volum.api.utils import set_main_event_loop
+from volum.objects.plotimage import plot_renderer
 from volum.config.runtime import runtime_config
 
 #from volum.api.schema import ScenePayload, SceneObjectPayload
@@ -32,11 +33,20 @@ def load_and_watch():
     # Start the watchdog observer
     observer.start()
 
+    # Spawn the script worker now, so the imports are warm by the first edit
+    if script_worker is not None:
+        script_worker.start()
+
 def cleanup_observer():
     # Stop and join the watcher cleanly
     observer.stop()
     observer.join()
 
+    reload_scheduler.close()
+    if script_worker is not None:
+        script_worker.stop()
+    plot_renderer.shutdown()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     load_and_watch()
@@ -0,0 +1,89 @@
+import gzip
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+MIN_COMPRESS_SIZE = 1024 # bytes, smaller responses are sent as is
+
+
+def available_encodings() -> List[str]:
+    """Get the supported content encodings, in order of preference."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported content encoding for an Accept-Encoding header.
+
+    Args:
+        accept_encoding (Optional[str]): The Accept-Encoding request header, e.g. "gzip, br;q=0.9".
+
+    Returns:
+        Optional[str]: The encoding to use, or None to send the response uncompressed.
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress data with one of the available_encodings()."""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=5)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+class CompressionCache:
+    """A small LRU cache of compressed response bodies, so unchanged payloads are only compressed once."""
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def get(self, key: Hashable, compute: Callable[[], bytes]) -> bytes:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        data = compute()
+        self._entries[key] = data
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return data
+
+    def clear(self):
+        self._entries.clear()
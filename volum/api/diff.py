@@ -0,0 +1,61 @@
+from typing import Any, Dict, List
+
+
+def object_keys(objects: List[Dict[str, Any]]) -> List[str]:
+    """Derive a stable identity for each serialized object.
+
+    Objects are keyed by their ID (see Scene.add_object). Objects without an ID, e.g. materials, are keyed by their type
+    and their occurrence among objects of the same type, e.g. "StandardMaterial-0". The viewer derives the same keys in scene_loader.js.
+
+    Args:
+        objects (List[Dict[str, Any]]): The serialized objects, as in Scene.serialize()["objects"].
+
+    Returns:
+        List[str]: The keys, in the order of the objects.
+    """
+    counts: Dict[str, int] = {}
+    keys = []
+    for obj in objects:
+        if obj.get("id") is not None:
+            keys.append(str(obj["id"]))
+            continue
+        obj_type = obj.get("type", "Object")
+        index = counts.get(obj_type, 0)
+        counts[obj_type] = index + 1
+        keys.append(f"{obj_type}-{index}")
+    return keys
+
+def diff_scenes(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute a structural patch between two serialized scenes.
+
+    Args:
+        old (Dict[str, Any]): The previous Scene.serialize() (or Scene.serialize_digests()) output.
+        new (Dict[str, Any]): The current Scene.serialize() (or Scene.serialize_digests()) output.
+
+    Returns:
+        Dict[str, Any]: The patch, holding the added, changed and removed objects by key.
+    """
+    old_objects = dict(zip(object_keys(old["objects"]), old["objects"]))
+    new_keys = object_keys(new["objects"])
+
+    added, changed = {}, {}
+    for key, obj in zip(new_keys, new["objects"]):
+        if key not in old_objects:
+            added[key] = obj
+        elif old_objects[key] != obj:
+            changed[key] = obj
+
+    new_key_set = set(new_keys)
+    removed = [key for key in old_objects if key not in new_key_set]
+
+    return {
+        "event": "scene_patch",
+        "file": new.get("file"),
+        "added": added,
+        "changed": changed,
+        "removed": removed
+    }
+
+def is_empty_patch(patch: Dict[str, Any]) -> bool:
+    """Check whether a patch from diff_scenes() carries no changes."""
+    return not (patch["added"] or patch["changed"] or patch["removed"])
@@ -1,16 +1,23 @@
-import os, asyncio, time, hashlib
+import os, sys, asyncio, hashlib, json, subprocess, threading
+import numpy as np
 from pydantic import BaseModel, Field
 from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, FastAPI
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, FastAPI, Request
+from fastapi.responses import FileResponse, Response
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
-from volum.api.schema import ScenePayload, SceneObjectPayload
-from volum.api.scene import scene, create_scene
+from volum.api.schema import ScenePayload, SceneObjectPayload, VolumeUpdatePayload
+from volum.api.scene import scene, create_scene, adopt_scene
+from volum.api.worker import ScriptWorker, ScriptError
+from volum.api.reload import ReloadScheduler
 from volum.api.utils import get_main_event_loop
 from volum.api.utils import create_scene_from_path
+from volum.api.diff import diff_scenes, is_empty_patch, object_keys
+from volum.api.compression import CompressionCache, negotiate_encoding, compress, MIN_COMPRESS_SIZE
+from volum.core.buffers import native_arrays
+from volum.core.encoding import encode_json, native_arrays_supported
 
 from volum.config.runtime import runtime_config
 from volum.config.constants import TerminalColors
@@ -23,29 +30,164 @@ SCENE_PATH = runtime_config.scene_path
 PYTHON_PATH = runtime_config.python_path
 
 
+compression_cache = CompressionCache()
+
+# inotify reports when a file is closed after writing, elsewhere modified events (possibly mid-write) have to do
+CLOSE_WRITE_EVENTS = sys.platform.startswith("linux")
+
+
+def _scene_file_name() -> str:
+    return str(SCENE_PATH).split("/")[-1].split("\\")[-1] if SCENE_PATH else "Untitled Scene"
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check the If-None-Match header against an ETag (weak comparison)."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in tags]
+
+def _content_etag(content: bytes, *context) -> str:
+    """A weak ETag from the content itself and whatever else is needed to decode it (e.g. headers). Unlike an object's
+    revision(), which restarts when a reload rebuilds the object, it changes exactly when the data does."""
+    hasher = hashlib.blake2b(repr(context).encode(), digest_size=16)
+    hasher.update(content)
+    return f'W/"{hasher.hexdigest()}"'
+
+def _cached_response(request: Request, etag: str, get_content, media_type: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Build a conditional (304) or compressed response for content identified by an ETag.
+
+    Args:
+        request (Request): The incoming request.
+        etag (str): The ETag of the content.
+        get_content (Callable[[], bytes]): Produces the (uncompressed) content, only called if it has to be sent.
+        media_type (str): The media type of the content.
+        headers (Optional[Dict[str, str]], optional): Additional response headers.
+    """
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", **(headers or {})}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    content = get_content()
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding and len(content) >= MIN_COMPRESS_SIZE:
+        content = compression_cache.get((etag, encoding), lambda: compress(content, encoding))
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=content, media_type=media_type, headers=headers)
+
 @router.post("/", summary="Create or replace the entire scene")
 def create_scene(payload: ScenePayload):
     return create_scene(payload)
 
 @router.get("/", summary="Get the current scene as JSON")
-def get_scene():
-    return scene.serialize(file_name=str(SCENE_PATH).split("/")[-1].split("\\")[-1] if SCENE_PATH else "Untitled Scene")
+def get_scene(request: Request, binary: bool = False):
+    content, etag = scene.serialize_json_etag(_scene_file_name(), binary=binary) # one pass (and buffer generation) for both
+    return _cached_response(
+        request, f'W/"{etag}"',
+        lambda: content,
+        media_type="application/json",
+        headers={"Cache-Control": "no-cache"} # always revalidate via If-None-Match
+    )
+
+@router.get("/buffers/{buffer_id}", summary="Get a binary array buffer referenced by the scene")
+def get_buffer(request: Request, buffer_id: str):
+    data = scene.buffers.get(buffer_id)
+    if data is None:
+        raise HTTPException(404, "Buffer not found")
+
+    return _cached_response(
+        request, f'"{buffer_id}"',
+        data.tobytes,
+        media_type="application/octet-stream",
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable", # buffers are content-addressed
+            "X-Volum-Dtype": data.dtype.name,
+            "X-Volum-Shape": ",".join(str(dim) for dim in data.shape)
+        }
+    )
+
+@router.get("/object/{object_id}/lod/{level}", summary="Get a level of detail of an object, e.g. a downsampled Quiver")
+def get_object_lod(request: Request, object_id: str, level: int):
+    obj = scene.objects.get(object_id)
+    if obj is None or not hasattr(obj, "lod_dict"):
+        raise HTTPException(404, "Object not found or without levels of detail")
+
+    try:
+        obj.lod_indices(level)
+    except ValueError as e:
+        raise HTTPException(404, str(e))
+
+    with native_arrays(native_arrays_supported()):
+        content = encode_json(obj.lod_dict(level))
+    return _cached_response(request, _content_etag(content), lambda: content, media_type="application/json", headers={"Cache-Control": "no-cache"})
+
+@router.get("/object/{object_id}/bricks/{level}/{brick}", summary="Get a brick of a pyramid level of an object's field, e.g. of a Contour")
+def get_object_brick(request: Request, object_id: str, level: int, brick: str):
+    obj = scene.objects.get(object_id)
+    if obj is None or not hasattr(obj, "brick"):
+        raise HTTPException(404, "Object not found or without bricks")
+
+    try:
+        index = tuple(int(i) for i in brick.split(","))
+        data = obj.brick(level, index)
+    except ValueError as e:
+        raise HTTPException(404, str(e))
+
+    headers = {
+        "Cache-Control": "no-cache",
+        "X-Volum-Dtype": data.dtype.name,
+        "X-Volum-Shape": ",".join(str(dim) for dim in data.shape)
+    }
+    value_range = obj.brick_range(level, index) if hasattr(obj, "brick_range") else None
+    if value_range is not None: # quantized by the brick's own range
+        headers["X-Volum-Range"] = ",".join(repr(value) for value in value_range)
+
+    content = np.ascontiguousarray(data.transpose(), dtype=data.dtype.newbyteorder("<")).tobytes() # x-fastest, like the scene's fields
+    return _cached_response(
+        request, _content_etag(content, sorted(headers.items())),
+        lambda: content,
+        media_type="application/octet-stream",
+        headers=headers
+    )
+
+@router.post("/object/{object_id}/volume_updated", summary="Notify the viewers that (a region of) a volume's data changed")
+async def volume_updated(object_id: str, update: Optional[VolumeUpdatePayload] = None):
+    obj = scene.objects.get(object_id)
+    if obj is None or not hasattr(obj, "invalidate"):
+        raise HTTPException(404, "Object not found or without volume data")
+
+    update = update or VolumeUpdatePayload()
+    try:
+        bricks = await asyncio.to_thread(obj.invalidate, update.lower, update.upper) # updates the coarser levels
+    except (OSError, ValueError) as e:
+        raise HTTPException(409, str(e))
+
+    await manager.broadcast(json.dumps({"event": "volume_updated", "id": object_id, "bricks": bricks}))
+    return {"status": "ok", "id": object_id, "bricks": bricks}
+
+@router.get("/reload", summary="Get the live reload queue metrics")
+def get_reload_metrics():
+    return reload_scheduler.metrics()
 
 @router.put("/object/{object_id}", summary="Update a single object by ID")
 def update_object(object_id: str, update: SceneObjectPayload):
     obj = scene.objects.get(object_id)
-    if not obj:
+    if obj is None:
         raise HTTPException(404, "Object not found")
 
     updates = update.model_dump(exclude_none=True, exclude={'type'})
-    for k, v in updates.items():
-        setattr(obj, k, v)
+    with scene.lock:
+        for k, v in updates.items():
+            setattr(obj, k, v)
+        scene.refit(object_id)
 
     return {"status": "ok", "id": object_id}
 
 @router.delete("/", summary="Clear the scene")
 def delete_scene():
-    scene.objects.clear()
+    with scene.lock:
+        scene.objects.clear()
     return {"status": "ok"}
 
 
@@ -70,13 +212,16 @@ class ConnectionManager:
 
 # Watchdog File Handler
 class LiveFileHandler(FileSystemEventHandler):
-    def __init__(self, scene_path: str, event_name: str, python_path: Optional[str] = None):
+    def __init__(self, scene_path: str, event_name: str, python_path: Optional[str] = None, worker: Optional[ScriptWorker] = None,
+                 scheduler: Optional[ReloadScheduler] = None):
         self.scene_path = os.path.abspath(scene_path)
         self.event_name = event_name
         self.python_path = os.path.abspath(python_path) if (python_path and os.path.isfile(python_path)) else None
+        self.worker = worker # re-runs python_path in-process, if set
+        self.scheduler = scheduler or ReloadScheduler() # debounces, serializes and cancels the reloads
+        self.cancel_grace = 2.0 # seconds a stale worker run may take before the (warm) worker is killed
         self._last_hashes = {}  # key: file path, value: hash
-        self._debounce_seconds = .5  # tune as needed
-        self._last_modified_times = {}
+        self._script_process: Optional[subprocess.Popen] = None
 
     def _file_hash(self, path: str) -> str:
         try:
@@ -88,43 +233,127 @@ class LiveFileHandler(FileSystemEventHandler):
     def on_modified(self, event: FileSystemEvent):
         if event.is_directory:
             return  # Ignore directory events
-    
-        path = os.path.abspath(event.src_path)
-        now = time.time()
 
-        last_time = self._last_modified_times.get(path, 0)
-        if now - last_time < self._debounce_seconds:
+        if CLOSE_WRITE_EVENTS:
+            return # the file might still be written, wait for on_closed
+        self._on_file_changed(os.path.abspath(event.src_path), retries=10)
+
+    def on_closed(self, event: FileSystemEvent):
+        if not event.is_directory:
+            self._on_file_changed(os.path.abspath(event.src_path))
+
+    def on_moved(self, event: FileSystemEvent):
+        if not event.is_directory: # atomic replace, see Scene.save()
+            self._on_file_changed(os.path.abspath(event.dest_path))
+
+    def _on_file_changed(self, path: str, retries: int = 1):
+        """Schedule reloading the scene or rerunning the script after a file was written.
+
+        Args:
+            path (str): The absolute path of the changed file.
+            retries (int, optional): Passed to create_scene_from_path(), only needed if the file might still be written. Defaults to 1.
+        """
+        if path == self.scene_path:
+            self.scheduler.submit(path, lambda cancelled: self._on_scene_changed(retries))
+        elif self.python_path and path == self.python_path: # the new scene is adopted directly (worker) or written to scene_path (subprocess)
+            if self.worker is not None:
+                self.scheduler.submit(path, self._rerun_in_worker, cancel=lambda: self.worker.cancel(self.cancel_grace))
+            else:
+                self.scheduler.submit(path, self._rerun_in_subprocess, cancel=self._terminate_script)
+        else:
             return
-        self._last_modified_times[path] = now
 
-        current_hash = self._file_hash(str(path))
-        last_hash = self._last_hashes.get(path, "")
-        if current_hash == last_hash:
-            return  # no actual content change
+        if runtime_config.debug and self.scheduler.queue_depth > 1:
+            print(f"{TerminalColors.INFO}Reload queue depth: {self.scheduler.queue_depth}{TerminalColors.ENDC}")
 
+    def _content_changed(self, path: str) -> bool:
+        current_hash = self._file_hash(path)
+        if current_hash == self._last_hashes.get(path, ""):
+            return False
         self._last_hashes[path] = current_hash
+        return True
+
+    def _on_scene_changed(self, retries: int):
+        if not self._content_changed(self.scene_path):
+            return
+
+        if runtime_config.debug:
+            print(f"{TerminalColors.INFO}{self.scene_path.split()[-1]}, modified scene file, reloading ...{TerminalColors.ENDC}")
+        self._reload_scene(lambda: create_scene_from_path(self.scene_path, retries=retries))
 
+    def _reload_scene(self, rebuild):
+        """Rebuild the global scene and broadcast the changes to the viewers.
+
+        Args:
+            rebuild (Callable[[], None]): Replaces the contents of the global scene.
+        """
         loop = get_main_event_loop()
         if not loop:
             raise RuntimeError("Main event loop is not set.")
-        
-        if path == self.scene_path:
-            if runtime_config.debug:
-                print(f"{TerminalColors.INFO}{self.scene_path.split()[-1]}, modified scene file, reloading ...{TerminalColors.ENDC}")
-            
-            create_scene_from_path(self.scene_path)
-            asyncio.run_coroutine_threadsafe(manager.broadcast(self.event_name), loop)
 
-        if self.python_path and path == self.python_path: # usually happens first, this will change the file under scene_path and trigger the broadcast (see above)
+        # compared by fragment digests, the scene is only serialized with buffers (once) if the patch carries objects
+        previous = scene.serialize_digests(_scene_file_name())
+        rebuild()
+        with scene.lock:
+            current = scene.serialize_digests(_scene_file_name())
+            patch = diff_scenes(previous, current)
+            if previous["plugins"] == current["plugins"] and (patch["added"] or patch["changed"]):
+                serialized = scene.serialize(_scene_file_name(), binary=True)
+                objects = dict(zip(object_keys(serialized["objects"]), serialized["objects"]))
+                patch["added"] = {key: objects[key] for key in patch["added"]}
+                patch["changed"] = {key: objects[key] for key in patch["changed"]}
+
+        if previous["plugins"] != current["plugins"]:
+            message = self.event_name # plugin changes require a full reload
+        else:
+            if is_empty_patch(patch):
+                return
+            message = encode_json(patch).decode("utf-8")
+
             if runtime_config.debug:
-                print(f"{TerminalColors.INFO}{self.python_path.split()[-1]}, modified python file, reloading ...{TerminalColors.ENDC}")
+                print(f"{TerminalColors.INFO}Scene patch: {len(patch['added'])} added, {len(patch['changed'])} changed, {len(patch['removed'])} removed{TerminalColors.ENDC}")
+
+        asyncio.run_coroutine_threadsafe(manager.broadcast(message), loop)
+
+    def _rerun_in_worker(self, cancelled: threading.Event):
+        """Re-execute the python script in the warm worker and adopt the scene it saves, unless a newer run is pending."""
+        if not self._content_changed(self.python_path):
+            return
+        if runtime_config.debug:
+            print(f"{TerminalColors.INFO}{self.python_path.split()[-1]}, modified python file, reloading ...{TerminalColors.ENDC}")
+
+        try:
+            new_scene, _ = self.worker.run(self.python_path)
+        except ScriptError as e:
+            if not cancelled.is_set():
+                print(f"{TerminalColors.ERROR}Failed to run {self.python_path}:{TerminalColors.ENDC}\n{e}")
+            new_scene = None
+
+        if cancelled.is_set():
+            self._last_hashes.pop(self.python_path, None) # make sure the newer run isn't skipped as unchanged
+            return
+        if new_scene is not None: # otherwise the run failed or the worker had to write the scene to disk (on_moved takes over)
+            self._reload_scene(lambda: adopt_scene(new_scene))
+
+    def _rerun_in_subprocess(self, cancelled: threading.Event):
+        """Re-execute the python script in a fresh interpreter, which writes the scene to scene_path."""
+        if not self._content_changed(self.python_path):
+            return
+        if runtime_config.debug:
+            print(f"{TerminalColors.INFO}{self.python_path.split()[-1]}, modified python file, reloading ...{TerminalColors.ENDC}")
 
-            async def restart_script():
-                if self.python_path:
-                    proc = await asyncio.create_subprocess_exec("python3", self.python_path)
-                    await proc.communicate()
+        self._script_process = subprocess.Popen(["python3", self.python_path])
+        if cancelled.is_set(): # cancelled before the process existed
+            self._script_process.terminate()
+        self._script_process.wait()
+        self._script_process = None
+        if cancelled.is_set():
+            self._last_hashes.pop(self.python_path, None) # make sure the newer run isn't skipped as unchanged
 
-            asyncio.run_coroutine_threadsafe(restart_script(), loop)
+    def _terminate_script(self):
+        process = self._script_process
+        if process is not None:
+            process.terminate()
 
 
 @router.websocket("/ws")
@@ -137,19 +366,21 @@ async def websocket_endpoint(ws: WebSocket):
     except WebSocketDisconnect:
         manager.disconnect(ws)
 
-# Initialize the connection manager and observer
+# Initialize the connection manager, observer, reload scheduler and script worker
 manager = ConnectionManager()
 observer = Observer()
+reload_scheduler = ReloadScheduler()
+script_worker = ScriptWorker() if (PYTHON_PATH is not None and runtime_config.reload_mode == "worker") else None
 
 # Start observing the scene file if provided
 if SCENE_PATH and PYTHON_PATH is None:
     observer.schedule(
-        LiveFileHandler(str(SCENE_PATH),  "scene_updated"),
+        LiveFileHandler(str(SCENE_PATH),  "scene_updated", scheduler=reload_scheduler),
         os.path.dirname(SCENE_PATH), recursive=False
     )
     
 if SCENE_PATH and PYTHON_PATH is not None:
     observer.schedule(
-        LiveFileHandler(str(SCENE_PATH), "scene_updated", python_path=str(PYTHON_PATH)),
+        LiveFileHandler(str(SCENE_PATH), "scene_updated", python_path=str(PYTHON_PATH), worker=script_worker, scheduler=reload_scheduler),
         os.path.dirname(SCENE_PATH), recursive=False
     )
@@ -0,0 +1,126 @@
+import time, threading, traceback
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from volum.config.constants import TerminalColors
+
+
+class ReloadScheduler:
+    """Runs live reload jobs one at a time, coalescing bursts of file events.
+
+    Jobs are keyed (e.g. by the changed file's path). A job only starts once no new job was submitted for the debounce
+    time (trailing edge), a newer submission with the same key replaces the pending job and cancels the running one,
+    so at most one rebuild is in flight and stale rebuilds never get published.
+    """
+    def __init__(self, debounce: float = 0.2):
+        """Initialize the ReloadScheduler and start its worker thread.
+
+        Args:
+            debounce (float, optional): The quiet time in seconds before pending jobs are run. Defaults to 0.2.
+        """
+        self.debounce = debounce
+        self._pending: "OrderedDict[str, tuple]" = OrderedDict() # key -> (run, cancel)
+        self._condition = threading.Condition()
+        self._due = 0.0 # monotonic time at which the pending jobs may run
+        self._running: Optional[str] = None
+        self._running_cancel: Optional[Callable[[], None]] = None
+        self._cancelled = threading.Event()
+        self._closed = False
+
+        self.completed = 0
+        self.cancelled = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.last_duration: Optional[float] = None
+
+        self._thread = threading.Thread(target=self._work, name="volum-reload", daemon=True)
+        self._thread.start()
+
+    def submit(self, key: str, run: Callable[[threading.Event], Any], cancel: Optional[Callable[[], None]] = None):
+        """Schedule a reload job.
+
+        Args:
+            key (str): Identifies the job. Pending jobs with the same key are replaced, a running one is cancelled.
+            run (Callable[[threading.Event], Any]): The job, it gets an event that is set once the job is stale and
+                must not publish its result anymore.
+            cancel (Optional[Callable[[], None]], optional): Called (from the submitting thread) to abort the job early
+                while it is running, e.g. by terminating a process. Defaults to None.
+        """
+        with self._condition:
+            if key in self._pending:
+                self.coalesced += 1
+                del self._pending[key]
+            self._pending[key] = (run, cancel)
+
+            if self._running == key and not self._cancelled.is_set():
+                self._cancelled.set()
+                if self._running_cancel is not None:
+                    self._running_cancel()
+
+            self._due = time.monotonic() + self.debounce
+            self._condition.notify()
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of pending plus running jobs."""
+        with self._condition:
+            return len(self._pending) + (self._running is not None)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get the scheduler's metrics, e.g. for monitoring."""
+        with self._condition:
+            return {
+                "queue_depth": len(self._pending) + (self._running is not None),
+                "pending": list(self._pending),
+                "running": self._running,
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "coalesced": self.coalesced,
+                "failed": self.failed,
+                "last_duration": self.last_duration
+            }
+
+    def close(self):
+        """Stop the worker thread, dropping pending jobs and cancelling the running one."""
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._cancelled.set()
+            if self._running_cancel is not None:
+                self._running_cancel()
+            self._condition.notify()
+        self._thread.join(timeout=1)
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    wait = self._due - time.monotonic()
+                    if self._pending and wait <= 0:
+                        break
+                    self._condition.wait(timeout=wait if self._pending else None)
+                if self._closed:
+                    return
+
+                key, (run, cancel) = self._pending.popitem(last=False)
+                self._running, self._running_cancel = key, cancel
+                self._cancelled = threading.Event()
+                cancelled = self._cancelled
+
+            start = time.monotonic()
+            try:
+                run(cancelled)
+                failed = False
+            except Exception:
+                failed = True
+                print(f"{TerminalColors.ERROR}Reload of {key} failed:{TerminalColors.ENDC}\n{traceback.format_exc()}")
+
+            with self._condition:
+                self._running, self._running_cancel = None, None
+                self.last_duration = time.monotonic() - start
+                if cancelled.is_set():
+                    self.cancelled += 1
+                elif failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
@@ -1,5 +1,7 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
 from volum.core.scene import Scene
-from volum.api.schema import ScenePayload
+from volum.api.schema import ScenePayload, SceneObjectPayload
 from volum.core.builder import build_object_from_dict
 # load your plugins
 from volum.plugins import PLUGIN_MAP
@@ -10,32 +12,98 @@ from volum.config.constants import TerminalColors
 
 scene = Scene() # initialize global Scene and registry
 
-def create_scene(payload: ScenePayload):
-    """Create a new scene from the provided payload.
+def load_scene_plugins(plugin_names: List[str]) -> list:
+    """Load the plugins with the given names into the global scene. Unknown names are ignored.
 
     Args:
-        payload (ScenePayload): The payload containing scene data.
+        plugin_names (List[str]): The plugin names, see PLUGIN_MAP.
 
     Returns:
-        dict: A dictionary containing the status and object count.
+        list: The loaded plugin instances.
     """
-    
     plugins = []
-    for plugin_name in payload.plugins:
+    for plugin_name in plugin_names:
         plugin_cls = PLUGIN_MAP.get(plugin_name, None)
         if plugin_cls is not None:
             plugins.append(plugin_cls())
-    
+
     scene.load_plugins(plugins)
+    return plugins
+
+def build_payload_object(obj_def: Union[SceneObjectPayload, Dict[str, Any]]) -> Tuple[Any, Optional[str]]:
+    """Validate a single object definition and build it, without adding it to the global scene.
+
+    Args:
+        obj_def (Union[SceneObjectPayload, Dict[str, Any]]): The object definition, as in Scene.serialize()["objects"].
+
+    Returns:
+        Tuple[Any, Optional[str]]: The built scene object and its ID, if the definition has one.
+    """
+    if not isinstance(obj_def, SceneObjectPayload):
+        obj_def = SceneObjectPayload.model_validate(obj_def)
+
+    obj_dict = obj_def.model_dump(exclude_none=True)
+    obj_id = obj_dict.pop("id", None) # keep IDs of saved scenes, so they stay stable across reloads
+    # Use builder to instantiate Python object
+    return build_object_from_dict(obj_dict, scene.registry), obj_id
+
+def add_payload_object(obj_def: Union[SceneObjectPayload, Dict[str, Any]]):
+    """Validate a single object definition, build it and add it to the global scene.
+
+    Args:
+        obj_def (Union[SceneObjectPayload, Dict[str, Any]]): The object definition, as in Scene.serialize()["objects"].
+
+    Returns:
+        The built scene object.
+    """
+    obj, obj_id = build_payload_object(obj_def)
+    scene.add_object(obj, id=obj_id)
+
+    if runtime_config.debug:
+        print(f"{TerminalColors.SUCCESS}Added object{TerminalColors.ENDC} of type {TerminalColors.BOLD}{obj.__class__.__name__}{TerminalColors.ENDC}")
+    return obj
+
+def replace_scene_objects(objects: List[Tuple[Any, Optional[str]]]):
+    """Replace the objects of the global scene at once, e.g. with those built by build_payload_object().
+
+    Args:
+        objects (List[Tuple[Any, Optional[str]]]): The objects and their IDs (or None).
+    """
+    with scene.lock: # serializations see the previous or the new scene, never a mix
+        scene.clear()
+        for obj, obj_id in objects:
+            scene.add_object(obj, id=obj_id)
+
+def adopt_scene(other: Scene):
+    """Replace the contents of the global scene with those of another scene, e.g. one built by a ScriptWorker.
+
+    Args:
+        other (Scene): The scene to take the plugins, materials and objects (keeping their IDs) from.
+    """
+    with scene.lock: # serializations see the previous or the new scene, never a mix
+        scene.load_plugins(other.plugins)
+
+        scene.clear()
+        for name, material in other.materials.materials.items():
+            scene.materials.register_material(name, material)
+        for obj_id, obj in other.objects.items():
+            scene.add_object(obj, id=obj_id)
+
+def create_scene(payload: ScenePayload):
+    """Create a new scene from the provided payload.
+
+    Args:
+        payload (ScenePayload): The payload containing scene data.
+
+    Returns:
+        dict: A dictionary containing the status and object count.
+    """
 
-    scene.clear()
-    for obj_def in payload.objects:
-        obj_dict = obj_def.model_dump(exclude_none=True)
-        # Use builder to instantiate Python object
-        obj = build_object_from_dict(obj_dict, scene.registry)
-        scene.add_object(obj)
+    with scene.lock:
+        plugins = load_scene_plugins(payload.plugins)
 
-        if runtime_config.debug:
-            print(f"{TerminalColors.SUCCESS}Added object{TerminalColors.ENDC} of type {TerminalColors.BOLD}{obj.__class__.__name__}{TerminalColors.ENDC}")
+        scene.clear()
+        for obj_def in payload.objects:
+            add_payload_object(obj_def)
 
-    return {"status": "ok", "object_count": len(scene.objects), "plugins": plugins}
\ No newline at end of file
+    return {"status": "ok", "object_count": len(scene.objects), "plugins": plugins}
@@ -18,4 +18,8 @@ class SceneObjectPayload(BaseModel):
 
 class ScenePayload(BaseModel):
     plugins: List[str] = Field(default_factory=list, description="List of plugin names to load")
-    objects: List[SceneObjectPayload]
\ No newline at end of file
+    objects: List[SceneObjectPayload]
+
+class VolumeUpdatePayload(BaseModel):
+    lower: Optional[List[int]] = Field(None, description="First changed sample (x, y, z), defaults to the origin")
+    upper: Optional[List[int]] = Field(None, description="End (exclusive) of the changed samples, defaults to the volume's shape")
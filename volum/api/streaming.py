@@ -0,0 +1,142 @@
+import re
+import json
+from typing import Any, IO, Iterator, Tuple
+
+
+CHUNK_SIZE = 1 << 20 # characters read from the file at a time
+
+_WHITESPACE = " \t\n\r"
+_NUMBER = re.compile(r"[-+0-9.eE]*")
+
+
+class JSONStream:
+    """An incremental reader for the top level of a JSON document.
+
+    Values are decoded one at a time with json.JSONDecoder.raw_decode(), so only the value that is currently being
+    decoded (plus one chunk) is held in memory instead of the whole document.
+    """
+    def __init__(self, file: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self._value_size = 0
+
+    def _fill(self, size: int) -> bool:
+        """Read more data into the buffer, dropping the consumed part. Returns False at the end of the file."""
+        if self.eof:
+            return False
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character without consuming it, or an empty string at the end of the file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill(self.chunk_size):
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: str):
+        """Consume the next non-whitespace character, which must be char."""
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def read_value(self) -> Any:
+        """Decode the next JSON value."""
+        self.peek()
+        while True:
+            # read ahead by the largest value size seen so far, so similar values decode at the first attempt
+            if len(self.buffer) - self.pos < self._value_size:
+                self._fill(self._value_size)
+            # a number at the end of the buffer might continue in the next chunk
+            if self.eof or _NUMBER.match(self.buffer, self.pos).end() < len(self.buffer):
+                try:
+                    value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                    self._value_size = max(self._value_size, end - self.pos)
+                    self.pos = end
+                    return value
+                except json.JSONDecodeError:
+                    if self.eof:
+                        raise
+            # the value is incomplete, read more (growing geometrically to keep large values linear)
+            self._value_size = max(self._value_size, len(self.buffer) - self.pos) * 2
+
+    def iter_array(self) -> Iterator[Any]:
+        """Decode the elements of the JSON array at the current position, one at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect("]")
+                return
+
+
+def iter_scene_file(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Incrementally read a scene JSON file, as written by Scene.save().
+
+    Yields the top-level (key, value) pairs in file order. The value of the "objects" key is an iterator over the objects,
+    which is decoded lazily. Objects that are left unread are skipped when iterating further. A top-level array is treated as the objects array.
+
+    Args:
+        path (str): The path of the scene file.
+        chunk_size (int, optional): The number of characters read at a time. Defaults to CHUNK_SIZE.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON (e.g. because it is still being written).
+        ValueError: If the top-level value is neither an object nor an array.
+
+    Yields:
+        Tuple[str, Any]: The top-level keys and their values.
+    """
+    with open(path, "r") as f:
+        stream = JSONStream(f, chunk_size)
+        start = stream.peek()
+        if start == "[":
+            objects = stream.iter_array()
+            yield "objects", objects
+            for _ in objects: # skip whatever the consumer left unread
+                pass
+        elif start == "{":
+            stream.expect("{")
+            if stream.peek() == "}":
+                stream.pos += 1
+            else:
+                while True:
+                    key = stream.read_value()
+                    if not isinstance(key, str):
+                        raise json.JSONDecodeError("Expecting property name", stream.buffer, stream.pos)
+                    stream.expect(":")
+                    if key == "objects" and stream.peek() == "[":
+                        objects = stream.iter_array()
+                        yield key, objects
+                        for _ in objects:
+                            pass
+                    else:
+                        yield key, stream.read_value()
+                    if stream.peek() == ",":
+                        stream.pos += 1
+                    else:
+                        stream.expect("}")
+                        break
+        elif start == "":
+            raise json.JSONDecodeError("File is empty", "", 0)
+        else:
+            raise ValueError("Invalid scene data format")
+
+        if stream.peek() != "":
+            raise json.JSONDecodeError("Extra data", stream.buffer, stream.pos)
@@ -1,7 +1,8 @@
 import os, json, time
 
-from volum.api.schema import ScenePayload, SceneObjectPayload
-from volum.api.scene import scene, create_scene
+from volum.api.schema import ScenePayload
+from volum.api.scene import load_scene_plugins, build_payload_object, replace_scene_objects
+from volum.api.streaming import iter_scene_file
 from volum.config.runtime import runtime_config
 
 
@@ -14,31 +15,56 @@ def set_main_event_loop(loop):
 def get_main_event_loop():
     return _main_loop
 
-def _safe_json_load(path, retries=10, delay=0.5):
+def create_scene_from_path(path: str, retries: int=1, delay: float=0.5):
+    """(Re)create the global scene from a scene JSON file.
+
+    The file is read incrementally (see iter_scene_file), objects are validated and built one at a time, so the whole
+    document never has to be held in memory. The scene is only replaced once the whole file was read, files that
+    fail to parse leave it as it was.
+
+    Args:
+        path (str): The path of the scene file.
+        retries (int, optional): How often to try parsing the file. Only needed for files that might still be written
+            in place, Scene.save() replaces the file atomically. Defaults to 1.
+        delay (float, optional): The delay between attempts in seconds. Defaults to 0.5.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        RuntimeError: If the file couldn't be parsed.
+    """
+    if not (path and os.path.isfile(path)):
+        raise FileNotFoundError(f"No such file: {runtime_config.scene_path}")
+
     for i in range(retries):
         try:
-            if os.path.getsize(path) == 0:
-                raise ValueError("File is empty")
-
-            with open(path, "r") as f:
-                return json.load(f)
-
-        except (json.JSONDecodeError, ValueError):
-            time.sleep(delay)
-    raise RuntimeError(f"Failed to load JSON from {path} after {retries} retries. Maybe file is still being written because of the size?")
-
-def create_scene_from_path(path: str):
-    if path and os.path.isfile(path):
-        data = _safe_json_load(path)
-        scene.clear()
-        # Create a ScenePayload from the loaded data
-        if isinstance(data, list):
-            payload = ScenePayload(objects=data)
-        elif isinstance(data, dict):
-            payload = ScenePayload(**data)
-        else:
-            raise ValueError("Invalid scene data format")
-        # Create the scene with the loaded data
-        create_scene(payload)
-    else:
-        raise FileNotFoundError(f"No such file: {runtime_config.scene_path}")
\ No newline at end of file
+            _load_scene_file(path)
+            return
+        except json.JSONDecodeError as e:
+            error = e
+            if i < retries - 1:
+                time.sleep(delay)
+    raise RuntimeError(f"Failed to load JSON from {path} after {retries} attempt(s): {error}")
+
+def _load_scene_file(path: str):
+    plugins_loaded, objects_loaded = False, False
+    for key, value in iter_scene_file(path):
+        if key == "plugins" and not plugins_loaded:
+            load_scene_plugins(ScenePayload(plugins=value, objects=[]).plugins)
+            plugins_loaded = True
+        elif key == "objects":
+            if not plugins_loaded:
+                # Scene.save() writes the plugins first, otherwise look them up beforehand, they are needed to build the objects
+                load_scene_plugins(_read_scene_plugins(path))
+                plugins_loaded = True
+            objects = [build_payload_object(obj_def) for obj_def in value]
+            objects_loaded = True
+
+    if not objects_loaded:
+        raise ValueError("Invalid scene data format")
+    replace_scene_objects(objects)
+
+def _read_scene_plugins(path: str) -> list:
+    for key, value in iter_scene_file(path):
+        if key == "plugins":
+            return ScenePayload(plugins=value, objects=[]).plugins
+    return []
@@ -0,0 +1,199 @@
+import os, sys, time, runpy, threading, traceback
+import multiprocessing as mp
+from typing import Optional, Set, Tuple
+
+from volum.core.scene import Scene
+from volum.config.constants import TerminalColors
+
+
+# Modules imported once by the worker, so re-running a script doesn't pay for them again
+PRELOAD_MODULES = ["numpy", "matplotlib.pyplot", "pydantic", "volum", "volum.objects", "volum.plugins"]
+
+
+class ScriptError(RuntimeError):
+    """Raised if a scene script fails or doesn't produce a scene."""
+    pass
+
+class ScriptCancelled(ScriptError):
+    """Raised if a script run was aborted with ScriptWorker.cancel()."""
+    pass
+
+
+class ScriptWorker:
+    """A warm worker process that re-executes a scene script and hands the resulting Scene back over a pipe.
+
+    The worker imports the heavy dependencies once, runs the script with runpy and captures the scene passed to
+    Scene.save() instead of writing it to disk. This skips both the interpreter start-up and the JSON round-trip.
+    """
+    def __init__(self, timeout: Optional[float] = None):
+        """Initialize the ScriptWorker. The process is spawned lazily, see start().
+
+        Args:
+            timeout (Optional[float], optional): The time in seconds a script may run before the worker is restarted. Defaults to None (no limit).
+        """
+        self.timeout = timeout
+        self._context = mp.get_context("spawn") # don't inherit the server's threads and event loop
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._run_id = 0
+        self._run_started: Optional[float] = None
+        self._cancel_requested = False
+
+    def start(self):
+        """Spawn the worker process, if it isn't running already. The preloading happens in the background."""
+        if self._process is not None and self._process.is_alive():
+            return
+        self._conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(target=_worker_main, args=(child_conn,), name="volum-script-worker", daemon=True)
+        self._process.start()
+        child_conn.close()
+
+    def stop(self):
+        """Shut down the worker process."""
+        with self._lock:
+            if self._process is None:
+                return
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.kill()
+            self._conn.close()
+            self._process, self._conn = None, None
+
+    def run(self, script_path: str) -> Tuple[Optional[Scene], str]:
+        """Run a scene script in the worker.
+
+        Args:
+            script_path (str): The path of the Python script. It must call scene.save(path).
+
+        Raises:
+            ScriptError: If the script raised, didn't save a scene, timed out or the worker died.
+
+        Returns:
+            Tuple[Optional[Scene], str]: The saved scene and the path it was saved to. The scene is None if it couldn't be
+                transferred (e.g. it isn't picklable), in that case it was written to the path instead.
+        """
+        with self._lock:
+            self.start()
+            self._run_id += 1
+            self._run_started = time.monotonic()
+            self._cancel_requested = False
+            try:
+                self._conn.send(os.path.abspath(script_path))
+                if not self._conn.poll(self.timeout):
+                    raise ScriptError(f"Script {script_path} didn't finish within {self.timeout} seconds")
+                status, *result = self._conn.recv()
+            except (EOFError, BrokenPipeError, OSError, ScriptError) as e:
+                self._process.kill() # the worker is dead or stuck, spawn a fresh one for the next run
+                self._process.join()
+                self._process = None
+                self.start()
+                if self._cancel_requested:
+                    raise ScriptCancelled(f"Run of {script_path} was cancelled") from e
+                if isinstance(e, ScriptError):
+                    raise
+                raise ScriptError(f"Script worker exited while running {script_path}") from e
+            finally:
+                self._run_started = None
+
+        if status == "error":
+            raise ScriptError(result[0])
+        return result[0], result[1]
+
+    def cancel(self, grace: float = 0.0):
+        """Abort the current run (if any) by killing the worker process, run() then raises ScriptCancelled.
+
+        Killing the worker loses its warm imports, so the run is first given up to grace seconds (counted from its
+        start) to finish on its own. Can be called from any thread.
+
+        Args:
+            grace (float, optional): The minimum run time in seconds before the worker is killed. Defaults to 0.0.
+        """
+        run_id, started = self._run_id, self._run_started
+        if started is None:
+            return
+        delay = started + grace - time.monotonic()
+        if delay > 0:
+            timer = threading.Timer(delay, self._kill_run, args=(run_id,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._kill_run(run_id)
+
+    def _kill_run(self, run_id: int):
+        process = self._process
+        if self._run_id == run_id and self._run_started is not None and process is not None:
+            self._cancel_requested = True
+            process.kill()
+
+
+def _worker_main(conn):
+    import importlib
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+    except ImportError:
+        pass
+
+    preloaded = set(sys.modules)
+    while True:
+        try:
+            script_path = conn.recv()
+        except EOFError:
+            break
+        if script_path is None:
+            break
+        result = _run_script(script_path, preloaded)
+        try:
+            conn.send(result[:3])
+        except Exception as e: # the scene isn't picklable, fall back to the file round-trip
+            status, scene, path, (args, kwargs) = result
+            print(f"{TerminalColors.WARNING}Could not transfer the scene of {script_path}, saving it instead:{TerminalColors.ENDC} {e!r}")
+            scene.save(path, *args, **kwargs)
+            conn.send((status, None, path))
+
+def _run_script(script_path: str, preloaded: Set[str]) -> tuple:
+    saved = {}
+    original_save = Scene.save
+
+    def capture_save(self, path: str=os.path.join(os.getcwd(), "scene.json"), *args, **kwargs):
+        saved["scene"], saved["path"], saved["args"] = self, os.path.abspath(path), (args, kwargs)
+
+    script_dir = os.path.dirname(script_path)
+    Scene.save = capture_save # hand the scene back instead of writing it
+    sys.path.insert(0, script_dir) # like `python3 script.py`
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except BaseException:
+        return ("error", traceback.format_exc())
+    finally:
+        Scene.save = original_save
+        sys.path.remove(script_dir)
+        _unload_modules(script_dir, preloaded)
+        _close_figures()
+
+    if "scene" not in saved:
+        return ("error", "Could not determine scene. Script must call scene.save(path)")
+    return ("ok", saved["scene"], saved["path"], saved["args"])
+
+def _unload_modules(script_dir: str, preloaded: Set[str]):
+    """Forget modules imported from the script's directory, so changes to them are picked up on the next run."""
+    script_dir = os.path.abspath(script_dir) + os.sep
+    for name in set(sys.modules) - preloaded:
+        module_file = getattr(sys.modules[name], "__file__", None)
+        if module_file and os.path.abspath(module_file).startswith(script_dir):
+            del sys.modules[name]
+
+def _close_figures():
+    plt = sys.modules.get("matplotlib.pyplot")
+    if plt is not None:
+        plt.close("all")
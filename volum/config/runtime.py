@@ -6,6 +6,9 @@ class RuntimeConfig:
         self.scene_path: Optional[Path] = None
         self.python_path: Optional[Path] = None
         self.debug: bool = False
+        self.reload_mode: str = "worker" # how scripts under python_path are re-run, 'worker' or 'subprocess'
+        self.render_workers: int = 0 # processes rendering PlotImages in the background, 0 renders them on serialization
+        self.plot_cache_dir: Optional[Path] = None # where rendered PlotImages are kept across restarts, if anywhere
 
 # Shared runtime config instance
 runtime_config = RuntimeConfig()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import numpy as np
+from typing import List, Tuple
+from volum.core.geometry import chunks
+
+
+# Edge length of the bricks (tiles) large fields are served in
+BRICK_SIZE = 64
+POOLING_METHODS = ["mean", "max"]
+
+
+def downsample(field: np.ndarray, method: str = "mean") -> np.ndarray:
+    """Halve a 2D or 3D field along each axis by pooling 2x2(x2) blocks, odd sizes repeat their last sample.
+
+    Works through the field in slabs, so memory-mapped fields are never loaded at once.
+
+    Args:
+        field (np.ndarray): The field.
+        method (str, optional): "mean" (as float32) or "max" pooling. Defaults to "mean".
+
+    Returns:
+        np.ndarray: The downsampled field, of shape ceil(shape / 2).
+    """
+    if method not in POOLING_METHODS:
+        raise ValueError(f"method must be one of {POOLING_METHODS}")
+    shape = np.asarray(field.shape)
+    out_shape = (shape + 1) // 2
+    out = np.empty(tuple(out_shape), dtype=np.float32 if method == "mean" else field.dtype)
+
+    for rows in chunks(int(out_shape[0]), int(np.prod(out_shape[1:])) * 2 ** field.ndim):
+        slab = np.asarray(field[2 * rows.start:min(2 * rows.stop, shape[0])])
+        pad = [(0, 2 * (rows.stop - rows.start) - len(slab))] + [(0, int(n % 2)) for n in shape[1:]]
+        if any(after for _, after in pad):
+            slab = np.pad(slab, pad, mode="edge")
+        blocks = slab.reshape([n for size in slab.shape for n in (size // 2, 2)])
+        axes = tuple(range(1, 2 * field.ndim, 2))
+        out[rows] = blocks.mean(axis=axes, dtype=np.float32) if method == "mean" else blocks.max(axis=axes)
+    return out
+
+def pyramid_shapes(shape: Tuple[int, ...], brick_size: int = BRICK_SIZE) -> List[Tuple[int, ...]]:
+    """Get the shapes of a field's pyramid levels, halving until the field fits into a single brick.
+
+    Args:
+        shape (Tuple[int, ...]): The shape of the full field (level 0).
+        brick_size (int, optional): The brick edge length. Defaults to BRICK_SIZE.
+
+    Returns:
+        List[Tuple[int, ...]]: The shape per level.
+    """
+    shapes = [tuple(int(n) for n in shape)]
+    while max(shapes[-1]) > brick_size:
+        shapes.append(tuple((n + 1) // 2 for n in shapes[-1]))
+    return shapes
+
+def brick_counts(shape: Tuple[int, ...], brick_size: int = BRICK_SIZE) -> Tuple[int, ...]:
+    """Get the number of bricks along each axis of a field."""
+    return tuple(max(1, -(-int(n) // brick_size)) for n in shape)
+
+def brick_box(shape: Tuple[int, ...], index: Tuple[int, ...], brick_size: int = BRICK_SIZE) -> Tuple[slice, ...]:
+    """Get the samples of a brick. Bricks overlap by one sample, so surfaces extracted per brick join seamlessly.
+
+    Args:
+        shape (Tuple[int, ...]): The shape of the field.
+        index (Tuple[int, ...]): The brick index along each axis.
+        brick_size (int, optional): The brick edge length. Defaults to BRICK_SIZE.
+
+    Raises:
+        ValueError: If the brick is out of range.
+
+    Returns:
+        Tuple[slice, ...]: The sample range along each axis.
+    """
+    counts = brick_counts(shape, brick_size)
+    if len(index) != len(shape) or any(not 0 <= i < count for i, count in zip(index, counts)):
+        raise ValueError(f"No brick {tuple(index)}, the field has {counts} bricks")
+    return tuple(slice(i * brick_size, min((i + 1) * brick_size + 1, int(n))) for i, n in zip(index, shape))
@@ -0,0 +1,183 @@
+import hashlib, threading
+import numpy as np
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Union, List
+
+
+_active_store: ContextVar[Optional["BufferStore"]] = ContextVar("volum_buffer_store", default=None)
+_active_generation: ContextVar[Optional["_Generation"]] = ContextVar("volum_buffer_generation", default=None)
+_native_arrays: ContextVar[bool] = ContextVar("volum_native_arrays", default=False)
+
+
+class _Generation:
+    """The buffers of one serialization pass, and those of them no client fetched yet."""
+    def __init__(self):
+        self.buffers: Dict[str, np.ndarray] = {}
+        self.unfetched: set = set()
+        self.collecting = False
+
+
+class BufferStore:
+    """Holds typed array payloads that are referenced from a binary scene serialization.
+
+    Buffers are content-addressed, i.e. the same array data always maps to the same buffer id,
+    so clients can reuse them across reloads. Each serialization pass (see collect()) fills its own generation of
+    buffers, so concurrent passes don't evict each other's. The last keep_generations generations are kept, older
+    ones until all their buffers were fetched (see get()), but at most max_generations in total.
+    """
+    def __init__(self, keep_generations: int = 2, max_generations: int = 16):
+        self.keep_generations = keep_generations
+        self.max_generations = max_generations
+        self._generations: List[_Generation] = [_Generation()] # oldest first
+        self._lock = threading.Lock()
+
+    @property
+    def buffers(self) -> Dict[str, np.ndarray]:
+        """The buffers of the current serialization pass (or of the latest one, outside of collect())."""
+        generation = _active_generation.get()
+        if generation is None:
+            with self._lock:
+                generation = self._generations[-1]
+        return generation.buffers
+
+    def add(self, array: Union[np.ndarray, List], dtype=np.float32) -> dict:
+        """Register an array and return the reference that replaces it in the serialized scene.
+
+        Args:
+            array (Union[np.ndarray, List]): The array data to register.
+            dtype (optional): The wire dtype, always stored little-endian. Defaults to np.float32.
+
+        Returns:
+            dict: The buffer reference, holding the buffer id, dtype and shape.
+        """
+        data = np.ascontiguousarray(array, dtype=np.dtype(dtype).newbyteorder("<"))
+        buffer_id = hashlib.blake2b(data.data, digest_size=16).hexdigest()
+        self._put(buffer_id, data)
+        return {
+            "buffer": buffer_id,
+            "dtype": data.dtype.name,
+            "shape": list(data.shape)
+        }
+
+    def get(self, buffer_id: str) -> Optional[np.ndarray]:
+        """Get a registered array by its buffer id, marking it as fetched."""
+        with self._lock:
+            data = None
+            for generation in self._generations:
+                if buffer_id in generation.buffers:
+                    data = generation.buffers[buffer_id]
+                    generation.unfetched.discard(buffer_id)
+            self._prune()
+        return data
+
+    def __contains__(self, buffer_id: str):
+        with self._lock:
+            return any(buffer_id in generation.buffers for generation in self._generations)
+
+    @contextmanager
+    def collect(self):
+        """Route all pack_array() calls within this context into a new generation of the store."""
+        generation = _Generation()
+        generation.collecting = True
+        with self._lock:
+            self._generations.append(generation)
+        store_token = _active_store.set(self)
+        generation_token = _active_generation.set(generation)
+        try:
+            yield self
+        finally:
+            _active_generation.reset(generation_token)
+            _active_store.reset(store_token)
+            with self._lock:
+                generation.collecting = False
+                self._prune()
+
+    def retain(self, value):
+        """Keep the buffers referenced within a (cached) serialized value in the current collection pass."""
+        if isinstance(value, dict):
+            buffer_id = value.get("buffer")
+            if isinstance(buffer_id, str) and buffer_id not in self.buffers:
+                with self._lock:
+                    data = next((generation.buffers[buffer_id] for generation in reversed(self._generations) if buffer_id in generation.buffers), None)
+                if data is not None:
+                    self._put(buffer_id, data)
+            for item in value.values():
+                self.retain(item)
+        elif isinstance(value, (list, tuple)) and value and not isinstance(value[0], (int, float)):
+            for item in value:
+                self.retain(item)
+
+    def clear(self):
+        """Remove all registered buffers."""
+        with self._lock:
+            self._generations = [_Generation()]
+
+    def __getstate__(self):
+        # buffers are served to the clients of this process only, the lock can't be pickled
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_generations"] = [_Generation()]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _put(self, buffer_id: str, data: np.ndarray):
+        generation = _active_generation.get()
+        with self._lock:
+            generation = generation or self._generations[-1]
+            generation.buffers[buffer_id] = data
+            generation.unfetched.add(buffer_id)
+
+    def _prune(self):
+        """Drop fully fetched generations beyond the kept ones, and the oldest beyond max_generations. Generations of
+        passes still in progress are always kept."""
+        count = len(self._generations)
+        kept = [generation for i, generation in enumerate(self._generations)
+                if generation.collecting or generation.unfetched or i >= count - self.keep_generations]
+        excess = len(kept) - self.max_generations
+        for generation in list(kept): # oldest first
+            if excess <= 0:
+                break
+            if not generation.collecting:
+                kept.remove(generation)
+                excess -= 1
+        self._generations = kept
+
+
+@contextmanager
+def native_arrays(enabled: bool=True):
+    """Let pack_array() return arrays as NumPy arrays within this context, for encoders that serialize them natively."""
+    token = _native_arrays.set(enabled)
+    try:
+        yield
+    finally:
+        _native_arrays.reset(token)
+
+def packing_mode() -> str:
+    """Get how pack_array() currently serializes arrays: 'binary', 'native' or 'list'."""
+    if _active_store.get() is not None:
+        return "binary"
+    return "native" if _native_arrays.get() else "list"
+
+def pack_array(array: np.ndarray, dtype=np.float32) -> Union[list, dict, np.ndarray]:
+    """Serialize an array for to_dict(), either as a nested list, a NumPy array or a binary buffer reference.
+
+    Within BufferStore.collect() the array is registered as buffer, within native_arrays() it is returned as contiguous
+    NumPy array and otherwise as a (JSON serializable) list. The values are unchanged in the latter two cases.
+
+    Args:
+        array (np.ndarray): The array to serialize.
+        dtype (optional): The wire dtype used for binary transport. Defaults to np.float32.
+
+    Returns:
+        Union[list, dict, np.ndarray]: The array as list, NumPy array or buffer reference.
+    """
+    store = _active_store.get()
+    if store is not None:
+        return store.add(array, dtype=dtype)
+    if _native_arrays.get():
+        return np.ascontiguousarray(array)
+    return np.asarray(array).tolist()
@@ -0,0 +1,47 @@
+import numpy as np
+
+
+# Evenly spaced RGB stops, interpolated linearly in between, as in the viewer's shaders (viewer/src/shaders)
+COLORMAPS = {
+    "viridis": [
+        (0.267, 0.005, 0.329), (0.283, 0.141, 0.458), (0.254, 0.265, 0.530), (0.207, 0.372, 0.553),
+        (0.164, 0.471, 0.558), (0.128, 0.567, 0.551), (0.135, 0.659, 0.518), (0.267, 0.749, 0.441),
+        (0.478, 0.821, 0.318), (0.741, 0.873, 0.150), (0.993, 0.906, 0.144)
+    ],
+    "magma": [
+        (0.0015, 0.0005, 0.0139), (0.063, 0.027, 0.145), (0.236, 0.054, 0.239), (0.387, 0.094, 0.325),
+        (0.533, 0.165, 0.376), (0.678, 0.290, 0.388), (0.804, 0.431, 0.383), (0.906, 0.588, 0.376),
+        (0.976, 0.751, 0.478), (0.984, 0.894, 0.706), (0.987, 0.991, 0.749)
+    ],
+    "plasma": [
+        (0.050, 0.030, 0.527), (0.303, 0.039, 0.674), (0.503, 0.020, 0.702), (0.678, 0.051, 0.596),
+        (0.829, 0.158, 0.459), (0.954, 0.317, 0.317), (0.991, 0.498, 0.189), (0.940, 0.682, 0.150),
+        (0.828, 0.854, 0.231), (0.739, 0.974, 0.443), (0.940, 0.975, 0.600)
+    ],
+    "inferno": [
+        (0.001, 0.000, 0.014), (0.067, 0.016, 0.172), (0.223, 0.033, 0.373), (0.416, 0.057, 0.502),
+        (0.626, 0.127, 0.474), (0.796, 0.254, 0.374), (0.902, 0.427, 0.286), (0.973, 0.627, 0.202),
+        (0.988, 0.816, 0.144), (0.989, 0.957, 0.208), (0.998, 0.998, 0.858)
+    ]
+}
+DEFAULT_COLORMAP = "viridis" # the viewer's fallback for other names, e.g. cividis
+
+
+def apply_colormap(values: np.ndarray, name: str) -> np.ndarray:
+    """Map values in [0, 1] to RGB colors.
+
+    Args:
+        values (np.ndarray): The values, clamped to [0, 1]. NaNs map to 0.
+        name (str): The colormap name, see COLORMAPS. Unknown names use DEFAULT_COLORMAP.
+
+    Returns:
+        np.ndarray: The colors as uint8 array of shape (N, 3).
+    """
+    stops = np.asarray(COLORMAPS.get(str(name).lower(), COLORMAPS[DEFAULT_COLORMAP]))
+    values = np.clip(np.nan_to_num(np.asarray(values, dtype=np.float32).ravel()), 0, 1)
+    positions = np.linspace(0, 1, len(stops))
+
+    colors = np.empty((len(values), 3), dtype=np.uint8)
+    for channel in range(3):
+        colors[:, channel] = np.round(np.interp(values, positions, stops[:, channel]) * 255)
+    return colors
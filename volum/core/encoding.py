@@ -0,0 +1,37 @@
+import json
+import numpy as np
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def native_arrays_supported() -> bool:
+    """Check whether encode_json() serializes NumPy arrays natively, i.e. without converting them to lists first."""
+    return orjson is not None
+
+def _default(value: Any):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode_json(data: Any, indent: bool=False) -> bytes:
+    """Encode (serialized scene) data as JSON bytes. NumPy arrays and scalars are supported.
+
+    Uses orjson if it is installed, which serializes NumPy arrays straight from their buffer, and the json module otherwise.
+
+    Args:
+        data (Any): The data to encode.
+        indent (bool, optional): Indent the output by two spaces instead of encoding it compactly. Defaults to False.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=_default, option=option)
+
+    if indent:
+        return json.dumps(data, indent=2, default=_default).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), default=_default).encode("utf-8")
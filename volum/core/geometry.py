@@ -0,0 +1,97 @@
+import numpy as np
+from typing import Callable, Iterator, List, Union
+
+
+# Upper bound for the number of elements of intermediate (points x primitives) arrays, ~32 MB of float64
+CHUNK_ELEMENTS = 1 << 22
+
+
+def as_points(points: Union[List, np.ndarray], dim: int = 3) -> np.ndarray:
+    """Convert point(s) to a float array of shape (N, dim). A single point becomes an array with one row.
+
+    Args:
+        points (Union[List, np.ndarray]): A point or a sequence of points.
+        dim (int, optional): The point dimension. Defaults to 3.
+
+    Raises:
+        ValueError: If the points don't have the given dimension.
+
+    Returns:
+        np.ndarray: The points as (N, dim) array, without copying if they already are one.
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 1:
+        points = points.reshape(1, -1)
+    if points.ndim != 2 or points.shape[1] != dim:
+        raise ValueError(f"Expected points of shape (N, {dim}), got {points.shape}")
+    return points
+
+def chunks(count: int, width: int) -> Iterator[slice]:
+    """Split count rows into slices, so that a (rows, width) intermediate array stays below CHUNK_ELEMENTS.
+
+    Args:
+        count (int): The number of rows, e.g. query points.
+        width (int): The number of elements per row, e.g. curve samples or segments.
+
+    Yields:
+        slice: The row slices.
+    """
+    size = max(1, CHUNK_ELEMENTS // max(1, width))
+    for start in range(0, count, size):
+        yield slice(start, min(start + size, count))
+
+def transformed_distances(distance_to_many: Callable[[np.ndarray], np.ndarray], linear: np.ndarray, local_points: np.ndarray,
+                          local_distances: np.ndarray, iterations: int = 16) -> np.ndarray:
+    """Convert distances measured in an object's local space into the space the object is mapped to.
+
+    Rotations and uniform scales only scale the distances. For non-uniform scales the local closest point is
+    not the closest point after mapping, so it's refined by projected gradient descent on the mapped distance
+    and the shortest mapped distance found is returned.
+
+    Args:
+        distance_to_many (Callable[[np.ndarray], np.ndarray]): The object's distance function in local space.
+        linear (np.ndarray): The linear part of the map from local space, of shape (3, 3) or (N, 3, 3) for one map per point.
+        local_points (np.ndarray): The points in local space, of shape (N, 3).
+        local_distances (np.ndarray): The local distances of the points, of shape (N,).
+        iterations (int, optional): The number of refinement steps for non-uniform scales. Defaults to 16.
+
+    Returns:
+        np.ndarray: The distances after mapping, negative inside if the local distances are signed.
+    """
+    singular = np.linalg.svd(linear, compute_uv=False)
+    largest, smallest = singular[..., 0], singular[..., -1]
+    distances = np.broadcast_to(largest, local_distances.shape) * local_distances
+    refine = (largest - smallest > 1e-9 * largest) & (local_distances != 0) & np.isfinite(local_distances)
+    if not refine.any():
+        return distances
+
+    linear = linear[refine] if linear.ndim == 3 else np.broadcast_to(linear, (int(refine.sum()), 3, 3))
+    largest = np.broadcast_to(largest, local_distances.shape)[refine]
+    points, inside = local_points[refine], local_distances[refine] < 0
+    step = 1.0 / largest[:, None] ** 2 # 1 / Lipschitz constant of the gradient
+    h = 1e-6 * max(1.0, np.abs(points).max())
+    offsets = np.concatenate([np.eye(3), -np.eye(3)]) * h
+
+    def project(x):
+        # Move points onto the surface along the distance gradient (central differences). Points of outside queries
+        # that are already inside a solid are kept, the path from the query to them crosses the surface anyway.
+        d = distance_to_many(x)
+        around = distance_to_many((x[:, None, :] + offsets[None, :, :]).reshape(-1, 3)).reshape(len(x), 6)
+        gradient = (around[:, :3] - around[:, 3:]) / (2 * h)
+        norm = np.linalg.norm(gradient, axis=1, keepdims=True)
+        gradient = np.divide(gradient, norm, out=np.zeros_like(gradient), where=norm > 0)
+        return x - np.where(inside, d, np.maximum(d, 0))[:, None] * gradient
+
+    def mapped(x):
+        return np.einsum("nij,nj->ni", linear, x - points)
+
+    closest = project(points)
+    best = np.linalg.norm(mapped(closest), axis=1)
+    for _ in range(iterations):
+        descent = np.einsum("nji,nj->ni", linear, mapped(closest)) # linear^T @ (linear @ (x - point))
+        closest = project(closest - step * descent)
+        best = np.minimum(best, np.linalg.norm(mapped(closest), axis=1))
+
+    distances = np.array(distances)
+    distances[refine] = np.where(inside, -best, best)
+    return distances
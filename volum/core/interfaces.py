@@ -1,3 +1,6 @@
+import itertools
+
+
 class Serializable:
     """An interface for objects that can be serialized to a dictionary."""
     def to_dict(self):
@@ -7,3 +10,29 @@ class Scriptable:
     """An interface for objects that can run scripts."""
     def run_script(self, code: str):
         raise NotImplementedError("Object extends Scriptable and must therefore implement run_script() method")
+
+_changes = itertools.count(1) # see Trackable.changes
+
+class Trackable:
+    """An interface for objects that track changes to their attributes, e.g. to invalidate cached serializations.
+
+    In-place mutations (e.g. of NumPy arrays or lists) are not detected, call mark_dirty() after those.
+    """
+    _version: int = 0
+    _untracked_attributes = frozenset() # attributes that don't count as a change (e.g. lazily computed caches)
+    changes: int = 0 # numbers the latest change of any trackable object, e.g. to skip checking many objects one by one
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name not in self._untracked_attributes:
+            if name != "_version":
+                super().__setattr__("_version", self._version + 1)
+            Trackable.changes = next(_changes)
+
+    def mark_dirty(self):
+        """Mark the object as changed."""
+        self._version += 1
+
+    def revision(self) -> tuple:
+        """Get a token that changes whenever the object or one of its nested trackable objects (e.g. its material) changes."""
+        return (self._version, tuple(value.revision() for value in vars(self).values() if isinstance(value, Trackable)))
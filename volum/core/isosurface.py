@@ -0,0 +1,84 @@
+import numpy as np
+from typing import Tuple
+
+
+# Corner offsets of a grid cell and the corner pairs forming its 12 edges
+CELL_CORNERS = np.array([[x, y, z] for z in (0, 1) for y in (0, 1) for x in (0, 1)])
+CELL_EDGES = np.array([(a, b) for a in range(8) for b in range(a + 1, 8) if np.abs(CELL_CORNERS[a] - CELL_CORNERS[b]).sum() == 1])
+
+
+def surface_nets(field: np.ndarray, level: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Extract an isosurface from a 3D scalar field with (naive) surface nets, vectorized over all grid cells.
+
+    Each cell the surface passes through gets one vertex, the mean of its edges' crossing points. Each grid edge the
+    surface crosses gets a quad between the four cells around it, split into two triangles that face increasing values.
+
+    Args:
+        field (np.ndarray): The scalar field, indexed field[x, y, z].
+        level (float, optional): The iso value. Defaults to 0.0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The vertices in grid coordinates, of shape (V, 3), and the triangles' vertex
+            indices, of shape (T, 3).
+    """
+    field = np.asarray(field, dtype=np.float32)
+    if field.ndim != 3 or min(field.shape) < 2:
+        raise ValueError(f"Expected a 3D field with at least 2 samples per axis, got shape {field.shape}")
+    inside = field < level
+
+    # cells with corners on both sides of the surface
+    corner_count = np.zeros(np.subtract(field.shape, 1), dtype=np.uint8)
+    for x, y, z in CELL_CORNERS:
+        corner_count += inside[x:field.shape[0] - 1 + x, y:field.shape[1] - 1 + y, z:field.shape[2] - 1 + z]
+    active = np.flatnonzero((corner_count > 0) & (corner_count < 8)) # sorted, for the lookup below
+    del corner_count
+    cells = np.stack(np.unravel_index(active, np.subtract(field.shape, 1)), axis=1)
+
+    # vertices at the mean of the edge crossings
+    corners = cells[:, None, :] + CELL_CORNERS[None, :, :]
+    values = field[corners[..., 0], corners[..., 1], corners[..., 2]] - level
+    a, b = values[:, CELL_EDGES[:, 0]], values[:, CELL_EDGES[:, 1]]
+    crossed = (a < 0) != (b < 0)
+    t = np.divide(a, a - b, out=np.zeros_like(a), where=crossed)
+    offsets = CELL_CORNERS[CELL_EDGES[:, 0]] + t[..., None] * (CELL_CORNERS[CELL_EDGES[:, 1]] - CELL_CORNERS[CELL_EDGES[:, 0]])
+    vertices = cells + np.sum(offsets * crossed[..., None], axis=1) / np.sum(crossed, axis=1)[:, None]
+
+    # quads around the crossed grid edges, the cells of interior edges only
+    triangles = []
+    for axis in range(3):
+        u, v = (axis + 1) % 3, (axis + 2) % 3
+        lower = [slice(None)] * 3
+        upper = [slice(None)] * 3
+        lower[axis], upper[axis] = slice(0, -1), slice(1, None)
+        for other in (u, v):
+            lower[other] = upper[other] = slice(1, -1)
+        crossing = inside[tuple(lower)] != inside[tuple(upper)]
+        points = np.stack(np.nonzero(crossing), axis=1)
+        points[:, u] += 1
+        points[:, v] += 1
+        ascending = inside[tuple(lower)][crossing] # values increase along the axis, the quad faces +axis
+
+        quad = []
+        for du, dv in ((1, 1), (0, 1), (0, 0), (1, 0)): # counterclockwise around +axis
+            cell = points.copy()
+            cell[:, u] -= du
+            cell[:, v] -= dv
+            quad.append(np.searchsorted(active, np.ravel_multi_index(cell.T, np.subtract(field.shape, 1))))
+        quad = np.stack(quad, axis=1)
+        quad[~ascending] = quad[~ascending, ::-1]
+        triangles.append(np.concatenate([quad[:, [0, 1, 2]], quad[:, [0, 2, 3]]]))
+
+    return vertices.astype(np.float32), np.concatenate(triangles).astype(np.int64)
+
+def quantize_positions(vertices: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    """Quantize grid coordinates to uint16, i.e. the vertex position within the grid in steps of 1 / 65535.
+
+    Args:
+        vertices (np.ndarray): The vertices in grid coordinates, of shape (V, 3).
+        shape (Tuple[int, ...]): The grid shape.
+
+    Returns:
+        np.ndarray: The quantized positions, of shape (V, 3). Grids up to 4096 samples per axis keep 1/16 cell precision.
+    """
+    extent = np.maximum(np.asarray(shape, dtype=np.float32) - 1, 1)
+    return np.round(np.clip(vertices / extent, 0, 1) * 65535).astype(np.uint16)
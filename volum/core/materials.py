@@ -1,11 +1,12 @@
 import warnings, base64, requests
 from volum.config.constants import MaterialColors, TerminalColors
+from volum.core.interfaces import Trackable
 
 class MaterialWarning(Warning):
     """Base class for material-related warnings."""
     pass
 
-class Material:
+class Material(Trackable):
     """Base class for materials, providing common properties like color and opacity."""
     def __init__(self, color: str, opacity: float, name=None, **kwargs):
         self.color = color
@@ -0,0 +1,127 @@
+import numpy as np
+from typing import Optional
+from volum.core.geometry import chunks
+
+
+# Poisson-disk sampling looks up neighbours in a dense cell grid up to this many cells (8 bytes each)
+DENSE_GRID_CELLS = 1 << 25
+
+def importance_keys(count: int, weights: Optional[np.ndarray] = None, seed: int = 0) -> np.ndarray:
+    """Random sort keys for weighted sampling without replacement (Efraimidis-Spirakis): the items with the smallest
+    keys form a sample in which each item is picked with a probability proportional to its weight.
+
+    Args:
+        count (int): The number of items.
+        weights (Optional[np.ndarray], optional): The non-negative item weights, e.g. vector magnitudes. Defaults to uniform.
+        seed (int, optional): The random seed, so samples are reproducible. Defaults to 0.
+
+    Returns:
+        np.ndarray: The keys, items with zero weight get inf.
+    """
+    uniform = np.random.default_rng(seed).random(count)
+    if weights is None:
+        return uniform
+    with np.errstate(divide="ignore"):
+        return -np.log(uniform) / np.asarray(weights, dtype=float)
+
+def _cell_keys(points: np.ndarray, cell_size: float) -> np.ndarray:
+    """Get the flat keys and coordinates of the grid cells containing the points, and the grid dimensions."""
+    cells = np.floor((points - points.min(axis=0)) / cell_size).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    return np.ravel_multi_index(cells.T, dims), cells, dims
+
+def _order_by_cell(keys: np.ndarray, importance: np.ndarray) -> np.ndarray:
+    """Order points by cell, then by importance key (two sorts are faster than np.lexsort here)."""
+    order = np.argsort(importance)
+    return order[np.argsort(keys[order], kind="stable")]
+
+def grid_sample(points: np.ndarray, cell_size: float, weights: Optional[np.ndarray] = None, seed: int = 0) -> np.ndarray:
+    """Keep one point per grid cell, chosen randomly with probability proportional to its weight.
+
+    Args:
+        points (np.ndarray): The points, of shape (N, D).
+        cell_size (float): The edge length of the grid cells.
+        weights (Optional[np.ndarray], optional): The point weights, e.g. vector magnitudes. Defaults to uniform.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        np.ndarray: The sorted indices of the kept points.
+    """
+    if not len(points):
+        return np.zeros(0, dtype=np.int64)
+    keys, _, _ = _cell_keys(points, cell_size)
+    order = _order_by_cell(keys, importance_keys(len(points), weights, seed))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = keys[order[1:]] != keys[order[:-1]]
+    return np.sort(order[first])
+
+def poisson_disk_sample(points: np.ndarray, radius: float, weights: Optional[np.ndarray] = None, seed: int = 0, attempts: int = 3) -> np.ndarray:
+    """Select points that are at least radius apart (a Poisson-disk sample), preferring points with larger weights.
+
+    Points are bucketed into cells of edge radius / sqrt(D), which hold at most one selected point each. Cells are
+    processed in 3^D interleaved groups whose cells are far enough apart to be filled at once without conflicts.
+
+    Args:
+        points (np.ndarray): The points, of shape (N, D).
+        radius (float): The minimum distance between selected points.
+        weights (Optional[np.ndarray], optional): The point weights, e.g. vector magnitudes. Defaults to uniform.
+        seed (int, optional): The random seed. Defaults to 0.
+        attempts (int, optional): The number of candidates tried per cell. Defaults to 3.
+
+    Returns:
+        np.ndarray: The sorted indices of the selected points.
+    """
+    if not len(points):
+        return np.zeros(0, dtype=np.int64)
+    points = np.asarray(points, dtype=float)
+    dim = points.shape[1]
+    cell_size = radius / np.sqrt(dim)
+    cells = np.floor((points - points.min(axis=0)) / cell_size).astype(np.int64) + 2 # padded, so neighbours stay inside
+    dims = cells.max(axis=0) + 3
+    keys = np.ravel_multi_index(cells.T, dims)
+
+    # candidates per cell, by importance
+    order = _order_by_cell(keys, importance_keys(len(points), weights, seed))
+    cell_keys, cell_start, cell_count = np.unique(keys[order], return_index=True, return_counts=True)
+    groups = np.ravel_multi_index((cells[order[cell_start]] % 3).T, (3,) * dim)
+
+    # cells within two cells in each direction may hold points closer than radius, their keys are at fixed offsets
+    offsets = np.stack(np.meshgrid(*[np.arange(-2, 3)] * dim, indexing="ij"), axis=-1).reshape(-1, dim)
+    gaps = np.maximum(np.abs(offsets) - 1, 0) * cell_size
+    offsets = offsets[np.any(offsets != 0, axis=1) & (np.sum(gaps**2, axis=1) < radius**2)]
+    key_offsets = offsets @ np.append(np.cumprod(dims[:0:-1])[::-1], 1) # C order strides
+
+    if np.prod(dims) <= DENSE_GRID_CELLS:
+        grid = np.full(np.prod(dims), -1, dtype=np.int64) # cell key -> selected point
+        lookup = lambda neighbour_keys: grid[neighbour_keys]
+    else: # sparse, only occupied cells
+        selected = np.full(len(cell_keys) + 1, -1, dtype=np.int64) # the last entry stands for empty cells
+        def lookup(neighbour_keys):
+            found = np.searchsorted(cell_keys, neighbour_keys)
+            found[cell_keys[np.minimum(found, len(cell_keys) - 1)] != neighbour_keys] = len(cell_keys)
+            return selected[found]
+
+    done = np.zeros(len(cell_keys), dtype=bool)
+    for attempt in range(attempts):
+        for group in range(3 ** dim):
+            candidates = np.flatnonzero((groups == group) & ~done & (cell_count > attempt))
+            if not len(candidates):
+                continue
+            point_ids = order[cell_start[candidates] + attempt]
+            accepted = np.ones(len(candidates), dtype=bool)
+            for rows in chunks(len(candidates), len(key_offsets)):
+                neighbour_points = lookup(cell_keys[candidates[rows], None] + key_offsets[None, :])
+                row, column = np.nonzero(neighbour_points >= 0)
+                offset = points[point_ids[rows][row]] - points[neighbour_points[row, column]]
+                accepted[rows][row[np.einsum("nd,nd->n", offset, offset) < radius**2]] = False
+
+            candidates, point_ids = candidates[accepted], point_ids[accepted]
+            done[candidates] = True
+            if np.prod(dims) <= DENSE_GRID_CELLS:
+                grid[cell_keys[candidates]] = point_ids
+            else:
+                selected[candidates] = point_ids
+
+    if np.prod(dims) <= DENSE_GRID_CELLS:
+        return np.sort(grid[grid >= 0])
+    return np.sort(selected[selected >= 0])
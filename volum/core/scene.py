@@ -1,38 +1,100 @@
 from volum.core.registry import ObjectRegistry, MaterialInstances
 from volum.core.plugin import ScenePlugin
+from volum.core.buffers import BufferStore, native_arrays, packing_mode
+from volum.core.geometry import as_points
+from volum.core.spatial import BVH, sphere_trace
+from volum.core.encoding import encode_json, native_arrays_supported
 
-from typing import List, Dict, Union
-import uuid, os, numpy as np
+from typing import List, Dict, Union, Optional, Tuple
+import uuid, os, hashlib, tempfile, threading, numpy as np
 
-from volum.core.interfaces import Serializable
+from volum.core.interfaces import Serializable, Trackable
 from volum.core.materials import Material
 
 
+class SerializedFragment:
+    """A cached serialization of a scene object, valid as long as the object's revision doesn't change."""
+    def __init__(self, obj: "SceneObject", revision: tuple, data: dict):
+        self.obj = obj
+        self.revision = revision
+        self.data = data
+        self._encoded: Optional[bytes] = None
+        self._digest: Optional[bytes] = None
+
+    def is_valid(self, obj: "SceneObject", revision: tuple) -> bool:
+        return self.obj is obj and self.revision == revision
+
+    def encoded(self) -> bytes:
+        """Get the fragment as encoded JSON bytes (encoded once)."""
+        if self._encoded is None:
+            self._encoded = encode_json(self.data)
+        return self._encoded
+
+    def digest(self) -> bytes:
+        """Get a content hash of the encoded fragment (hashed once)."""
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.encoded(), digest_size=16).digest()
+        return self._digest
+
+
 class Scene:
-    def __init__(self):
+    id_modes = ["stable", "uuid"]
+
+    def __init__(self, id_mode: str="stable"):
+        """Initialize the Scene.
+
+        Args:
+            id_mode (str, optional): How object IDs are assigned, if not supplied by the user.
+                'stable' derives them from the object's type and its construction order among objects of that type,
+                e.g. "Box-0", so reloading the same script yields the same IDs, also for objects whose parameters
+                changed. IDs the user already supplied are skipped. 'uuid' assigns random IDs, as scenes did before
+                id_mode existed. Defaults to 'stable'.
+
+        Raises:
+            ValueError: If the id_mode is unknown.
+        """
+        if id_mode not in Scene.id_modes:
+            raise ValueError(f"id_mode must be one of {Scene.id_modes}, got '{id_mode}'")
+
         self.registry = ObjectRegistry()
         self.plugins: List[ScenePlugin] = []
         self.objects: Dict[str, SceneObject] = {}
         self.materials = MaterialInstances()
+        self.buffers = BufferStore()
+        self.lock = threading.RLock() # held while serializing and mutating, so concurrent requests see consistent scenes
+        self.id_mode = id_mode
+        self._type_counts: Dict[str, int] = {} # construction order per object type, for stable IDs
+        self._fragments: Dict[Tuple[str, str], SerializedFragment] = {} # (object ID, packing mode) -> cached serialization
+        self._spatial_index: Optional[BVH] = None # built lazily, see spatial_index()
+        self._spatial_items: Dict[str, int] = {} # object ID -> BVH item
+        self._spatial_ids: List[str] = []
+        self._spatial_revisions: Dict[str, tuple] = {}
+        self._spatial_size = 0
+        self._spatial_changes = 0 # Trackable.changes when the index was last brought up to date
 
     def load_plugins(self, plugins: List[ScenePlugin]):
-        """Load plugins into the scene's registry."""
+        """Load plugins into the scene's registry. Plugins that are already loaded (by name) are skipped."""
         for plugin in plugins:
             if not isinstance(plugin, ScenePlugin):
                 raise TypeError(f"Expected ScenePlugin, got {type(plugin)}")
-            if plugin not in self.plugins:
+            if plugin.name not in [loaded.name for loaded in self.plugins]:
                 plugin.register(self.registry)
                 self.plugins.append(plugin)
 
-    def add_object(self, obj_or_type: Union[str, "SceneObject", Material], **kwargs):
+    def add_object(self, obj_or_type: Union[str, "SceneObject", Material], id: Optional[str]=None, **kwargs) -> str:
         """Add an object to the scene.
 
         Args:
             obj_or_type (Union[str, SceneObject, Material]): The object or type of object to add.
+            id (Optional[str], optional): User-supplied object ID. Defaults to the object's own ID, if set,
+                or an ID assigned according to the scene's id_mode. Ignored for materials, which use their name.
 
         Raises:
-            ValueError: If the object type is unknown.
+            ValueError: If the object type is unknown or the ID is already taken by another object.
             TypeError: If the object is not a SceneObject or Material.
+
+        Returns:
+            str: The ID of the added object (the name for materials).
         """
 
         # TODO: support material as plugin
@@ -57,37 +119,293 @@ class Scene:
             obj_id = obj.name
             if obj_id is None:
                 raise ValueError("Material must be added with a 'name' kwarg to the scene.")
-            self.materials.register_material(obj_id, obj)
-        else:
-            obj_id = f"{len(self.objects)}-{uuid.uuid4()}"
+            with self.lock:
+                self.materials.register_material(obj_id, obj)
+            return obj_id
+
+        with self.lock:
+            obj_type = obj.__class__.__name__
+            order = self._type_counts.get(obj_type, 0)
+            obj_id = id or obj._id
+            if obj_id is None:
+                if self.id_mode == "stable":
+                    while self.objects.get(f"{obj_type}-{order}", obj) is not obj: # skip IDs the user supplied
+                        order += 1
+                    obj_id = f"{obj_type}-{order}"
+                else:
+                    obj_id = f"{len(self.objects)}-{uuid.uuid4()}"
+
+            if self.objects.get(obj_id, obj) is not obj:
+                raise ValueError(f"Object ID '{obj_id}' is already taken by {self.objects[obj_id]}")
+
+            self._type_counts[obj_type] = order + 1
             setattr(obj, '_id', obj_id) # set the id (SceneObject should provide an id attribute)
             self.objects[obj_id] = obj
+            self._spatial_index = None
+            obj.prepare()
+            return obj_id
+
+    def serialize(self, file_name, binary: bool=False):
+        """Serialize the scene to a dictionary.
+
+        Args:
+            file_name (str): The file name stored with the scene.
+            binary (bool, optional): Replace large arrays with references into the scene's BufferStore
+                instead of inlining them as lists. Defaults to False.
+        """
+        if binary:
+            with self.buffers.collect():
+                return self.serialize(file_name)
 
-    def serialize(self, file_name):
-        """Serialize the scene to a dictionary."""
-        return {
-            "file": file_name,
-            "plugins": [plugin.name for plugin in self.plugins],
-            "objects": [obj.to_dict() for obj in self.objects.values()] + [mat.to_dict() for mat in self.materials.materials.values()],
-        }
+        with self.lock:
+            return {
+                "file": file_name,
+                "plugins": [plugin.name for plugin in self.plugins],
+                "objects": [fragment.data for fragment in self._serialize_objects()] + [mat.to_dict() for mat in self.materials.materials.values()],
+            }
+
+    def serialize_json(self, file_name, binary: bool=False) -> bytes:
+        """Serialize the scene to JSON bytes, reusing the encoded fragments of unchanged objects.
+
+        Args:
+            file_name (str): The file name stored with the scene.
+            binary (bool, optional): See serialize(). Defaults to False.
+        """
+        return self.serialize_json_etag(file_name, binary=binary)[0]
+
+    def serialize_json_etag(self, file_name, binary: bool=False) -> Tuple[bytes, str]:
+        """Serialize the scene to JSON bytes and a content hash of them (e.g. for ETags) in the same pass. The hash is
+        built from the cached digests of the fragments rather than from the assembled JSON.
+
+        Args:
+            file_name (str): The file name stored with the scene.
+            binary (bool, optional): See serialize(). Defaults to False.
+
+        Returns:
+            Tuple[bytes, str]: The JSON and its hex digest.
+        """
+        if binary:
+            with self.buffers.collect():
+                return self.serialize_json_etag(file_name)
+
+        hasher = hashlib.blake2b(digest_size=16)
+        with self.lock, native_arrays(native_arrays_supported()): # skip converting arrays to lists if the encoder handles them
+            header = encode_json({"file": file_name, "plugins": [plugin.name for plugin in self.plugins]})
+            fragments = self._serialize_objects()
+            objects = [fragment.encoded() for fragment in fragments] + [encode_json(mat.to_dict()) for mat in self.materials.materials.values()]
+            hasher.update(header)
+            for fragment in fragments:
+                hasher.update(fragment.digest())
+            for material in objects[len(fragments):]:
+                hasher.update(material)
+        return header[:-1] + b',"objects":[' + b",".join(objects) + b"]}", hasher.hexdigest()
+
+    def serialize_digests(self, file_name) -> dict:
+        """Serialize the scene with a content hash in place of each object, e.g. to find changed objects with
+        diff_scenes() without serializing (and keeping) binary buffers. Hashes are of serialize_json() fragments.
+
+        Args:
+            file_name (str): The file name stored with the scene.
+
+        Returns:
+            dict: As serialize(), with objects reduced to their "id" and "type" and their "digest".
+        """
+        with self.lock, native_arrays(native_arrays_supported()):
+            objects = [{"id": fragment.data["id"], "type": fragment.data.get("type"), "digest": fragment.digest()} for fragment in self._serialize_objects()]
+            for mat in self.materials.materials.values():
+                data = mat.to_dict()
+                objects.append({"type": data.get("type"), "digest": hashlib.blake2b(encode_json(data), digest_size=16).digest()})
+            return {"file": file_name, "plugins": [plugin.name for plugin in self.plugins], "objects": objects}
+
+    def _serialize_objects(self) -> List[SerializedFragment]:
+        """Serialize all scene objects, calling to_dict() only for objects that changed since their last serialization.
+        Callers hold the scene's lock."""
+        mode = packing_mode()
+        fragments = []
+        for obj_id, obj in list(self.objects.items()):
+            revision = obj.revision()
+            fragment = self._fragments.get((obj_id, mode))
+            if fragment is None or not fragment.is_valid(obj, revision):
+                fragment = SerializedFragment(obj, revision, {"id": obj_id, **obj.to_dict()})
+                self._fragments[(obj_id, mode)] = fragment
+            elif mode == "binary":
+                self.buffers.retain(fragment.data)
+            fragments.append(fragment)
+
+        # drop fragments of removed objects
+        for key in [key for key in self._fragments if key[0] not in self.objects]:
+            self._fragments.pop(key, None)
+        return fragments
 
     def clear(self):
         """Clear all objects and materials in the scene. Does not remove plugins."""
-        self.objects.clear()
-        self.materials.clear()
+        with self.lock:
+            self.objects.clear()
+            self.materials.clear()
+            self._type_counts.clear()
+            self._fragments.clear()
+            self._spatial_index = None
 
-    def save(self, path: str=os.path.join(os.getcwd(), "scene.json")):
-        """Save the current scene to a JSON file."""
-        import json
-        with open(path, 'w') as f:
-            json.dump(self.serialize(path.split("/")[-1].split("\\")[-1]), f, indent=2)
+    def __getstate__(self):
+        # the lock can't be pickled (e.g. by the ScriptWorker), the caches are rebuilt on demand
+        state = self.__dict__.copy()
+        del state["lock"]
+        state.update({"_fragments": {}, "_spatial_index": None, "_spatial_items": {}, "_spatial_ids": [], "_spatial_revisions": {}, "_spatial_size": 0})
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+
+    def save(self, path: str=os.path.join(os.getcwd(), "scene.json"), compact: bool=False):
+        """Save the current scene to a JSON file.
+
+        The file is written atomically, i.e. to a temporary file that then replaces the target, so readers
+        (like the live server) never see a partially written scene.
+
+        Args:
+            path (str, optional): The file path. Defaults to scene.json in the working directory.
+            compact (bool, optional): Write compact instead of indented JSON, which is smaller and faster. Defaults to False.
+        """
+        file_name = path.split("/")[-1].split("\\")[-1]
+        if compact:
+            data = self.serialize_json(file_name)
+        else:
+            with native_arrays(native_arrays_supported()):
+                data = encode_json(self.serialize(file_name), indent=True)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{file_name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644) # mkstemp creates the file as 0600
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def spatial_index(self) -> BVH:
+        """Get the bounding volume hierarchy over the world-space bounds of all objects (see SceneObject.bounds()).
+
+        The index is built lazily and rebuilt after objects were added or removed. Objects whose revision changed
+        since the last query, e.g. moved in place by a script, are refitted first.
+        """
+        changes = Trackable.changes
+        if self._spatial_index is not None and self._spatial_size == len(self.objects) and self._spatial_changes != changes:
+            self.refit()
+        if self._spatial_index is None or self._spatial_size != len(self.objects):
+            self._spatial_ids, lower, upper = [], [], []
+            for obj_id, obj in self.objects.items():
+                bounds = obj.bounds()
+                if bounds is not None:
+                    self._spatial_ids.append(obj_id)
+                    lower.append(bounds[0])
+                    upper.append(bounds[1])
+            self._spatial_items = {obj_id: item for item, obj_id in enumerate(self._spatial_ids)}
+            self._spatial_revisions = {obj_id: self.objects[obj_id].revision() for obj_id in self._spatial_ids}
+            self._spatial_index = BVH(np.reshape(lower, (-1, 3)), np.reshape(upper, (-1, 3)))
+            self._spatial_size = len(self.objects)
+        self._spatial_changes = changes
+        return self._spatial_index
+
+    def refit(self, *object_ids: str):
+        """Update the spatial index after objects moved or changed their size, without rebuilding it.
+
+        Args:
+            object_ids (str): The IDs of the changed objects. Defaults to all objects whose revision changed.
+        """
+        if self._spatial_index is None:
+            return # built with the current bounds on the next query
+        if not object_ids:
+            object_ids = tuple(obj_id for obj_id in self._spatial_ids if obj_id in self.objects and self.objects[obj_id].revision() != self._spatial_revisions.get(obj_id))
+
+        for obj_id in object_ids:
+            obj, item = self.objects.get(obj_id), self._spatial_items.get(obj_id)
+            bounds = obj.bounds() if obj is not None else None
+            if item is None:
+                if bounds is not None:
+                    self._spatial_index = None # gained bounds, rebuild
+                    return
+                continue
+            if bounds is None:
+                bounds = (np.full(3, np.inf), np.full(3, -np.inf)) # empty box, never matches
+            self._spatial_index.refit(item, bounds[0], bounds[1])
+            self._spatial_revisions[obj_id] = obj.revision() if obj is not None else None
+
+    def nearest_object(self, point: Union[List[float], np.ndarray], max_distance: float = np.inf) -> Tuple[Optional[str], float]:
+        """Find the object closest to a point in world space.
+
+        Args:
+            point (Union[List[float], np.ndarray]): The query point.
+            max_distance (float, optional): Ignore objects further away. Defaults to np.inf.
+
+        Returns:
+            Tuple[Optional[str], float]: The ID of the closest object (None if there is none) and its distance.
+        """
+        index = self.spatial_index()
+        item, distance = index.nearest(as_points(point)[0], lambda items, p: [self.objects[self._spatial_ids[item]].distance_to(p) for item in items], max_distance)
+        return (self._spatial_ids[item] if item is not None else None), distance
+
+    def raycast(self, origin: Union[List[float], np.ndarray], direction: Union[List[float], np.ndarray],
+                max_distance: float = np.inf, tolerance: float = 1e-6) -> List[Tuple[str, float]]:
+        """Find the objects hit by a ray, e.g. for picking.
+
+        Candidates are found via the spatial index and then hit-tested by sphere tracing their distance functions.
+
+        Args:
+            origin (Union[List[float], np.ndarray]): The ray origin.
+            direction (Union[List[float], np.ndarray]): The ray direction.
+            max_distance (float, optional): The ray length. Defaults to np.inf.
+            tolerance (float, optional): How close the ray has to pass an object to hit it, e.g. a pick radius for lines. Defaults to 1e-6.
+
+        Raises:
+            ValueError: If the direction is zero.
+
+        Returns:
+            List[Tuple[str, float]]: The IDs of the hit objects and the distances along the ray, closest first.
+        """
+        origin = as_points(origin)[0]
+        direction = as_points(direction)[0]
+        length = np.linalg.norm(direction)
+        if length == 0:
+            raise ValueError("Ray direction must not be zero")
+        direction = direction / length
+
+        hits = []
+        for t_enter, t_exit, item in self.spatial_index().raycast(origin, direction, max_distance):
+            obj_id = self._spatial_ids[item]
+            t = sphere_trace(self.objects[obj_id].distance_to, origin, direction, t_enter, t_exit + tolerance, tolerance)
+            if t is not None:
+                hits.append((obj_id, t))
+        return sorted(hits, key=lambda hit: hit[1])
+
+    def objects_in_box(self, lower: Union[List[float], np.ndarray], upper: Union[List[float], np.ndarray]) -> List[str]:
+        """Find the objects whose world-space bounds overlap an axis-aligned box.
+
+        Args:
+            lower (Union[List[float], np.ndarray]): The lower corner of the box.
+            upper (Union[List[float], np.ndarray]): The upper corner of the box.
+
+        Returns:
+            List[str]: The IDs of the overlapping objects.
+        """
+        return [self._spatial_ids[item] for item in self.spatial_index().overlap(as_points(lower)[0], as_points(upper)[0])]
 
     def __getitem__(self, key: str):
         """Get a scene object by its ID. Not including materials."""
         return self.objects.get(key)
 
 
-class SceneObject(Serializable):
+class SceneObject(Serializable, Trackable):
+    """Base class for scene objects.
+
+    Attribute changes (including property setters) mark the object dirty, so Scene.serialize() only calls to_dict()
+    for objects that changed. Call mark_dirty() after mutating attributes in place, e.g. NumPy arrays.
+    """
     _material: Material
 
     def __init__(self, material, id=None, **kwargs):
@@ -145,9 +463,42 @@ class SceneObject(Serializable):
             raise ValueError("Object ID is not set. Ensure to set 'id' in the constructor or use 'set_id()'.")
         return self._id
 
-    def distance_to(self, point: Union[List[float], np.ndarray, tuple]):
-        raise NotImplementedError("SceneObject subclasses must implement a distance() method")
+    def distance_to(self, point: Union[List[float], np.ndarray, tuple]) -> float:
+        """Get the distance from a point (in the object's local space) to the object.
+
+        Subclasses implement either this method or the vectorized distance_to_many(), which this then delegates to.
+        """
+        if type(self).distance_to_many is SceneObject.distance_to_many:
+            raise NotImplementedError("SceneObject subclasses must implement a distance_to() or distance_to_many() method")
+        return float(self.distance_to_many(np.asarray(point, dtype=float).reshape(1, -1))[0]) # keep the point's dimension, e.g. 2D lines
+
+    def distance_to_many(self, points: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        """Get the distances from many points (in the object's local space) to the object at once.
+
+        The default implementation calls distance_to() per point, built-in objects override it with vectorized versions.
+
+        Args:
+            points (Union[List[List[float]], np.ndarray]): The points, of shape (N, 3).
+
+        Returns:
+            np.ndarray: The N distances.
+        """
+        points = np.asarray(points, dtype=float)
+        return np.array([self.distance_to(point) for point in points.reshape(-1, points.shape[-1])], dtype=float)
     
+    def bounds(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Get the axis-aligned bounding box of the object in its local space, as (lower, upper) corners.
+
+        Objects without bounds (the default, e.g. lights or plots) are left out of spatial queries like Scene.nearest_object().
+        """
+        return None
+
+    def prepare(self):
+        """Start computing data the serialization needs ahead of time, e.g. in the background. Called by
+        Scene.add_object(), the default does nothing.
+        """
+        pass
+
     def transform(self, position=None, rotation=None, scale=None):
         """Apply a transformation to the object."""
         from volum.objects.transform import Transform
@@ -0,0 +1,258 @@
+import heapq
+import numpy as np
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+class BVH:
+    """A bounding volume hierarchy over axis-aligned bounding boxes.
+
+    The tree is stored in flat arrays: node i covers lower[i]..upper[i], inner nodes have two children
+    (left[i], right[i]), leaves reference the items order[start[i]:start[i] + count[i]].
+    """
+    def __init__(self, lower: np.ndarray, upper: np.ndarray, leaf_size: int = 4):
+        """Build the hierarchy by sorting the items along a Morton (Z-order) curve through their centers and
+        recursively halving the sorted items.
+
+        Args:
+            lower (np.ndarray): The lower corners of the items' bounding boxes, of shape (N, 3).
+            upper (np.ndarray): The upper corners of the items' bounding boxes, of shape (N, 3).
+            leaf_size (int, optional): The maximum number of items per leaf. Defaults to 4.
+        """
+        self.item_lower = np.array(lower, dtype=float).reshape(-1, 3)
+        self.item_upper = np.array(upper, dtype=float).reshape(-1, 3)
+        self.leaf_size = max(1, leaf_size)
+
+        count = len(self.item_lower)
+        max_nodes = max(1, 2 * count)
+        self.lower = np.zeros((max_nodes, 3))
+        self.upper = np.zeros((max_nodes, 3))
+        self.left = np.full(max_nodes, -1, dtype=np.int64)
+        self.right = np.full(max_nodes, -1, dtype=np.int64)
+        self.parent = np.full(max_nodes, -1, dtype=np.int64)
+        self.start = np.zeros(max_nodes, dtype=np.int64)
+        self.count = np.zeros(max_nodes, dtype=np.int64)
+        self.order = np.zeros(count, dtype=np.int64)
+        self.leaf_of = np.zeros(count, dtype=np.int64) # item -> leaf node
+        self.node_count = 0
+
+        if count:
+            self._build()
+        else:
+            self.node_count = 1
+            self.lower[0], self.upper[0] = np.inf, -np.inf # empty root
+
+    def __len__(self):
+        return len(self.item_lower)
+
+    def _build(self):
+        # vectorized per tree level rather than per node, so millions of items (e.g. line segments) build quickly
+        self.order = np.argsort(_morton_codes(self.item_lower + self.item_upper), kind="stable")
+
+        levels = []
+        begin, end, parent = np.array([0]), np.array([len(self.order)]), np.array([-1])
+        while len(begin):
+            nodes = self.node_count + np.arange(len(begin))
+            self.node_count += len(begin)
+            self.start[nodes], self.count[nodes], self.parent[nodes] = begin, end - begin, parent
+            levels.append(nodes)
+
+            split = (end - begin) > self.leaf_size
+            inner, mid = nodes[split], (begin + end)[split] // 2
+            children = self.node_count + np.arange(2 * len(inner))
+            self.left[inner], self.right[inner] = children[0::2], children[1::2]
+            self.count[inner] = 0
+            begin = np.stack([begin[split], mid], axis=1).ravel()
+            end = np.stack([mid, end[split]], axis=1).ravel()
+            parent = np.repeat(inner, 2)
+
+        # leaf bounds from their (contiguous) item ranges, inner bounds bottom-up
+        leaves = np.flatnonzero(self.left[:self.node_count] < 0)
+        leaves = leaves[np.argsort(self.start[leaves])]
+        self.lower[leaves] = np.minimum.reduceat(self.item_lower[self.order], self.start[leaves])
+        self.upper[leaves] = np.maximum.reduceat(self.item_upper[self.order], self.start[leaves])
+        self.leaf_of[self.order] = np.repeat(leaves, self.count[leaves])
+        for nodes in reversed(levels):
+            inner = nodes[self.left[nodes] >= 0]
+            self.lower[inner] = np.minimum(self.lower[self.left[inner]], self.lower[self.right[inner]])
+            self.upper[inner] = np.maximum(self.upper[self.left[inner]], self.upper[self.right[inner]])
+
+    def _is_leaf(self, node: int) -> bool:
+        return self.left[node] < 0
+
+    def _items(self, node: int) -> np.ndarray:
+        return self.order[self.start[node]:self.start[node] + self.count[node]]
+
+    def refit(self, item: int, lower: Sequence[float], upper: Sequence[float]):
+        """Update the bounding box of an item and its ancestors, without rebuilding the tree.
+
+        Moving items far degrades the query performance over time, rebuild the hierarchy after large changes.
+
+        Args:
+            item (int): The item index.
+            lower (Sequence[float]): The new lower corner.
+            upper (Sequence[float]): The new upper corner.
+        """
+        self.item_lower[item], self.item_upper[item] = lower, upper
+        node = self.leaf_of[item]
+        while node >= 0:
+            if self._is_leaf(node):
+                items = self._items(node)
+                new_lower, new_upper = self.item_lower[items].min(axis=0), self.item_upper[items].max(axis=0)
+            else:
+                children = [self.left[node], self.right[node]]
+                new_lower, new_upper = self.lower[children].min(axis=0), self.upper[children].max(axis=0)
+            self.lower[node], self.upper[node] = new_lower, new_upper
+            node = self.parent[node]
+
+    def nearest(self, point: Sequence[float], distance: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                max_distance: float = np.inf) -> Tuple[Optional[int], float]:
+        """Find the item closest to a point, visiting nodes by increasing distance to their bounding boxes.
+
+        Args:
+            point (Sequence[float]): The query point.
+            distance (Callable[[np.ndarray, np.ndarray], np.ndarray]): The exact distances of the given items (those
+                of one leaf) to the point. They must not be larger than the distances to the items' bounding boxes.
+            max_distance (float, optional): Ignore items further away. Defaults to np.inf.
+
+        Returns:
+            Tuple[Optional[int], float]: The closest item (None if there is none within max_distance) and its distance.
+        """
+        point = np.asarray(point, dtype=float)
+        best, best_distance = None, max_distance
+        heap = [(self._box_distance(0, point), 0)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if bound > best_distance:
+                break
+            if self._is_leaf(node):
+                items = self._items(node)
+                if not len(items):
+                    continue # empty root
+                distances = np.asarray(distance(items, point), dtype=float)
+                closest = int(np.argmin(distances))
+                if distances[closest] < best_distance:
+                    best, best_distance = int(items[closest]), float(distances[closest])
+                continue
+            for child in (self.left[node], self.right[node]):
+                child_bound = self._box_distance(child, point)
+                if child_bound <= best_distance:
+                    heapq.heappush(heap, (child_bound, int(child)))
+        return best, best_distance
+
+    def raycast(self, origin: Sequence[float], direction: Sequence[float], max_distance: float = np.inf) -> List[Tuple[float, float, int]]:
+        """Find the items whose bounding boxes a ray passes through.
+
+        Args:
+            origin (Sequence[float]): The ray origin.
+            direction (Sequence[float]): The ray direction, normalized.
+            max_distance (float, optional): The ray length. Defaults to np.inf.
+
+        Returns:
+            List[Tuple[float, float, int]]: (t_enter, t_exit, item) per item, sorted by t_enter.
+        """
+        origin = np.asarray(origin, dtype=float)
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / np.asarray(direction, dtype=float)
+
+        hits = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._ray_interval(self.lower[node], self.upper[node], origin, inverse, max_distance) is None:
+                continue
+            if not self._is_leaf(node):
+                stack.extend((self.left[node], self.right[node]))
+                continue
+            for item in self._items(node):
+                interval = self._ray_interval(self.item_lower[item], self.item_upper[item], origin, inverse, max_distance)
+                if interval is not None:
+                    hits.append((interval[0], interval[1], int(item)))
+        hits.sort()
+        return hits
+
+    def overlap(self, lower: Sequence[float], upper: Sequence[float]) -> List[int]:
+        """Find the items whose bounding boxes overlap a box.
+
+        Args:
+            lower (Sequence[float]): The lower corner of the box.
+            upper (Sequence[float]): The upper corner of the box.
+
+        Returns:
+            List[int]: The overlapping items.
+        """
+        lower, upper = np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+        items = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if np.any(self.lower[node] > upper) or np.any(self.upper[node] < lower):
+                continue
+            if not self._is_leaf(node):
+                stack.extend((self.left[node], self.right[node]))
+                continue
+            candidates = self._items(node)
+            inside = np.all(self.item_lower[candidates] <= upper, axis=1) & np.all(self.item_upper[candidates] >= lower, axis=1)
+            items.extend(int(item) for item in candidates[inside])
+        return items
+
+    def _box_distance(self, node: int, point: np.ndarray) -> float:
+        offset = np.maximum(np.maximum(self.lower[node] - point, point - self.upper[node]), 0)
+        return float(np.sqrt(offset @ offset))
+
+    @staticmethod
+    def _ray_interval(lower, upper, origin, inverse, max_distance) -> Optional[Tuple[float, float]]:
+        """Slab test, returns the (entry, exit) ray parameters or None if the ray misses the box."""
+        with np.errstate(invalid="ignore"):
+            t1 = (lower - origin) * inverse
+            t2 = (upper - origin) * inverse
+        # nan for a zero direction component with the origin on a slab plane, count as inside
+        t_near = np.nanmax(np.append(np.minimum(t1, t2), 0.0))
+        t_far = np.nanmin(np.append(np.maximum(t1, t2), max_distance))
+        if t_near > t_far:
+            return None
+        return float(t_near), float(t_far)
+
+
+def _morton_codes(points: np.ndarray) -> np.ndarray:
+    """Interleave the bits of the points' coordinates, quantized to 21 bits within their bounding box."""
+    extent = points.max(axis=0) - points.min(axis=0)
+    scale = np.where(extent > 0, ((1 << 21) - 1) / np.where(extent > 0, extent, 1), 0)
+    quantized = ((points - points.min(axis=0)) * scale).astype(np.uint64)
+
+    codes = np.zeros(len(points), dtype=np.uint64)
+    for axis in range(3):
+        bits = quantized[:, axis]
+        # spread the 21 bits to every third bit
+        bits = (bits | (bits << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+        bits = (bits | (bits << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+        bits = (bits | (bits << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+        bits = (bits | (bits << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+        bits = (bits | (bits << np.uint64(2))) & np.uint64(0x1249249249249249)
+        codes |= bits << np.uint64(axis)
+    return codes
+
+def sphere_trace(distance: Callable[[np.ndarray], float], origin: np.ndarray, direction: np.ndarray,
+                 t_start: float, t_end: float, tolerance: float = 1e-6, max_steps: int = 256) -> Optional[float]:
+    """March along a ray by the distance to a surface until it is hit.
+
+    Args:
+        distance (Callable[[np.ndarray], float]): The distance of a point to the surface, it may underestimate but not overestimate.
+        origin (np.ndarray): The ray origin.
+        direction (np.ndarray): The ray direction, normalized.
+        t_start (float): The ray parameter to start at.
+        t_end (float): The ray parameter to give up at.
+        tolerance (float, optional): The distance at which the surface counts as hit. Defaults to 1e-6.
+        max_steps (int, optional): The maximum number of steps. Defaults to 256.
+
+    Returns:
+        Optional[float]: The ray parameter of the hit, or None if the ray misses.
+    """
+    t = t_start
+    for _ in range(max_steps):
+        step = distance(origin + t * direction)
+        if step < tolerance:
+            return t
+        t += step
+        if t > t_end:
+            return None
+    return None
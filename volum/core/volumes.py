@@ -0,0 +1,153 @@
+import os
+import numpy as np
+from typing import Optional, Tuple
+from volum.core.geometry import chunks
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+
+QUANTIZE_TYPES = ["uint8", "uint16"]
+HISTOGRAM_BINS = 256
+
+
+def volume_format(path: str) -> str:
+    """Get the format of a volume file from its name: "npy", "zarr" (a directory with a .zarray file) or "raw"."""
+    if path.endswith(".npy"):
+        return "npy"
+    if path.rstrip("/\\").endswith(".zarr") or os.path.isfile(os.path.join(path, ".zarray")):
+        return "zarr"
+    return "raw"
+
+def open_volume(path: str, shape: Optional[Tuple[int, int, int]] = None, dtype: Optional[str] = None):
+    """Open a volume without loading it into memory, NPY and raw files are memory-mapped, Zarr arrays read per slice.
+
+    Volumes are stored x-fastest (C order [z, y, x]), like 3D textures, and returned as view indexed [x, y, z].
+
+    Args:
+        path (str): The volume file.
+        shape (Optional[Tuple[int, int, int]], optional): The sample counts (x, y, z), required for raw files.
+        dtype (Optional[str], optional): The sample type, required for raw files, e.g. "uint8" or "<f4".
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        ValueError: If a raw file's shape or dtype is missing or doesn't match its size, or the volume isn't 3D.
+        ImportError: If a Zarr array is opened without zarr installed.
+
+    Returns:
+        The volume, a read-only array (or Zarr array) indexed [x, y, z].
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No such volume: {path}")
+
+    fmt = volume_format(path)
+    if fmt == "npy":
+        data = np.load(path, mmap_mode="r")
+    elif fmt == "zarr":
+        if zarr is None:
+            raise ImportError("Reading Zarr volumes requires zarr, install it with 'pip install zarr'")
+        data = zarr.open(path, mode="r")
+    else:
+        if shape is None or dtype is None:
+            raise ValueError(f"Raw volume {path} needs a shape and dtype")
+        dtype = np.dtype(dtype)
+        expected = int(np.prod(shape)) * dtype.itemsize
+        if os.path.getsize(path) != expected:
+            raise ValueError(f"Raw volume {path} has {os.path.getsize(path)} bytes, expected {expected} for shape {tuple(shape)} and dtype {dtype}")
+        data = np.memmap(path, dtype=dtype, mode="r", shape=tuple(int(n) for n in shape)[::-1])
+
+    if len(data.shape) != 3:
+        raise ValueError(f"Expected a 3D volume, got shape {data.shape}")
+    if fmt == "zarr":
+        return _ZarrVolume(data)
+    return data.transpose()
+
+class _ZarrVolume:
+    """Reads a Zarr array stored [z, y, x] as if it was indexed [x, y, z], one requested box at a time."""
+    def __init__(self, array):
+        self.array = array
+        self.shape = tuple(array.shape[::-1])
+        self.dtype = np.dtype(array.dtype)
+        self.ndim = 3
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        key = key + (slice(None),) * (3 - len(key))
+        return np.asarray(self.array[key[::-1]]).transpose()
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self[:, :, :], dtype=dtype)
+
+
+def quantize(values: np.ndarray, low: float, high: float, dtype: str = "uint8") -> np.ndarray:
+    """Map values in [low, high] linearly to the full range of an unsigned integer type.
+
+    Args:
+        values (np.ndarray): The values.
+        low (float): The value mapped to 0.
+        high (float): The value mapped to the type's maximum.
+        dtype (str, optional): "uint8" or "uint16". Defaults to "uint8".
+
+    Returns:
+        np.ndarray: The quantized values, all 0 if high equals low.
+    """
+    dtype = np.dtype(dtype)
+    top = np.iinfo(dtype).max
+    scale = top / (high - low) if high > low else 0.0
+    scaled = (np.asarray(values, dtype=np.float32) - np.float32(low)) * np.float32(scale)
+    return np.clip(np.round(scaled), 0, top).astype(dtype)
+
+def value_range(data) -> Tuple[float, float]:
+    """Get the minimum and maximum of a volume, working through it in slabs."""
+    low, high = np.inf, -np.inf
+    for rows in chunks(data.shape[0], int(np.prod(data.shape[1:]))):
+        slab = np.asarray(data[rows])
+        low, high = min(low, float(slab.min())), max(high, float(slab.max()))
+    return low, high
+
+def _slabs(data):
+    """Yield the slabs along x (as float32) with one sample of halo on either side, and the slice of the slab proper."""
+    count = data.shape[0]
+    for rows in chunks(count, int(np.prod(data.shape[1:])) * 8): # the gradient's temporaries
+        start, stop = max(rows.start - 1, 0), min(rows.stop + 1, count)
+        yield np.asarray(data[start:stop], dtype=np.float32), slice(rows.start - start, rows.stop - start)
+
+def _gradient_magnitude(slab: np.ndarray, inner: slice) -> np.ndarray:
+    """Central differences (one-sided at the volume's faces) of a slab, without its halo."""
+    if min(slab.shape) < 2:
+        return np.zeros_like(slab[inner])
+    gx, gy, gz = np.gradient(slab)
+    return np.sqrt(gx[inner] ** 2 + gy[inner] ** 2 + gz[inner] ** 2)
+
+def volume_statistics(data, bins: int = HISTOGRAM_BINS) -> dict:
+    """Compute a volume's value range and histogram and the range and histogram of its gradient magnitude, e.g. for
+    picking transfer functions. Works through the volume in slabs, so memory-mapped volumes are never loaded at once.
+
+    Args:
+        data: The volume, indexed [x, y, z].
+        bins (int, optional): The number of histogram bins. Defaults to HISTOGRAM_BINS.
+
+    Returns:
+        dict: The "range" and "gradient_range" as [min, max] and the "histogram" and "gradient_histogram" counts, over
+            bins of equal width within the ranges.
+    """
+    low, high, gradient_high = np.inf, -np.inf, 0.0
+    for slab, inner in _slabs(data): # ranges first, so the histograms can have fixed bins
+        values = slab[inner]
+        low, high = min(low, float(values.min())), max(high, float(values.max()))
+        gradient_high = max(gradient_high, float(_gradient_magnitude(slab, inner).max()))
+
+    histogram = np.zeros(bins, dtype=np.int64)
+    gradient_histogram = np.zeros(bins, dtype=np.int64)
+    for slab, inner in _slabs(data):
+        histogram += np.histogram(slab[inner], bins=bins, range=(low, high if high > low else low + 1))[0]
+        gradient_histogram += np.histogram(_gradient_magnitude(slab, inner), bins=bins, range=(0.0, gradient_high or 1.0))[0]
+
+    return {
+        "range": [low, high],
+        "histogram": histogram.tolist(),
+        "gradient_range": [0.0, gradient_high],
+        "gradient_histogram": gradient_histogram.tolist()
+    }
@@ -2,6 +2,7 @@ from volum.objects.box import Box
 from volum.objects.sphere import Sphere
 from volum.objects.plane import Plane
 from volum.objects.transform import Transform
+from volum.objects.object_array import ObjectArray
 from volum.objects.cylinder import Cylinder
 from volum.objects.line import Line
 from volum.objects.point_light import PointLight
@@ -26,6 +27,7 @@ __all__ = [
     "Sphere",
     "Plane",
     "Transform",
+    "ObjectArray",
     "Cylinder",
     "Line",
     "PointLight",
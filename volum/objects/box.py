@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 class Box(SceneObject):
     """Represents a box in 3D space."""
@@ -27,10 +28,14 @@ class Box(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
+    def distance_to_many(self, points):
         half_extents = np.array([self.width, self.height, self.depth]) * 0.5
-        clamped = np.maximum(np.abs(point) - half_extents, 0) # distance along each axis
-        return np.linalg.norm(clamped)
-    
+        clamped = np.maximum(np.abs(as_points(points)) - half_extents, 0) # distance along each axis
+        return np.linalg.norm(clamped, axis=1)
+
+    def bounds(self):
+        half_extents = np.array([self.width, self.height, self.depth]) * 0.5
+        return -half_extents, half_extents
+
     def __repr__(self):
         return f"Box(width={self.width}, height={self.height}, depth={self.depth}"
\ No newline at end of file
@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 class Capsule(SceneObject):
     """Represents a capsule in 3D space."""
@@ -28,15 +29,19 @@ class Capsule(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
-        y = point[1]
-        xz_dist = np.linalg.norm(np.array(point)[[0, 2]])
+    def distance_to_many(self, points):
+        points = as_points(points)
+        xz_dist = np.hypot(points[:, 0], points[:, 2])
 
         # Compute radial and vertical distances
-        radial_dist = max(0, xz_dist - self.radius)
-        y_dist = max(0, abs(y) - self.height / 2)
+        radial_dist = np.maximum(0, xz_dist - self.radius)
+        y_dist = np.maximum(0, np.abs(points[:, 1]) - self.height / 2)
+
+        return np.hypot(radial_dist, y_dist)
+
+    def bounds(self):
+        extents = np.array([self.radius, self.height / 2 + self.radius, self.radius])
+        return -extents, extents
 
-        return np.linalg.norm(np.array([radial_dist, y_dist]))
-    
     def __repr__(self):
         return f"Capsule(radius={self.radius}, height={self.height}, cap_segments={self.cap_segments}, radial_segments={self.radial_segments}, material={self.material})"
\ No newline at end of file
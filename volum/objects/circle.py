@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 class Circle(SceneObject):
     """Represents a circle in 3D space."""
@@ -28,18 +29,18 @@ class Circle(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
-        px, py, pz = point
-        r_vec = np.array([px, 0, pz])
-        r_len = np.linalg.norm(r_vec)
+    def distance_to_many(self, points):
+        points = as_points(points)
+        r_len = np.hypot(points[:, 0], points[:, 1])
 
-        # Clamp to the circle's edge if outside
-        if r_len > self.radius:
-            r_vec = r_vec * (self.radius / r_len)
+        # The closest point is the projection onto the z = 0 plane (as the viewer's three.js CircleGeometry lies in),
+        # clamped to the circle's edge if outside
+        radial_dist = np.maximum(r_len - self.radius, 0)
+        return np.hypot(radial_dist, points[:, 2])
+
+    def bounds(self):
+        extents = np.array([self.radius, self.radius, 0])
+        return -extents, extents
 
-        closest = np.array([r_vec[0], 0, r_vec[2]])  # y = 0 plane
-        dist_vector = np.array([px, py, pz]) - closest
-        return np.linalg.norm(dist_vector)
-    
     def __repr__(self):
         return f"Circle(radius={self.radius}, segments={self.segments}, perimeter={self.perimeter}, perimeter_start={self.perimeter_start}, material={self.material})"
\ No newline at end of file
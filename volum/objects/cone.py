@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 class Cone(SceneObject):
     """Represents a cone in 3D space."""
@@ -51,49 +52,28 @@ class Cone(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
-        px, py, pz = point
-        r_xz = np.sqrt(px**2 + pz**2)
-        p = np.array([px, py, pz])
+    def distance_to_many(self, points):
+        # Centred like the viewer's three.js ConeGeometry: the apex is at y = height / 2 and the base (a disk) at
+        # y = -height / 2. py is measured downwards from the apex.
+        points = as_points(points)
+        r_xz = np.hypot(points[:, 0], points[:, 2])
+        py = self.height / 2 - points[:, 1]
+        slope = self.radius / self.height
 
-        # 1. Distance to lateral surface
-
-        # Project point onto axis-aligned infinite cone
-        # Represent point in (r, y) space
-        q = np.array([r_xz, py])
-        cone_dir = np.array([self.sin_theta, -self.cos_theta])  # outward normal of infinite cone
-        signed_dist_to_cone = np.dot(q, cone_dir)
-
-        # Closest point direction in xz-plane (radial)
-        if r_xz != 0:
-            radial_dir = np.array([px / r_xz, pz / r_xz])
-        else:
-            radial_dir = np.array([1.0, 0.0])  # arbitrary
-
-        # Find point on the infinite cone surface in 3D
-        # Let y' be the closest y along the cone's slope
-        y_proj = (py - r_xz * self.radius / self.height) / (1 + (self.radius / self.height)**2)
+        # 1. Distance to the lateral surface, i.e. the segment from the apex (0, 0) to the base edge (radius, height) in (r, y) space
+        y_proj = (py + r_xz * slope) / (1 + slope**2)
         y_clamped = np.clip(y_proj, 0, self.height)
-        r_proj = self.radius * y_clamped / self.height
-        closest_lateral = np.array([
-            r_proj * radial_dir[0],
-            r_proj * radial_dir[1],
-            y_clamped
-        ])
-        dist_lateral = np.linalg.norm(p - closest_lateral)
+        dist_lateral = np.hypot(r_xz - slope * y_clamped, py - y_clamped)
+        if self.open_ended:
+            return dist_lateral
 
-        # 2. Distance to base (disk at y = height)
-        dy_base = py - self.height
-        if r_xz <= self.radius:
-            dist_base = abs(dy_base)
-        else:
-            dist_base = np.sqrt((r_xz - self.radius)**2 + dy_base**2)
+        # 2. Distance to base (disk at py = height)
+        dist_base = np.hypot(np.maximum(r_xz - self.radius, 0), py - self.height)
 
-        # 3. Distance to apex (optional)
-        dist_apex = np.linalg.norm(p)
+        return np.minimum(dist_lateral, dist_base)
+
+    def bounds(self):
+        return np.array([-self.radius, -self.height / 2, -self.radius]), np.array([self.radius, self.height / 2, self.radius])
 
-        # Final result
-        return min(dist_lateral, dist_base, dist_apex)
-    
     def __repr__(self):
         return f"Cone(radius={self.radius}, height={self.height}, radial_segments={self.radial_segments}, open_ended={self.open_ended}, theta_length={self.theta_length}, theta_start={self.theta_start}, material={self.material})"
\ No newline at end of file
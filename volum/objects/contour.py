@@ -2,6 +2,9 @@ import numpy as np
 from typing import Optional, Union, List
 from volum.core.scene import SceneObject
 from volum.core.materials import BasicMaterial, MeshMaterial
+from volum.core.buffers import pack_array, packing_mode
+from volum.core.isosurface import surface_nets, quantize_positions
+from volum.core.bricks import BRICK_SIZE, POOLING_METHODS, downsample, pyramid_shapes, brick_counts, brick_box
 from volum.objects.cone import Cone
 
 class Contour(SceneObject):
@@ -9,8 +12,11 @@ class Contour(SceneObject):
 
     color_schemes = ["viridis", "magma", "plasma", "inferno", "cividis"]
     colormaps = ["x", "y", "z"]
+    pyramid_methods = POOLING_METHODS
+    _untracked_attributes = frozenset({"_surface_cache", "_pyramid_cache"}) # extracting isosurfaces or downsampling is no change
 
-    def __init__(self, *args: Union[np.ndarray, List[float]], levels: Optional[list[float]] = [0], material: Optional[MeshMaterial] = None, **kwargs):
+    def __init__(self, *args: Union[np.ndarray, List[float]], levels: Optional[list[float]] = [0], material: Optional[MeshMaterial] = None, precompute: bool = False,
+                 pyramid: Optional[str] = None, brick_size: int = BRICK_SIZE, **kwargs):
         """Contour plot constructor with flexible input handling.
 
         Call signature:
@@ -29,6 +35,12 @@ class Contour(SceneObject):
 
             levels: List of contour levels to draw. If empty, the contour will be drawn at the minimum and maximum values of W.
             material: Material to use for the contour. Defaults to BasicMaterial with wireframe disabled.
+            precompute: Extract the isosurfaces on the server (3D fields only) and send them to the viewer as indexed
+                meshes with quantized positions, instead of the scalar field. See isosurface().
+            pyramid: Downsample the field into a multi-resolution pyramid ('mean' or 'max' pooling). The viewer then
+                loads the coarsest level as a preview and refines the bricks in view, see pyramid_level() and brick().
+                None sends the full field.
+            brick_size: Edge length of the bricks the pyramid levels are served in.
         """
 
         assert args, "At least one argument is required for Contour"
@@ -92,6 +104,18 @@ class Contour(SceneObject):
         else:
             self._bounds = [0, 0, 0, 1, 1, 1] # default bounds if no points are provided
 
+        self._precompute = bool(precompute)
+        if self._precompute and len(self.grid_shape()) != 3:
+            raise ValueError(f"Contour can only precompute isosurfaces of 3D fields, got shape {self.grid_shape()}")
+        if pyramid is not None and pyramid not in Contour.pyramid_methods:
+            raise ValueError(f"pyramid must be one of {Contour.pyramid_methods} or None")
+        if pyramid is not None and self._precompute:
+            raise ValueError("Contour can either precompute isosurfaces or stream a pyramid, not both")
+        if not isinstance(brick_size, int) or brick_size < 2:
+            raise ValueError("brick_size must be an integer of at least 2")
+        self._pyramid = pyramid
+        self._brick_size = brick_size
+
         super().__init__(material=material, **kwargs) # No material, since the target object has it's own
 
 
@@ -120,17 +144,109 @@ class Contour(SceneObject):
         """Set the title of the quiver plot."""
         self._title = value
 
-    def to_dict(self):
-        # first, format the scalar field values to be x-fastest (row-major) order, depending on the shape
-        if np.asarray(self.values).ndim == 3:  # X, Y, Z meshgrid
-            values = self.values.transpose(2, 1, 0).flatten().astype(np.float32).tolist()
-        elif np.asarray(self.values).ndim == 2:  # X, Y meshgrid
-            values = self.values.flatten().astype(np.float32).tolist()
-        else:  # Single-dimensional or other cases
-            values = self.values.tolist()
+    def grid_shape(self) -> tuple:
+        """Get the shape of the scalar field's sample grid, (nx, ny[, nz])."""
+        values = np.asarray(self.values)
+        if values.ndim >= 2:
+            return tuple(values.shape)
+        if self.shape is not None:
+            return tuple(int(n) for n in self.shape)
+        side = int(round(len(values) ** (1/3)))
+        return (side, side, side)
+
+    def grid(self) -> np.ndarray:
+        """Get the scalar field as 2D or 3D array, indexed [x, y(, z)].
+
+        Raises:
+            ValueError: If the field is not 2D or 3D or doesn't match its shape.
+
+        Returns:
+            np.ndarray: The scalar field.
+        """
+        values, shape = np.asarray(self.values), self.grid_shape()
+        if len(shape) not in (2, 3) or values.size != np.prod(shape):
+            raise ValueError(f"Contour field of {values.size} values doesn't match the shape {shape}")
+        if values.ndim == len(shape):
+            return values
+        return values.reshape(shape[::-1]).transpose() # flat values are x-fastest
+
+    def pyramid_level(self, level: int) -> np.ndarray:
+        """Get a level of the field's pyramid, each level halves the previous one. Levels are computed on first use
+        and cached until the contour changes.
+
+        Args:
+            level (int): The level, 0 is the full field.
+
+        Raises:
+            ValueError: If the level doesn't exist.
+
+        Returns:
+            np.ndarray: The field at that level, indexed [x, y(, z)].
+        """
+        shapes = pyramid_shapes(self.grid_shape(), self._brick_size)
+        if not 0 <= level < len(shapes):
+            raise ValueError(f"Contour has no pyramid level {level}, expected 0 to {len(shapes) - 1}")
+
+        key = (self._version, self._pyramid)
+        cached = getattr(self, "_pyramid_cache", None)
+        if cached is None or cached[0] != key:
+            cached = (key, [self.grid()])
+            self._pyramid_cache = cached
+        fields = cached[1]
+        while len(fields) <= level:
+            fields.append(downsample(fields[-1], self._pyramid or "mean"))
+        return fields[level]
+
+    def brick(self, level: int, index: tuple) -> np.ndarray:
+        """Get a brick of a pyramid level, i.e. a sub-box of brick_size samples per axis (plus one overlapping sample).
+
+        Args:
+            level (int): The pyramid level.
+            index (tuple): The brick index along each axis.
+
+        Raises:
+            ValueError: If the level or brick doesn't exist.
+
+        Returns:
+            np.ndarray: The brick's values as float32, indexed [x, y(, z)].
+        """
+        field = self.pyramid_level(level)
+        return np.asarray(field[brick_box(field.shape, index, self._brick_size)], dtype=np.float32)
+
+    def pyramid_dict(self) -> dict:
+        """Describe the pyramid, i.e. the pooling method, the brick size and per level its shape and brick counts."""
+        shapes = pyramid_shapes(self.grid_shape(), self._brick_size)
         return {
+            "method": self._pyramid,
+            "brick_size": self._brick_size,
+            "shapes": [list(shape) for shape in shapes],
+            "bricks": [list(brick_counts(shape, self._brick_size)) for shape in shapes]
+        }
+
+    def isosurface(self, level: float) -> tuple:
+        """Extract the isosurface of a level, cached until the contour changes.
+
+        Args:
+            level (float): The iso value.
+
+        Returns:
+            tuple: The vertex positions, quantized to uint16 within the grid (see quantize_positions), of shape (V, 3),
+                and the triangles' vertex indices, of shape (T, 3).
+        """
+        cached = getattr(self, "_surface_cache", None)
+        if cached is None or cached[0] != self._version:
+            cached = (self._version, {})
+            self._surface_cache = cached
+        if level not in cached[1]:
+            field = self.grid()
+            vertices, triangles = surface_nets(field, level)
+            index_type = np.uint16 if len(vertices) <= np.iinfo(np.uint16).max else np.uint32
+            cached[1][level] = (quantize_positions(vertices, field.shape), triangles.astype(index_type))
+        return cached[1][level]
+
+    def to_dict(self):
+        data = {
             "type": "Contour",
-            "args": (self.points.flatten().tolist(), values), # row-major (x-fastest) order for the values, to enable direct use in JS DataTexture
             "levels": self.levels,
             "material": self.material.to_dict() if self.material else None,
             "colormap": self.colormap,
@@ -138,3 +254,39 @@ class Contour(SceneObject):
             "bounds": list(self._bounds),
             "shape": self.shape
         }
+        if self._precompute:
+            data.update({"precompute": True, "shape": list(self.grid_shape())})
+            if packing_mode() == "binary": # the viewer only needs the surfaces, saved scenes keep the field
+                surfaces = []
+                for level in self.levels:
+                    positions, triangles = self.isosurface(level)
+                    surfaces.append({
+                        "level": level,
+                        "positions": pack_array(positions.ravel(), dtype=np.uint16),
+                        "indices": pack_array(triangles.ravel(), dtype=triangles.dtype)
+                    })
+                data.update({"args": ([], []), "surfaces": surfaces})
+                return data
+
+        if self._pyramid is not None:
+            data.update({"pyramid": self._pyramid, "brick_size": self._brick_size, "shape": list(self.grid_shape())})
+            if packing_mode() == "binary": # the viewer starts with the coarsest level and fetches bricks as needed
+                pyramid = self.pyramid_dict()
+                preview = self.pyramid_level(len(pyramid["shapes"]) - 1)
+                data.update({
+                    "args": ([], pack_array(preview.transpose().ravel())), # x-fastest
+                    "shape": list(preview.shape),
+                    "pyramid": pyramid
+                })
+                return data
+
+
+        # first, format the scalar field values to be x-fastest (row-major) order, depending on the shape
+        if np.asarray(self.values).ndim == 3:  # X, Y, Z meshgrid
+            values = self.values.transpose(2, 1, 0).flatten().astype(np.float32)
+        elif np.asarray(self.values).ndim == 2:  # X, Y meshgrid
+            values = self.values.flatten().astype(np.float32)
+        else:  # Single-dimensional or other cases
+            values = self.values
+        data["args"] = (pack_array(self.points.ravel()), pack_array(values)) # row-major (x-fastest) order for the values, to enable direct use in JS DataTexture
+        return data
@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 class Cylinder(SceneObject):
     """Represents a cylinder object in the scene."""
@@ -36,9 +37,10 @@ class Cylinder(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
-        y = point[1]
-        xz_dist = np.linalg.norm(np.array(point)[[0, 2]])
+    def distance_to_many(self, points):
+        points = as_points(points)
+        y = points[:, 1]
+        xz_dist = np.hypot(points[:, 0], points[:, 2])
 
         # Clamp Y to the height range
         y_clamped = np.clip(y, -self.height / 2, self.height / 2)
@@ -48,10 +50,15 @@ class Cylinder(SceneObject):
         r_at_y = self.radius_bottom + (self.radius_top - self.radius_bottom) * t
 
         # Compute radial and vertical distances
-        radial_dist = max(0, xz_dist - r_at_y)
-        y_dist = max(0, abs(y) - self.height / 2)
+        radial_dist = np.maximum(0, xz_dist - r_at_y)
+        y_dist = np.maximum(0, np.abs(y) - self.height / 2)
 
-        return np.linalg.norm([radial_dist, y_dist])
+        return np.hypot(radial_dist, y_dist)
+
+    def bounds(self):
+        radius = max(self.radius_top, self.radius_bottom)
+        extents = np.array([radius, self.height / 2, radius])
+        return -extents, extents
 
     def __repr__(self):
         return f"Cylinder(radius_top={self.radius_top}, radius_bottom={self.radius_bottom}, height={self.height}, radial_segments={self.radial_segments}, material={self.material})"
\ No newline at end of file
@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 class Dodecahedron(SceneObject):
     """Represents a dodecahedron in 3D space."""
@@ -32,11 +33,12 @@ class Dodecahedron(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
+    def distance_to_many(self, points):
         """Only using a sphere as a bounding volume for distance calculation."""
-        x, y, z = point
-        r = np.sqrt(x**2 + y**2 + z**2)
-        return abs(r - self.radius)
-    
+        return np.abs(np.linalg.norm(as_points(points), axis=1) - self.radius)
+
+    def bounds(self):
+        return np.full(3, -self.radius), np.full(3, self.radius)
+
     def __repr__(self):
         return f"Dodecahedron(radius={self.radius}, material={self.material})"
\ No newline at end of file
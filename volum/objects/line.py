@@ -2,9 +2,18 @@ import numpy as np
 from typing import Union, List, Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import LineMaterial, LineBasicMaterial, LineDashedMaterial
+from volum.core.buffers import pack_array
+from volum.core.geometry import as_points, chunks
+from volum.core.spatial import BVH
+
+
+# Polylines with at least this many segments use a segment index for distance queries by default
+INDEX_MIN_SEGMENTS = 1 << 14
 
 class Line(SceneObject):
     """Represents a polyline in space."""
+    _untracked_attributes = frozenset({"_segment_index"}) # building the index is no change
+
     def __init__(self, *pts: Union[List, np.ndarray], material: Optional[LineMaterial]=None, **kwargs):
         """Initialize the Line.
 
@@ -45,51 +54,88 @@ class Line(SceneObject):
         self.points = points
 
     def __len__(self):
-        """Calculate the length of the line (polyline through ordered points)."""
-        total = 0.0
-        for i in range(len(self.points) - 1):
-            p1 = self.points[i]
-            p2 = self.points[i + 1]
-
-            if not all(isinstance(coord, (int, float)) for coord in p1 + p2):
-                raise ValueError("All coordinates must be numeric.")
-
-            # Euclidean distance between p1 and p2
-            dist = sum((p2[j] - p1[j]) ** 2 for j in range(len(p1))) ** 0.5
-            total += dist
+        """The number of points. See length() for the length of the line."""
+        return len(self.points)
 
-        return total
+    def length(self) -> float:
+        """Calculate the length of the line (polyline through ordered points)."""
+        points = np.asarray(self.points, dtype=float)
+        if len(points) < 2:
+            return 0.0
+        return float(np.sum(np.linalg.norm(np.diff(points, axis=0), axis=1)))
 
     def to_dict(self):
         return {
             "type": "Line",
-            "args": [self.points.tolist()],
+            "args": [pack_array(self.points)],
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
-        point = np.array(point)
-        min_distance = float('inf')
-
-        for i in range(len(self.points) - 1):
-            A = np.array(self.points[i])
-            B = np.array(self.points[i + 1])
-            AB = B - A
-            AP = point - A
-
-            ab_len_squared = np.dot(AB, AB)
-            if ab_len_squared == 0:
-                # A and B are the same point
-                dist = np.linalg.norm(AP)
-            else:
-                t = np.dot(AP, AB) / ab_len_squared
-                t = np.clip(t, 0, 1)
-                closest_point = A + t * AB
-                dist = np.linalg.norm(point - closest_point)
-
-            min_distance = min(min_distance, float(dist))
-
-        return min_distance
+    def distance_to_many(self, points, use_index: Optional[bool] = None):
+        """Compute the distances of points to the polyline.
+
+        Args:
+            points: The query point(s), of shape (D,) or (N, D) for a line of D-dimensional points.
+            use_index (Optional[bool], optional): Query a bounding volume hierarchy over the segments instead of
+                testing all segments, built on first use. Defaults to lines with at least INDEX_MIN_SEGMENTS segments.
+
+        Returns:
+            np.ndarray: The distances, inf if the line has less than two points.
+        """
+        points = as_points(points, dim=self.points.shape[1])
+        if len(self.points) < 2:
+            return np.full(len(points), np.inf)
+
+        if use_index is None:
+            use_index = len(self.points) > INDEX_MIN_SEGMENTS
+        if use_index and points.shape[1] <= 3:
+            index, start, direction, inverse_len_sq = self._indexed_segments()
+            padded = np.zeros((len(points), 3))
+            padded[:, :points.shape[1]] = points # the index is 3D, lower dimensional lines lie in z = 0
+            nearest = lambda items, point: np.sqrt(_segment_distances_sq(point[None, :], start[items], direction[items], inverse_len_sq[items])[0])
+            return np.array([index.nearest(point, nearest)[1] for point in padded])
+
+        start, direction, inverse_len_sq = _segments(self.points)
+        distances = np.empty(len(points))
+        for rows in chunks(len(points), len(start)):
+            distances[rows] = np.sqrt(_segment_distances_sq(points[rows], start, direction, inverse_len_sq).min(axis=1))
+        return distances
+
+    def _indexed_segments(self):
+        """Get the (cached) segment index and the segments, padded to 3D."""
+        cached = getattr(self, "_segment_index", None)
+        if cached is None or cached[0] != self._version:
+            points = np.zeros((len(self.points), 3))
+            points[:, :self.points.shape[1]] = self.points
+            start, direction, inverse_len_sq = _segments(points)
+            end = start + direction
+            index = BVH(np.minimum(start, end), np.maximum(start, end), leaf_size=16)
+            cached = (self._version, index, start, direction, inverse_len_sq)
+            self._segment_index = cached
+        return cached[1:]
+
+    def bounds(self):
+        points = np.asarray(self.points, dtype=float)
+        if points.ndim != 2 or points.shape[1] != 3 or len(points) == 0:
+            return None
+        return points.min(axis=0), points.max(axis=0)
 
     def __repr__(self):
-        return f"Line(points={self.points}, material={self.material})"
\ No newline at end of file
+        return f"Line(points={self.points}, material={self.material})"
+
+
+def _segments(points: np.ndarray):
+    """Get the start points, directions and inverse squared lengths (0 for degenerate ones) of a polyline's segments."""
+    points = np.asarray(points, dtype=float)
+    direction = np.diff(points, axis=0)
+    len_sq = np.einsum("sd,sd->s", direction, direction)
+    with np.errstate(divide="ignore"):
+        inverse_len_sq = np.where(len_sq > 0, 1 / len_sq, 0) # start and end are the same point, t is 0 then
+    return points[:-1], direction, inverse_len_sq
+
+def _segment_distances_sq(points: np.ndarray, start: np.ndarray, direction: np.ndarray, inverse_len_sq: np.ndarray) -> np.ndarray:
+    """Compute the squared distances of all points (N, D) to all segments (S, D) at once, of shape (N, S)."""
+    offset = points[:, None, :] - start[None, :, :]
+    t = np.clip(np.einsum("nsd,sd->ns", offset, direction) * inverse_len_sq, 0, 1)
+    offset -= t[..., None] * direction # offset to the closest point on the segment
+    return np.einsum("nsd,nsd->ns", offset, offset)
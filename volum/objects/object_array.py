@@ -0,0 +1,139 @@
+import numpy as np
+from typing import List, Optional, Union
+from volum.core.scene import SceneObject
+from volum.core.buffers import pack_array
+from volum.core.geometry import as_points, chunks, transformed_distances
+from volum.core.spatial import BVH
+from volum.objects.transform import _rotation_matrices
+
+
+class ObjectArray(SceneObject):
+    """Represents many instances of one object (e.g. thousands of spheres), rendered as a single instanced mesh."""
+    _untracked_attributes = frozenset({"_instance_cache"}) # cached matrices and index are no change
+
+    def __init__(self, object: SceneObject, positions: Union[np.ndarray, List[List[float]]], rotations: Optional[Union[np.ndarray, List[List[float]]]] = None,
+                 scales: Optional[Union[np.ndarray, List[float], List[List[float]]]] = None, colors: Optional[Union[np.ndarray, List[List[float]]]] = None, **kwargs):
+        """Place copies of an object, each with its own position, rotation, scale and (optionally) color.
+
+        Args:
+            object (SceneObject): The object to instance, its material is shared by all instances.
+            positions (Union[np.ndarray, List[List[float]]]): The instance positions, of shape (N, 3).
+            rotations (Optional[Union[np.ndarray, List[List[float]]]], optional): The instance rotations as Euler angles in degrees (XYZ order, as Transform), of shape (N, 3). Defaults to None.
+            scales (Optional[Union[np.ndarray, List[float], List[List[float]]]], optional): The instance scales, of shape (N, 3) or (N,) for uniform scales. Defaults to None.
+            colors (Optional[Union[np.ndarray, List[List[float]]]], optional): The instance colors as RGB, of shape (N, 3), floats in [0, 1] or integers in [0, 255]. Defaults to None.
+
+        Raises:
+            TypeError: If the object is not a SceneObject.
+            ValueError: If the arrays don't have N rows of the expected shape.
+        """
+
+        if not isinstance(object, SceneObject):
+            raise TypeError(f"{object} is not a SceneObject.")
+
+        positions = as_points(positions)
+        count = len(positions)
+
+        if rotations is None:
+            rotations = np.zeros((count, 3))
+        rotations = as_points(rotations)
+
+        if scales is None:
+            scales = np.ones((count, 3))
+        scales = np.asarray(scales, dtype=float)
+        if scales.ndim == 1:
+            scales = np.repeat(scales[:, None], 3, axis=1) # uniform scales
+        scales = as_points(scales)
+
+        if colors is not None:
+            colors = np.asarray(colors)
+            if not np.issubdtype(colors.dtype, np.integer):
+                colors = np.round(np.clip(colors, 0, 1) * 255)
+            colors = np.clip(colors, 0, 255).astype(np.uint8)
+            if colors.shape != (count, 3):
+                raise ValueError(f"Expected colors of shape ({count}, 3), got {colors.shape}")
+
+        if len(rotations) != count or len(scales) != count:
+            raise ValueError(f"Expected {count} rotations and scales, got {len(rotations)} and {len(scales)}")
+
+        super().__init__(material=object.material, **kwargs)
+        self.object = object
+        self.positions = positions
+        self.rotations = rotations
+        self.scales = scales
+        self.colors = colors
+
+    def __len__(self):
+        return len(self.positions)
+
+    def to_dict(self):
+        return {
+            "type": "ObjectArray",
+            "object": self.object.to_dict(),
+            "positions": pack_array(self.positions),
+            "rotations": pack_array(self.rotations),
+            "scales": pack_array(self.scales),
+            "colors": pack_array(self.colors, dtype=np.uint8) if self.colors is not None else None
+        }
+
+    def _instances(self):
+        """Get the (cached) instance matrices, their inverses, the instance bounds and their index."""
+        key = (self._version, self.object.revision())
+        cached = getattr(self, "_instance_cache", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        R = _rotation_matrices(np.radians(self.rotations))
+        matrices = R * self.scales[:, None, :] # R @ diag(scale)
+        inverse_scales = np.divide(1, self.scales, out=np.zeros_like(self.scales), where=self.scales != 0)
+        inverses = inverse_scales[:, :, None] * R.transpose(0, 2, 1) # diag(1 / scale) @ R^-1
+
+        lower, upper, index = None, None, None
+        local_bounds = self.object.bounds()
+        if local_bounds is not None:
+            corners = np.array([[x, y, z] for x in (local_bounds[0][0], local_bounds[1][0]) for y in (local_bounds[0][1], local_bounds[1][1]) for z in (local_bounds[0][2], local_bounds[1][2])])
+            corners = np.einsum("nij,cj->nci", matrices, corners) + self.positions[:, None, :]
+            lower, upper = corners.min(axis=1), corners.max(axis=1)
+            index = BVH(lower, upper)
+
+        instances = (matrices, inverses, lower, upper, index)
+        self._instance_cache = (key, instances)
+        return instances
+
+    def _local_distances(self, items: np.ndarray, point: np.ndarray) -> np.ndarray:
+        """Distances of a point to the given instances, each computed in the instance's local space."""
+        matrices, inverses, _, _, _ = self._instances()
+        local = np.einsum("nij,nj->ni", inverses[items], point - self.positions[items])
+        return transformed_distances(self.object.distance_to_many, matrices[items], local, self.object.distance_to_many(local))
+
+    def distance_to_many(self, points):
+        points = as_points(points)
+        distances = np.full(len(points), np.inf)
+        if not len(self):
+            return distances
+
+        matrices, inverses, _, _, index = self._instances()
+        if index is not None:
+            for i, point in enumerate(points):
+                distances[i] = index.nearest(point, self._local_distances)[1]
+            return distances
+
+        # without bounds, test every instance
+        for rows in chunks(len(points), len(self)):
+            offsets = points[rows, None, :] - self.positions[None, :, :]
+            local = np.einsum("nij,pnj->pni", inverses, offsets).reshape(-1, 3)
+            linear = np.broadcast_to(matrices, (len(offsets),) + matrices.shape).reshape(-1, 3, 3)
+            local_distances = transformed_distances(self.object.distance_to_many, linear, local, self.object.distance_to_many(local))
+            distances[rows] = np.min(local_distances.reshape(len(offsets), len(self)), axis=1)
+        return distances
+
+    def bounds(self):
+        _, _, lower, upper, _ = self._instances()
+        if lower is None or not len(self):
+            return None
+        return lower.min(axis=0), upper.max(axis=0)
+
+    def prepare(self):
+        self.object.prepare()
+
+    def __repr__(self):
+        return f"ObjectArray(object={self.object}, count={len(self)})"
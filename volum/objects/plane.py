@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 
 class Plane(SceneObject):
@@ -25,18 +26,19 @@ class Plane(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
+    def distance_to_many(self, points):
         half_w = self.width / 2
-        half_d = self.height / 2
+        half_h = self.height / 2
 
-        px, py, pz = point
-        clamped_x = np.clip(px, -half_w, half_w)
-        clamped_z = np.clip(pz, -half_d, half_d)
+        points = as_points(points)
+        # Offset from the closest point on the rectangle, which lies in the z = 0 plane like the viewer's three.js PlaneGeometry
+        dx = points[:, 0] - np.clip(points[:, 0], -half_w, half_w)
+        dy = points[:, 1] - np.clip(points[:, 1], -half_h, half_h)
+        return np.sqrt(dx**2 + dy**2 + points[:, 2]**2)
+
+    def bounds(self):
+        extents = np.array([self.width / 2, self.height / 2, 0])
+        return -extents, extents
 
-        # Closest point on the rectangle in local space
-        closest = np.array([clamped_x, 0.0, clamped_z])
-        dist_vector = np.array([px, py, pz]) - closest
-        return np.linalg.norm(dist_vector)
-    
     def __repr__(self):
         return f"Plane(width={self.width}, height={self.height}, material={self.material})"
\ No newline at end of file
@@ -1,19 +1,322 @@
-import base64, io
+import os, base64, io, hashlib, pickle, threading, types
+import numpy as np
+import multiprocessing as mp
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
 from matplotlib import figure
-from typing import Optional
+from matplotlib.cbook import CallbackRegistry
+from matplotlib.transforms import TransformNode
+from typing import Any, Optional
 from volum.core.scene import SceneObject
+from volum.config.runtime import runtime_config
+
+
+# Resolution plots are rasterized at
+RENDER_DPI = 300
+# Size bounds of the rendered plots kept in memory and on disk, see PlotCache
+PLOT_CACHE_BYTES = 64 * 2**20
+PLOT_CACHE_DISK_BYTES = 512 * 2**20
+
+
+def figure_fingerprint(plot: figure.Figure, width: float, height: float, dpi: int = RENDER_DPI) -> str:
+    """Compute a content hash of a figure, i.e. of the data and properties of all its artists, and the render size.
+
+    The figure's object graph is hashed the way it is pickled (which is what the renders work from), by value and
+    in a fixed order. Hashes are stable across processes, so they can key rendered plots on disk, but drawing a
+    figure changes some of its internal state (e.g. its ticks) and thus its hash.
+
+    Args:
+        plot (figure.Figure): The figure.
+        width (float): The width in inches.
+        height (float): The height in inches.
+        dpi (int, optional): The resolution. Defaults to RENDER_DPI.
+
+    Returns:
+        str: The hex digest.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{width!r}:{height!r}:{dpi!r};".encode())
+    refs = {}
+    visited = [] # keeps temporary states alive, so their ids aren't reused
+    stack = [plot]
+    while stack:
+        value = stack.pop()
+        if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+            hasher.update(f"{type(value).__name__}:{value!r};".encode())
+            continue
+        if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType, types.ModuleType)):
+            hasher.update(f"global:{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', value.__name__)};".encode())
+            continue
+        if isinstance(value, tuple): # by value, whether equal tuples are shared says nothing about the figure
+            hasher.update(f"tuple:{len(value)};".encode())
+            stack.extend(reversed(value))
+            continue
+        if id(value) in refs: # shared and cyclic references, numbered in the order they are met
+            hasher.update(f"ref:{refs[id(value)]};".encode())
+            continue
+        refs[id(value)] = len(refs)
+        visited.append(value)
+
+        if isinstance(value, np.ndarray):
+            hasher.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+            if value.dtype.hasobject:
+                stack.extend(reversed(value.ravel().tolist()))
+            else:
+                hasher.update(np.ascontiguousarray(np.ma.getdata(value)).data)
+                if np.ma.isMaskedArray(value):
+                    hasher.update(np.ascontiguousarray(np.ma.getmaskarray(value)).data)
+        elif isinstance(value, list):
+            hasher.update(f"list:{len(value)};".encode())
+            stack.extend(reversed(value))
+        elif isinstance(value, dict):
+            hasher.update(f"dict:{len(value)};".encode())
+            for key in sorted(value, key=repr, reverse=True):
+                stack.extend((value[key], key))
+        elif isinstance(value, (set, frozenset)): # e.g. of artists, whose order only depends on their ids
+            hasher.update(f"{type(value).__name__}:{sorted(type(item).__name__ for item in value)};".encode())
+        else:
+            state = _figure_state(value)
+            hasher.update(f"{type(value).__module__}.{type(value).__qualname__}{{".encode())
+            stack.append(state)
+    return hasher.hexdigest()
+
+def _figure_state(value: Any) -> Any:
+    """Get the state an object of a figure is pickled with, without state that differs between identical figures."""
+    if isinstance(value, CallbackRegistry): # connections and a counter advanced by pickling
+        return None
+    try:
+        reduced = value.__reduce_ex__(pickle.DEFAULT_PROTOCOL)
+    except Exception: # e.g. weak references, which pickling drops
+        return None
+    if isinstance(reduced, str):
+        return reduced
+    args, state = reduced[1], reduced[2] if len(reduced) > 2 else None
+    if isinstance(state, dict):
+        state = dict(state)
+        for key in ("number", "_number"): # the pyplot figure number
+            state.pop(key, None)
+        if isinstance(value, TransformNode): # keyed by id() and invalidated by drawing
+            state.pop("_parents", None)
+            state.pop("_invalid", None)
+    items = [list(reduced[i]) for i in (3, 4) if len(reduced) > i and reduced[i] is not None]
+    return (args, state, items)
+
+
+def render_figure(plot: figure.Figure, width: float, height: float, dpi: int = RENDER_DPI) -> str:
+    """Render a figure to a PNG image.
+
+    Args:
+        plot (figure.Figure): The figure.
+        width (float): The width in inches.
+        height (float): The height in inches.
+        dpi (int, optional): The resolution. Defaults to RENDER_DPI.
+
+    Returns:
+        str: The image as base64 data URI.
+    """
+    # Ensure plot has same aspect ratio as specified width and height
+    plot.set_size_inches(width, height, forward=True)
+    # Convert the plot to a PNG image in base64 format
+    buf = io.BytesIO()
+    plot.savefig(buf, format='png', bbox_inches='tight', dpi=dpi)
+    image_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
+    return f"data:image/png;base64,{image_base64}"
+
+def _render_pickled_figure(data: bytes, width: float, height: float, dpi: int) -> str:
+    """Render a pickled figure in a PlotRenderer process."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plot = pickle.loads(data)
+    try:
+        return render_figure(plot, width, height, dpi)
+    finally:
+        plt.close(plot) # unpickled pyplot figures are registered with pyplot again
+
+
+class PlotRenderer:
+    """Renders figures in a pool of worker processes, since matplotlib can't render from several threads at once.
+
+    The figures are pickled on submission, so later changes to a figure don't affect a pending render.
+    """
+    def __init__(self, max_workers: Optional[int] = None):
+        """Initialize the PlotRenderer. The processes are spawned lazily, on the first submit().
+
+        Args:
+            max_workers (Optional[int], optional): The number of renders running at once, 0 renders nothing in the
+                background. Defaults to None, i.e. runtime_config.render_workers.
+        """
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def workers(self) -> int:
+        """Get the number of worker processes."""
+        return runtime_config.render_workers if self.max_workers is None else self.max_workers
+
+    def submit(self, plot: figure.Figure, width: float, height: float, dpi: int = RENDER_DPI) -> Optional[Future]:
+        """Start rendering a figure in the background (see render_figure).
+
+        Returns:
+            Optional[Future]: The pending image, or None if the renderer has no workers or the figure can't be pickled.
+        """
+        if self.workers() < 1:
+            return None
+        try:
+            data = pickle.dumps(plot)
+        except Exception: # e.g. artists holding unpicklable callbacks, these render in-process
+            return None
+
+        with self._lock:
+            if self._executor is None:
+                # don't inherit the server's threads and event loop
+                self._executor = ProcessPoolExecutor(self.workers(), mp_context=mp.get_context("spawn"))
+            return self._executor.submit(_render_pickled_figure, data, width, height, dpi)
+
+    def shutdown(self):
+        """Shut down the worker processes, pending renders are cancelled."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+# Shared renderer of all PlotImages
+plot_renderer = PlotRenderer()
+
+
+class PlotCache:
+    """A least recently used cache of rendered plots, keyed by figure_fingerprint(), so plots re-render only when their
+    figure changed. With a directory, the images are also written there as PNG files and survive server restarts.
+    """
+    def __init__(self, max_bytes: int = PLOT_CACHE_BYTES, directory: Optional[str] = None, max_disk_bytes: int = PLOT_CACHE_DISK_BYTES):
+        """Initialize the PlotCache.
+
+        Args:
+            max_bytes (int, optional): The size bound of the images kept in memory. Defaults to PLOT_CACHE_BYTES.
+            directory (Optional[str], optional): The directory to persist the images in. Defaults to None, i.e.
+                runtime_config.plot_cache_dir (not persisted if that isn't set either).
+            max_disk_bytes (int, optional): The size bound of the images in the directory, the least recently used
+                are deleted first. Defaults to PLOT_CACHE_DISK_BYTES.
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def cache_dir(self) -> Optional[str]:
+        """Get the directory the images are persisted in, if any."""
+        directory = runtime_config.plot_cache_dir if self.directory is None else self.directory
+        return None if directory is None else str(directory)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a rendered plot.
+
+        Args:
+            key (str): The figure_fingerprint() of the plot.
+
+        Returns:
+            Optional[str]: The image as base64 data URI, or None if it isn't cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        path = self._path(key)
+        if path is None or not os.path.isfile(path):
+            return None
+        try:
+            with open(path, "rb") as file:
+                image = f"data:image/png;base64,{base64.b64encode(file.read()).decode('utf-8')}"
+            os.utime(path) # most recently used
+        except OSError: # e.g. deleted by another server in between
+            return None
+        self._store(key, image)
+        return image
+
+    def put(self, key: str, image: str):
+        """Cache a rendered plot, evicting the least recently used ones beyond the size bounds.
+
+        Args:
+            key (str): The figure_fingerprint() of the plot.
+            image (str): The image as base64 data URI.
+        """
+        self._store(key, image)
+        path = self._path(key)
+        if path is None or os.path.isfile(path):
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(base64.b64decode(image.split(",", 1)[1]))
+            os.replace(temp_path, path) # readers never see partial files
+            self._prune_disk(os.path.dirname(path))
+        except OSError:
+            pass # persisting is best effort, the image is cached in memory
+
+    def clear(self):
+        """Drop the images kept in memory, persisted images stay."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _store(self, key: str, image: str):
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = image
+            self._size += len(image)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                self._size -= len(self._entries.popitem(last=False)[1])
+
+    def _path(self, key: str) -> Optional[str]:
+        directory = self.cache_dir()
+        return None if directory is None else os.path.join(directory, f"{key}.png")
+
+    def _prune_disk(self, directory: str):
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".png") and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+# Shared cache of all PlotImages
+plot_cache = PlotCache()
+
+
+class _FigureChanges:
+    """A figure's stale_callback that counts its changes (matplotlib calls it for every change of an artist, whether
+    or not the figure is already stale) and forwards them to the previous callback, e.g. pyplot's interactive redraw.
+    Pickled figures drop it.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.count = 0
+
+    def __call__(self, artist, value):
+        self.count += 1
+        if self.callback is not None:
+            self.callback(artist, value)
+
 
 class PlotImage(SceneObject):
     """Represents a 2D plot image in the 3D scene."""
-    _figure_cache = {}
-
-    def __new__(cls, plot: Optional[figure.Figure] = None, **kwargs):
-        # Check if this figure is already in cache, reuse if so
-        if plot and plot.number in cls._figure_cache:
-            return cls._figure_cache[plot.number]
-        
-        instance = super().__new__(cls)
-        return instance
+    # rendering the image is no change, changes to the figure are tracked by revision()
+    _untracked_attributes = frozenset({"_image", "_render", "_key_cache"})
 
     def __init__(self, plot: figure.Figure, width: int = 5, height: int = 4, double_sided: bool = False):
         """Initialize the PlotImage.
@@ -28,20 +331,76 @@ class PlotImage(SceneObject):
         super().__init__(material=None) # PlotImage does not have a material
         self.plot = plot
         self._image = None  # placeholder
+        self._render = None # pending background render, see prepare()
+        self._key_cache = None
         self.width = width
         self.height = height
         self.double_sided = double_sided
 
-        # cache this instance
-        if plot and hasattr(plot, "number"):
-            self._figure_cache[plot.number] = self # type: ignore
-    
+    def figure_key(self) -> str:
+        """Get the figure_fingerprint() of the plot. It's recomputed only after matplotlib reported a change of the
+        figure (any change through its setters does, see _FigureChanges) or mark_dirty() was called, e.g. after changing
+        plotted arrays in place. The figure's stale flag is left to matplotlib.
+        """
+        changes = self.plot.stale_callback
+        if not isinstance(changes, _FigureChanges): # first use, or the callback was replaced or unpickled
+            changes = self.plot.stale_callback = _FigureChanges(changes)
+            self._key_cache = None
+        state = (self._version, changes.count)
+        cached = self._key_cache
+        if cached is None or cached[0] != state:
+            cached = self._key_cache = (state, figure_fingerprint(self.plot, self.width, self.height, RENDER_DPI))
+        return cached[1]
+
+    def revision(self) -> tuple:
+        return super().revision() + (self.figure_key(),)
+
     @property
     def image(self) -> Optional[str]:
-        """Get the image representation of the plot."""
-        if self._image is None:
-            self._image = self.plot_to_image_base64()
-        return self._image
+        """Get the image representation of the plot, waiting for its background render if one is pending. Plots are
+        rendered once per figure state, see PlotCache.
+        """
+        key = self.figure_key()
+        if self._image is not None and self._image[0] == key:
+            return self._image[1]
+
+        image = plot_cache.get(key)
+        render, self._render = self._render, None
+        if image is None and render is not None and render[0] == key:
+            try:
+                image = render[1].result()
+            except Exception: # e.g. a crashed worker, render in-process instead
+                pass
+        if image is None:
+            image = self.plot_to_image_base64()
+            plot_cache.put(key, image)
+            self._key_cache = None # drawing the figure changes its fingerprint, but not the image
+            key = self.figure_key()
+        plot_cache.put(key, image)
+        self._image = (key, image)
+        return image
+
+    def prepare(self):
+        """Start rendering the image in the background (see PlotRenderer), so serializing the scene only waits for it.
+        Scenes with many plots render runtime_config.render_workers of them at once, plots in the PlotCache not at all.
+        """
+        if self.plot is None:
+            return
+        key = self.figure_key()
+        if (self._image is not None and self._image[0] == key) or (self._render is not None and self._render[0] == key):
+            return
+        image = plot_cache.get(key)
+        if image is not None:
+            self._image = (key, image)
+            return
+        render = plot_renderer.submit(self.plot, self.width, self.height)
+        if render is not None:
+            self._render = (key, render)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_render"] = None # futures can't be pickled
+        return state
 
     @classmethod
     def from_dict(cls, data: dict) -> "PlotImage":
@@ -90,14 +449,7 @@ class PlotImage(SceneObject):
         }
     
     def plot_to_image_base64(self):
-        # Ensure plot has same aspect ratio as specified width and height
-        self.plot.set_size_inches(self.width, self.height, forward=True)
-        # Convert the plot to a PNG image in base64 format
-        buf = io.BytesIO()
-        self.plot.savefig(buf, format='png', bbox_inches='tight', dpi=300)
-        buf.seek(0)
-        image_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        return f"data:image/png;base64,{image_base64}"
+        return render_figure(self.plot, self.width, self.height)
     
     def plot_metadata(self):
         return {
@@ -1,5 +1,6 @@
 from numpy import linalg
 from volum.core.scene import SceneObject
+from volum.core.geometry import as_points
 
 class PointLight(SceneObject):
     """Represents a point light in 3D space."""
@@ -27,5 +28,5 @@ class PointLight(SceneObject):
             raise TypeError(f"Expected color to be a string, got {type(value)}")
         self._color = value
     
-    def distance_to(self, point):
-        return linalg.norm(point)
\ No newline at end of file
+    def distance_to_many(self, points):
+        return linalg.norm(as_points(points), axis=1)
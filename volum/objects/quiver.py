@@ -2,15 +2,25 @@ import numpy as np
 from typing import Optional, Union, List
 from volum.core.scene import SceneObject
 from volum.core.materials import MeshMaterial, StandardMaterial
+from volum.core.buffers import pack_array, packing_mode
+from volum.core.sampling import grid_sample, poisson_disk_sample
+from volum.core.colormaps import apply_colormap
 from volum.objects.cone import Cone
 
+
+# Each level of detail holds about this fraction of the arrows of the previous level
+LOD_RATIO = 4
+
 class Quiver(SceneObject):
     """Represents a 2D or 3D quiver plot in the 3D scene."""
 
     color_schemes = ["viridis", "magma", "plasma", "inferno", "cividis"]
     colormaps = ["magnitude", "x", "y", "z"]
+    lod_methods = ["grid", "poisson"]
+    _untracked_attributes = frozenset({"_lod_cache", "_magnitude_cache"}) # computing levels of detail or magnitudes is no change
 
-    def __init__(self, *args: Union[np.ndarray, List[float]], object: SceneObject = Cone(.1, .3, radial_segments=12), min_length: float = 1.0, max_length: float = 5.0, **kwargs):
+    def __init__(self, *args: Union[np.ndarray, List[float]], object: SceneObject = Cone(.1, .3, radial_segments=12), min_length: float = 1.0, max_length: float = 5.0,
+                 lod: Optional[str] = None, lod_levels: int = 4, lod_budget: int = 100_000, precompute: bool = False, **kwargs):
         """Quiver plot constructor with flexible input handling and support for various arrow objects.
     
         Args:
@@ -20,6 +30,8 @@ class Quiver(SceneObject):
 
                 or one array for points and vectors respectively {[X, Y, Z], [U, V, W]}.
 
+                Points and vectors are stored as float32 (N, 3) arrays, which are used as is (without a copy) if passed in.
+
                 Please keep in mind that the second position parameter is the "height" axis in volum.
                 
                 Also supports meshgrid inputs like X, Y = np.meshgrid(x, y).
@@ -27,6 +39,13 @@ class Quiver(SceneObject):
             colormap: Determines how colors are mapped to arrows. Options are 'magnitude' or 'height'.
             min_length: Minimum length of the arrows. (will override object's properties)
             max_length: Maximum length of the arrows. (will override object's properties)
+            lod: Downsampling method for levels of detail, 'grid' or 'poisson' (disk). Each level keeps about 1 / LOD_RATIO
+                of the arrows of the previous one, picked with a probability proportional to their magnitude. The viewer
+                loads the finest level within lod_budget arrows and switches levels by camera distance. None sends all arrows.
+            lod_levels: Number of levels of detail, including the full field.
+            lod_budget: Maximum number of arrows the viewer initially loads.
+            precompute: Compute the arrows' visual lengths (float16) and colors (uint8 RGB, with a colorscheme) on the
+                server instead of in each viewer, see instance_attributes().
         """
 
         if not isinstance(object, SceneObject):
@@ -39,56 +58,44 @@ class Quiver(SceneObject):
             raise ValueError("max_length must be a positive number")
         if min_length > max_length:
             raise ValueError("min_length must be less than or equal to max_length")
+        if lod is not None and lod not in Quiver.lod_methods:
+            raise ValueError(f"lod must be one of {Quiver.lod_methods} or None")
+        if not isinstance(lod_levels, int) or lod_levels < 1:
+            raise ValueError("lod_levels must be a positive integer")
+        if not isinstance(lod_budget, int) or lod_budget < 1:
+            raise ValueError("lod_budget must be a positive integer")
 
         assert args, "At least one argument is required for Quiver"
 
-        # Handle input cases
-        if len(args) == 6:  # [X, Y, Z, U, V, W]
-            X, Y, Z, U, V, W = map(np.asarray, args)
-            
+        # Handle input cases, points and vectors are stored as compact (N, 3) float32 arrays
+        if len(args) in (4, 6):  # [X, Y, U, V] or [X, Y, Z, U, V, W]
+            columns = [np.asarray(arg) for arg in args]
+
             # Validate shapes
-            if not (X.shape == Y.shape == Z.shape == U.shape == V.shape == W.shape):
+            if not all(column.shape == columns[0].shape for column in columns):
                 raise ValueError("All input arrays must have the same shape.")
-            
-            # Flatten arrays if they come from meshgrid
-            X, Y, Z, U, V, W = map(np.ravel, (X, Y, Z, U, V, W))
 
-            # Combine points and vectors
-            pts = np.stack((X, Y, Z), axis=-1)
-            vecs = np.stack((U, V, W), axis=-1)
-
-            # Store points and vectors
-            self.points = pts
-            self.vectors = vecs
+            # Fill the (possibly meshgrid) arrays straight into the output, instead of stacking and padding copies
+            half = len(columns) // 2
+            self.points = _stack_columns(columns[:half])
+            self.vectors = _stack_columns(columns[half:])
 
         elif len(args) == 2:
             shape = kwargs.get('shape', None)
-            if not shape:
-                self.points, self.vectors = map(np.asarray, args) # already stacked arrays (e.g. from builder)
-            else: # already serialized arrays
-                self.points = np.asarray(args[0]).reshape(shape)
-                self.vectors = np.asarray(args[1]).reshape(shape)
-            
-        else:
-            raise ValueError("Invalid input. Expected [X, Y, Z, U, V, W] or [[X, Y, Z], [U, V, W]].")
-        
-        if self.points.shape[1] > 3 or self.vectors.shape[1] > 3:
+            points, vectors = (np.asarray(arg) for arg in args) # already stacked arrays (e.g. from builder)
+            if shape: # already serialized (flat) arrays
+                points, vectors = points.reshape(shape), vectors.reshape(shape)
+
+            if points.ndim != 2 or vectors.ndim != 2 or points.shape[1] > 3 or vectors.shape[1] > 3:
                 raise ValueError("Input arrays must have shape (N, 3) or (N, 2) for points and vectors.")
+            if points.shape != vectors.shape:
+                raise ValueError("Points and vectors must have the same number of elements.")
 
-        if self.points.shape[0] != self.vectors.shape[0] or self.points.shape[1] != self.vectors.shape[1]:
-            raise ValueError("Points and vectors must have the same number of elements.")
-        
-        if isinstance(self.points, np.ndarray) and self.points.shape[1] < 3:
-            # fill missing dimensions with zeros
-            self.points = np.pad(self.points, ((0, 0), (0, 3 - self.points.shape[1])), mode='constant', constant_values=0)
-        elif isinstance(self.points, np.ndarray) and self.points.shape[1] > 3:
-            self.points = self.points[:, :3]
-        
-        if isinstance(self.vectors, np.ndarray) and self.vectors.shape[1] < 3:
-            # fill missing dimensions with zeros
-            self.vectors = np.pad(self.vectors, ((0, 0), (0, 3 - self.vectors.shape[1])), mode='constant', constant_values=0)
-        elif isinstance(self.vectors, np.ndarray) and self.vectors.shape[1] > 3:
-            self.vectors = self.vectors[:, :3]
+            self.points = _as_vec3(points)
+            self.vectors = _as_vec3(vectors)
+
+        else:
+            raise ValueError("Invalid input. Expected [X, Y, Z, U, V, W], [X, Y, U, V] or [[X, Y, Z], [U, V, W]].")
 
         self._object = object
         # Other attributes
@@ -97,7 +104,14 @@ class Quiver(SceneObject):
         self._color_scheme = kwargs.get('colorscheme', None) if kwargs.get('colorscheme', None) in Quiver.color_schemes else None
         self._min_length = min_length
         self._max_length = max_length
-        self._bounds = self.points.min(axis=0).tolist() + self.points.max(axis=0).tolist()
+        if len(self.points):
+            self._bounds = [float(column.min()) for column in self.points.T] + [float(column.max()) for column in self.points.T] # per column is faster than axis=0
+        else:
+            self._bounds = [0.0] * (2 * self.points.shape[1])
+        self._lod = lod
+        self._lod_levels = lod_levels
+        self._lod_budget = lod_budget
+        self._precompute = bool(precompute)
 
         super().__init__(material=None, **kwargs) # No material, since the target object has it's own
 
@@ -194,11 +208,142 @@ class Quiver(SceneObject):
         """Set the title of the quiver plot."""
         self._title = value
 
-    def to_dict(self):
+    def lod_indices(self, level: int) -> np.ndarray:
+        """Get the indices of the arrows kept at a level of detail, computed on first use.
+
+        Levels are nested: each one is downsampled from the previous, so coarser levels are subsets of finer ones.
+
+        Args:
+            level (int): The level, 0 is the full field.
+
+        Raises:
+            ValueError: If the level doesn't exist.
+
+        Returns:
+            np.ndarray: The sorted arrow indices.
+        """
+        levels = self._lod_levels if self._lod is not None else 1
+        if not 0 <= level < levels:
+            raise ValueError(f"Quiver has no level of detail {level}, expected 0 to {levels - 1}")
+
+        key = (self._version, self._lod, len(self.points))
+        cached = getattr(self, "_lod_cache", None)
+        if cached is None or cached[0] != key:
+            cached = (key, [np.arange(len(self.points))])
+            self._lod_cache = cached
+        indices = cached[1]
+
+        weights = self.magnitudes() # important (long) arrows are kept preferably
+        while len(indices) <= level:
+            previous = indices[-1]
+            target = max(1, len(self.points) // LOD_RATIO ** len(indices))
+            indices.append(previous[self._downsample(self.points[previous], weights[previous], target)])
+        return indices[level]
+
+    def _downsample(self, points: np.ndarray, weights: np.ndarray, target: int) -> np.ndarray:
+        """Select about target of the points with the configured method, calibrating the cell size (or disk radius)."""
+        if len(points) <= target:
+            return np.arange(len(points))
+        extents = points.max(axis=0) - points.min(axis=0)
+        dims = max(1, int(np.count_nonzero(extents > 0)))
+        size = (np.prod(extents[extents > 0]) / target) ** (1 / dims) if np.any(extents > 0) else 1.0
+        sample = grid_sample if self._lod == "grid" else poisson_disk_sample
+
+        for _ in range(4):
+            selected = sample(points, size, weights)
+            ratio = len(selected) / target
+            if 0.8 <= ratio <= 1.25:
+                break
+            size *= ratio ** (1 / dims) # fewer cells (larger ones) for too many arrows
+        return selected
+
+    def lod_counts(self) -> List[int]:
+        """Get the number of arrows per level of detail."""
+        levels = self._lod_levels if self._lod is not None else 1
+        return [len(self.lod_indices(level)) for level in range(levels)]
+
+    def lod_level(self, budget: int) -> int:
+        """Get the finest level of detail with at most budget arrows (or the coarsest level)."""
+        counts = self.lod_counts()
+        return next((level for level, count in enumerate(counts) if count <= budget), len(counts) - 1)
+
+    def lod_dict(self, level: int) -> dict:
+        """Serialize the arrows of a level of detail, as in to_dict()["args"].
+
+        Args:
+            level (int): The level, 0 is the full field.
+
+        Returns:
+            dict: The level, its arrow count, shape and packed points and vectors (and instance attributes, see precompute).
+        """
+        indices = self.lod_indices(level)
+        data = {
+            "level": level,
+            "count": len(indices),
+            "args": (pack_array(self.points[indices].ravel()), pack_array(self.vectors[indices].ravel())),
+            "shape": (len(indices), self.points.shape[1])
+        }
+        if self._precompute:
+            data.update(self.instance_attributes(indices))
+        return data
+
+    def magnitudes(self, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """Get the lengths of (a subset of) the vectors, computed once per version of the quiver.
+
+        Args:
+            indices (Optional[np.ndarray], optional): The arrow indices. Defaults to all arrows.
+
+        Returns:
+            np.ndarray: The magnitudes as float32 array, read-only.
+        """
+        key = (self._version, len(self.vectors))
+        cached = getattr(self, "_magnitude_cache", None)
+        if cached is None or cached[0] != key:
+            magnitudes = np.sqrt(np.einsum("nd,nd->n", self.vectors, self.vectors))
+            magnitudes.flags.writeable = False
+            cached = (key, magnitudes)
+            self._magnitude_cache = cached
+        return cached[1] if indices is None else cached[1][indices]
+
+    def instance_attributes(self, indices: Optional[np.ndarray] = None) -> dict:
+        """Compute what the viewer otherwise computes per arrow, i.e. the visual arrow lengths and (with a colorscheme)
+        the colors, as buildVectorFieldMeshCPU does. Lengths and colormap values are normalized over the full field.
+
+        Args:
+            indices (Optional[np.ndarray], optional): The arrow indices, e.g. of a level of detail. Defaults to all arrows.
+
+        Returns:
+            dict: The packed "lengths" (float16) and "colors" (uint8 RGB, None without a colorscheme).
+        """
+        magnitudes = self.magnitudes()
+        low, high = (float(magnitudes.min()), float(magnitudes.max())) if len(magnitudes) else (0.0, 0.0)
+        if indices is not None:
+            magnitudes = magnitudes[indices]
+        normalized = np.divide(magnitudes - low, high - low, out=np.zeros_like(magnitudes), where=high > low)
+        lengths = self._min_length + normalized * (self._max_length - self._min_length)
+
+        colors = None
+        if self._color_scheme is not None:
+            colormap = (self.colormap or "magnitude").lower()
+            if colormap in ("x", "y", "z"): # position along the axis within the bounds
+                axis = "xyz".index(colormap)
+                low, high = self._bounds[axis], self._bounds[axis + 3]
+                points = self.points[:, axis] if indices is None else self.points[indices, axis]
+                values = np.divide(points - low, high - low, out=np.zeros_like(points), where=high > low)
+            else:
+                values = normalized
+            colors = pack_array(apply_colormap(values, self._color_scheme), dtype=np.uint8)
+
         return {
+            "lengths": pack_array(lengths, dtype=np.float16),
+            "colors": colors
+        }
+
+    def to_dict(self):
+        data = {
             "type": "Quiver",
             "object": self.object.to_dict(),
-            "args": (self.points.flatten().tolist(), self.vectors.flatten().tolist()),
+            "args": (pack_array(self.points.ravel()), pack_array(self.vectors.ravel())),
             "colormap": self.colormap,
             "colorscheme": self._color_scheme,
             "min_length": self._min_length,
@@ -206,3 +351,42 @@ class Quiver(SceneObject):
             "bounds": self._bounds,
             "shape": (self.points.shape[0], self.points.shape[1])
         }
+        if self._precompute:
+            data["precompute"] = True
+        if self._lod is not None:
+            data.update({"lod": self._lod, "lod_levels": self._lod_levels, "lod_budget": self._lod_budget})
+
+        if packing_mode() != "binary": # saved scenes keep all arrows, the viewer gets a level of detail and precomputed data
+            return data
+
+        if self._lod is not None and not len(self.points):
+            data["magnitude_range"] = [0.0, 0.0] # no arrows, so no levels of detail either
+        elif self._lod is not None:
+            level = self.lod_level(self._lod_budget)
+            magnitudes = self.magnitudes()
+            data.update(self.lod_dict(level))
+            data.update({
+                "lod_level": data.pop("level"),
+                "lod_counts": self.lod_counts(),
+                "magnitude_range": [float(magnitudes.min()), float(magnitudes.max())] # of the full field, so all levels scale alike
+            })
+            data.pop("count")
+        elif self._precompute:
+            data.update(self.instance_attributes())
+        return data
+
+
+def _stack_columns(columns: List[np.ndarray]) -> np.ndarray:
+    """Fill coordinate arrays (of any, equal shape) into the columns of a float32 (N, 3) array, missing columns are 0."""
+    stacked = np.zeros((columns[0].size, 3), dtype=np.float32)
+    for i, column in enumerate(columns):
+        stacked[:, i] = column.reshape(-1) # a view for contiguous (e.g. meshgrid) arrays
+    return stacked
+
+def _as_vec3(array: np.ndarray) -> np.ndarray:
+    """Get a float32 (N, 3) version of an (N, D <= 3) array, the array itself if it already is one."""
+    if array.shape[1] == 3 and array.dtype == np.float32 and array.flags.c_contiguous:
+        return array
+    vec3 = np.zeros((len(array), 3), dtype=np.float32)
+    vec3[:, :array.shape[1]] = array
+    return vec3
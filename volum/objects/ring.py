@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 class Ring(SceneObject):
     """Represents a ring in 3D space."""
@@ -43,30 +44,18 @@ class Ring(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
-        px, py, pz = point
-        r = np.sqrt(px**2 + pz**2)
+    def distance_to_many(self, points):
+        points = as_points(points)
+        r = np.hypot(points[:, 0], points[:, 1])
 
-        if self.inner_radius <= r <= self.outer_radius:
-            # Point is above or below the ring
-            return abs(py)
-        elif r < self.inner_radius:
-            # Closest point is on the inner edge
-            closest_r = self.inner_radius
-        else:
-            # Closest point is on the outer edge
-            closest_r = self.outer_radius
+        # The ring lies in the z = 0 plane, like the viewer's three.js RingGeometry. Points in front of or behind it are
+        # closest to the ring itself, others to its inner or outer edge
+        closest_r = np.clip(r, self.inner_radius, self.outer_radius)
+        return np.hypot(r - closest_r, points[:, 2])
 
-        # Closest point on ring's edge in XZ plane
-        if r == 0:
-            # Arbitrary direction when point is at origin
-            closest_xz = np.array([closest_r, 0, 0])
-        else:
-            closest_xz = np.array([px, 0, pz]) * (closest_r / r)
+    def bounds(self):
+        extents = np.array([self.outer_radius, self.outer_radius, 0])
+        return -extents, extents
 
-        closest_point = np.array([closest_xz[0], 0, closest_xz[2]])
-        point_vec = np.array([px, py, pz])
-        return np.linalg.norm(point_vec - closest_point)
-    
     def __repr__(self):
         return f"Ring(inner_radius={self.inner_radius}, outer_radius={self.outer_radius}, segments={self.segments}, perimeter={self.perimeter}, perimeter_start={self.perimeter_start}, material={self.material})"
\ No newline at end of file
@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 
 class Sphere(SceneObject):
@@ -32,9 +33,11 @@ class Sphere(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
-        radius = self.radius
-        return np.linalg.norm(point) - radius
+    def distance_to_many(self, points):
+        return np.linalg.norm(as_points(points), axis=1) - self.radius
+
+    def bounds(self):
+        return np.full(3, -self.radius), np.full(3, self.radius)
 
     def __repr__(self):
         return f"Sphere(radius={self.radius}, material={self.material})"
\ No newline at end of file
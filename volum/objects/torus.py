@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points
 
 class Torus(SceneObject):
     """Represents a torus in 3D space."""
@@ -44,10 +45,15 @@ class Torus(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
-        x, y, z = point
-        q = np.array([np.sqrt(x**2 + z**2) - self.radius, y])
-        return np.linalg.norm(q) - self.tube_radius
+    def distance_to_many(self, points):
+        points = as_points(points)
+        # The tube's centre circle lies in the z = 0 plane, like the viewer's three.js TorusGeometry
+        q = np.hypot(points[:, 0], points[:, 1]) - self.radius
+        return np.hypot(q, points[:, 2]) - self.tube_radius
+
+    def bounds(self):
+        extents = np.array([self.radius + self.tube_radius, self.radius + self.tube_radius, self.tube_radius])
+        return -extents, extents
 
     def __repr__(self):
         return f"Torus(radius={self.radius}, tube_radius={self.tube_radius}, radial_segments={self.radial_segments}, tubular_segments={self.tubular_segments}, arc={self.arc}, material={self.material})"
\ No newline at end of file
@@ -2,6 +2,7 @@ import numpy as np
 from typing import Optional
 from volum.core.scene import SceneObject
 from volum.core.materials import StandardMaterial, MeshMaterial
+from volum.core.geometry import as_points, chunks
 
 class TorusKnot(SceneObject):
     """Represents a torus knot in 3D space."""
@@ -47,24 +48,87 @@ class TorusKnot(SceneObject):
             "material": self.material.to_dict()
         }
     
-    def distance_to(self, point):
-        t_vals = np.linspace(0, 2 * np.pi, 500)
-        min_dist = float('inf')
-        point = np.array(point)
-
-        for t in t_vals:
-            knot_pt = self._torus_knot_point(t, self.p, self.q, self.radius, self.tube_radius)
-            dist = np.linalg.norm(point - knot_pt)
-            if dist < min_dist:
-                min_dist = dist
-
-        return min_dist
-    
-    def _torus_knot_point(self, t, p, q, R, r):
-        x = (R + r * np.cos(q * t)) * np.cos(p * t)
-        y = (R + r * np.cos(q * t)) * np.sin(p * t)
-        z = r * np.sin(q * t)
-        return np.array([x, y, z])
+    def distance_to_many(self, points, samples: Optional[int] = None, iterations: int = 12):
+        """Compute the signed distances of points to the knot's tube surface.
+
+        The closest point on the knot's center curve is found by a coarse sampling of the curve, refined by
+        safeguarded Newton iterations on the curve parameter, the tube radius is subtracted from its distance.
+
+        Args:
+            points: The query point(s), of shape (3,) or (N, 3).
+            samples (Optional[int], optional): The number of coarse curve samples. Defaults to 32 per winding (p + q).
+            iterations (int, optional): The number of refinement iterations. Defaults to 12.
+
+        Returns:
+            np.ndarray: The distances, negative inside the tube.
+        """
+        points = as_points(points)
+        if samples is None:
+            samples = max(64, 32 * (abs(self.p) + abs(self.q)))
+        step = 2 * np.pi / samples
+        t_samples = np.arange(samples) * step
+        curve = self._curve(t_samples)
+        curve_sq = np.sum(curve**2, axis=1)
+
+        distances = np.empty(len(points))
+        for rows in chunks(len(points), samples):
+            block = points[rows]
+            # squared distances of all points to all curve samples, |p|^2 - 2 p.c + |c|^2
+            dist_sq = np.sum(block**2, axis=1)[:, None] - 2 * block @ curve.T + curve_sq[None, :]
+            closest = dist_sq.argmin(axis=1)
+            best_sq = np.maximum(dist_sq[np.arange(len(block)), closest], 0)
+
+            # the closest sample is at most as far as its neighbours, so the bracket contains a local minimum
+            t = t_samples[closest]
+            lower, upper = t - step, t + step
+            for _ in range(iterations):
+                c, dc, ddc = self._curve(t, derivatives=True)
+                offset = c - block
+                slope = np.sum(dc * offset, axis=1) # half the derivative of the squared distance
+                curvature = np.sum(ddc * offset, axis=1) + np.sum(dc * dc, axis=1)
+
+                # shrink the bracket around the root of the slope, Newton steps that leave it fall back to bisection
+                lower = np.where(slope < 0, t, lower)
+                upper = np.where(slope > 0, t, upper)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    newton = t - slope / curvature
+                inside = (curvature > 0) & (newton >= lower) & (newton <= upper) # a converged step lands on the bracket
+                t = np.where(inside, newton, 0.5 * (lower + upper))
+
+            refined_sq = np.sum((self._curve(t) - block)**2, axis=1)
+            distances[rows] = np.sqrt(np.minimum(refined_sq, best_sq))
+        return distances - self.tube_radius
+
+    def bounds(self):
+        # the center curve stays within radius / 2 of the circle of the given radius in the xy plane, plus the tube
+        radial, height = 1.5 * self.radius + self.tube_radius, 0.5 * self.radius + self.tube_radius
+        return np.array([-radial, -radial, -height]), np.array([radial, radial, height])
+
+    def _curve(self, t: np.ndarray, derivatives: bool = False):
+        """Get the points of the knot's center curve (as THREE.TorusKnotGeometry) for the parameters t in [0, 2 pi).
+
+        Args:
+            t (np.ndarray): The curve parameters.
+            derivatives (bool, optional): Also return the first and second derivatives. Defaults to False.
+
+        Returns:
+            The curve points of shape (N, 3), or a tuple of points and both derivatives.
+        """
+        p, q, offset = self.p, self.q, 0.5 * self.radius
+        cos_p, sin_p, cos_q, sin_q = np.cos(p * t), np.sin(p * t), np.cos(q * t), np.sin(q * t)
+        rho = self.radius + offset * cos_q # distance from the z axis
+        points = np.stack([rho * cos_p, rho * sin_p, offset * sin_q], axis=-1)
+        if not derivatives:
+            return points
+
+        d_rho, dd_rho = -offset * q * sin_q, -offset * q * q * cos_q
+        first = np.stack([d_rho * cos_p - rho * p * sin_p,
+                          d_rho * sin_p + rho * p * cos_p,
+                          offset * q * cos_q], axis=-1)
+        second = np.stack([dd_rho * cos_p - 2 * d_rho * p * sin_p - rho * p * p * cos_p,
+                           dd_rho * sin_p + 2 * d_rho * p * cos_p - rho * p * p * sin_p,
+                           -offset * q * q * sin_q], axis=-1)
+        return points, first, second
 
     def __repr__(self):
         return f"TorusKnot(radius={self.radius}, tube_radius={self.tube_radius}, radial_segments={self.radial_segments}, tubular_segments={self.tubular_segments}, p={self.p}, q={self.q})"
\ No newline at end of file
@@ -1,14 +1,52 @@
+import numpy as np
+from typing import Tuple
 from volum.core.scene import SceneObject
+from volum.core.geometry import as_points, transformed_distances
+
+
+def _rotation_matrix_from_euler(rx, ry, rz):
+    """Rotation matrix for Euler angles in radians, in XYZ order as the viewer (three.js) applies them."""
+    return _rotation_matrices(np.array([[rx, ry, rz]], dtype=float))[0]
+
+def _rotation_matrices(angles: np.ndarray) -> np.ndarray:
+    """Rotation matrices Rx @ Ry @ Rz for many Euler angle triples in radians at once.
+
+    Args:
+        angles (np.ndarray): The angles, of shape (N, 3).
+
+    Returns:
+        np.ndarray: The rotation matrices, of shape (N, 3, 3).
+    """
+    cx, cy, cz = np.cos(angles).T
+    sx, sy, sz = np.sin(angles).T
+
+    R = np.empty((len(angles), 3, 3))
+    R[:, 0, 0] = cy * cz
+    R[:, 0, 1] = -cy * sz
+    R[:, 0, 2] = sy
+    R[:, 1, 0] = cx * sz + sx * sy * cz
+    R[:, 1, 1] = cx * cz - sx * sy * sz
+    R[:, 1, 2] = -sx * cy
+    R[:, 2, 0] = sx * sz - cx * sy * cz
+    R[:, 2, 1] = sx * cz + cx * sy * sz
+    R[:, 2, 2] = cx * cy
+    return R
+
+def _apply(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Apply an affine 4x4 matrix to points of shape (N, 3)."""
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
 
 class Transform(SceneObject):
     """Represents a transformation applied to a SceneObject, including position, rotation, and scale."""
+    _untracked_attributes = frozenset({"_matrix_cache", "_composed_cache"}) # cached matrices are no change
     def __init__(self, object: SceneObject, position=None, rotation=None, scale=None):
         """Transform a SceneObject by applying position, rotation, and scale.
 
         Args:
             object (SceneObject): The SceneObject to transform.
             position (list, optional): The position to apply. Defaults to None.
-            rotation (list, optional): The rotation to apply. Defaults to None.
+            rotation (list, optional): The rotation to apply, as Euler angles in degrees (XYZ order). Defaults to None.
             scale (list, optional): The scale to apply. Defaults to None.
 
         Raises:
@@ -33,67 +71,113 @@ class Transform(SceneObject):
             "object": self.object.to_dict()
         }
 
+    def _key(self) -> tuple:
+        # compared by value, so in-place changes of the position, rotation or scale lists invalidate the cache, too
+        return (tuple(map(float, self.position)), tuple(map(float, self.rotation)), tuple(map(float, self.scale)))
+
+    def _matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the cached 4x4 matrix (scale, then rotate, then translate) and its inverse."""
+        key = self._key()
+        cached = getattr(self, "_matrix_cache", None)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+
+        position, rotation, scale = (np.array(value, dtype=float) for value in key)
+        if len(position) != 3 or len(rotation) != 3 or len(scale) != 3:
+            raise ValueError("Position, rotation, and scale must be 3D vectors.")
+        R = _rotation_matrix_from_euler(*np.radians(rotation)) # in degrees, as in the viewer
+        inverse_scale = np.divide(1, scale, out=np.zeros(3), where=scale != 0) # a zero scale collapses the axis
+
+        matrix = np.eye(4)
+        matrix[:3, :3] = R * scale # R @ diag(scale)
+        matrix[:3, 3] = position
+        inverse = np.eye(4)
+        inverse[:3, :3] = inverse_scale[:, None] * R.T # diag(1 / scale) @ R^-1
+        inverse[:3, 3] = -inverse[:3, :3] @ position
+
+        self._matrix_cache = (key, matrix, inverse)
+        return matrix, inverse
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The 4x4 matrix from the object's local space to this transform's parent space."""
+        return self._matrices()[0]
+
+    @property
+    def inverse_matrix(self) -> np.ndarray:
+        """The 4x4 matrix from this transform's parent space to the object's local space."""
+        return self._matrices()[1]
+
+    def composed(self) -> Tuple[np.ndarray, np.ndarray, SceneObject]:
+        """Collapse a chain of nested Transforms into a single matrix.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, SceneObject]: The composed matrix from the innermost object's local space to
+                this transform's parent space, its inverse and the innermost (not Transform) object.
+        """
+        chain = [self]
+        while isinstance(chain[-1].object, Transform):
+            chain.append(chain[-1].object)
+        key = (tuple(transform._key() for transform in chain), tuple(id(transform) for transform in chain), id(chain[-1].object))
+
+        cached = getattr(self, "_composed_cache", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        matrix, inverse = np.eye(4), np.eye(4)
+        for transform in chain:
+            local, local_inverse = transform._matrices()
+            matrix = matrix @ local
+            inverse = local_inverse @ inverse
+
+        composed = (matrix, inverse, chain[-1].object)
+        self._composed_cache = (key, composed)
+        return composed
+
     def inverse_transform_point(self, point):
         """Apply the inverse transformation to a point in 3D space."""
-        import numpy as np
-
-        def rotation_matrix_from_euler(rx, ry, rz):
-            # Basic Euler XYZ rotation matrices
-            cx, sx = np.cos(rx), np.sin(rx)
-            cy, sy = np.cos(ry), np.sin(ry)
-            cz, sz = np.cos(rz), np.sin(rz)
-
-            Rx = np.array([
-                [1, 0, 0],
-                [0, cx, -sx],
-                [0, sx, cx]
-            ])
-
-            Ry = np.array([
-                [cy, 0, sy],
-                [0, 1, 0],
-                [-sy, 0, cy]
-            ])
-
-            Rz = np.array([
-                [cz, -sz, 0],
-                [sz, cz, 0],
-                [0, 0, 1]
-            ])
-
-            # Apply rotations in ZYX order (common in graphics)
-            return Rz @ Ry @ Rx
-    
-        def inverse_rotation_matrix(euler):
-            rx, ry, rz = euler
-            # Inverse rotation is R(-z) @ R(-y) @ R(-x)
-            return rotation_matrix_from_euler(-rx, -ry, -rz)
-
-
-        point = np.array(point)
-        pos = np.array(self.position)
-        rot = np.array(self.rotation)
-        scale = np.array(self.scale)
-        if len(point) != 3 or len(pos) != 3 or len(rot) != 3 or len(scale) != 3:
-            raise ValueError("Point, position, rotation, and scale must be 3D vectors.")
-        # Remove translation
-        local_point = point - pos
-    
-        # Inverse rotation
-        R_inv = inverse_rotation_matrix(rot)
-        local_point = R_inv @ local_point
-    
-        # Inverse scale
-        with np.errstate(divide='ignore', invalid='ignore'):
-            local_point = np.divide(local_point, scale, out=np.zeros_like(local_point), where=scale!=0)
-    
-        return local_point
-    
-
-    def distance_to(self, point):
-        local_point = self.inverse_transform_point(point)
-        object = self.object
-        return object.distance_to(local_point)
-    
+        return self.inverse_transform_points(point)[0]
+
+    def inverse_transform_points(self, points) -> np.ndarray:
+        """Apply the inverse transformation to many points at once.
+
+        Args:
+            points (array-like): The points, of shape (N, 3).
+
+        Returns:
+            np.ndarray: The points in the object's local space, of shape (N, 3).
+        """
+        return _apply(self.inverse_matrix, as_points(points))
+
+    def transform_points(self, points) -> np.ndarray:
+        """Apply the transformation to many points at once, the inverse of inverse_transform_points().
+
+        Args:
+            points (array-like): The points in the object's local space, of shape (N, 3).
+
+        Returns:
+            np.ndarray: The transformed points, of shape (N, 3).
+        """
+        return _apply(self.matrix, as_points(points))
+
+    def distance_to_many(self, points):
+        # Nested transforms are applied at once, local distances are mapped back into the parent space
+        matrix, inverse, obj = self.composed()
+        local = _apply(inverse, as_points(points))
+        return transformed_distances(obj.distance_to_many, matrix[:3, :3], local, obj.distance_to_many(local))
+
+    def bounds(self):
+        matrix, _, obj = self.composed()
+        local_bounds = obj.bounds()
+        if local_bounds is None:
+            return None
+        lower, upper = local_bounds
+        corners = np.array([[x, y, z] for x in (lower[0], upper[0]) for y in (lower[1], upper[1]) for z in (lower[2], upper[2])])
+        corners = _apply(matrix, corners)
+        return corners.min(axis=0), corners.max(axis=0)
+
+    def prepare(self):
+        self.object.prepare()
+
     def __repr__(self):
         return f"Transform(object={self.object}, position={self.position}, rotation={self.rotation}, scale={self.scale})"
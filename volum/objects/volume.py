@@ -1,29 +1,271 @@
+import os
 import numpy as np
+from typing import List, Optional, Tuple
 from volum.core.scene import SceneObject
+from volum.core.geometry import as_points
+from volum.core.buffers import packing_mode
+from volum.core.bricks import BRICK_SIZE, downsample, pyramid_shapes, brick_counts, brick_box
+from volum.core.volumes import QUANTIZE_TYPES, open_volume, quantize, value_range, volume_statistics
 
 class Volume(SceneObject):
     """Represents a 3D volume object via a file path."""
-    def __init__(self, width: float, height: float, depth: float, file_path: str):
-        super().__init__()
+    quantize_types = QUANTIZE_TYPES
+    quantize_scales = ["volume", "brick"]
+    # opening, downsampling and analyzing the volume is no change
+    _untracked_attributes = frozenset({"_source_cache", "_pyramid_cache", "_range_cache", "_brick_range_cache", "_statistics_cache"})
+
+    def __init__(self, width: float, height: float, depth: float, file_path: str, shape: Optional[Tuple[int, int, int]] = None,
+                 dtype: Optional[str] = None, brick_size: int = BRICK_SIZE, quantize: Optional[str] = None, quantize_scale: str = "volume",
+                 statistics: bool = False, **kwargs):
+        """Volume constructor. Volumes the server can open (NPY, raw or Zarr files) are memory-mapped and streamed to
+        the viewer in bricks, coarse levels first, see pyramid_level() and brick(). Other paths are loaded by the viewer.
+
+        Args:
+            width (float): The width of the volume in the scene.
+            height (float): The height of the volume in the scene.
+            depth (float): The depth of the volume in the scene.
+            file_path (str): The volume file, stored x-fastest.
+            shape (Optional[Tuple[int, int, int]], optional): The sample counts (x, y, z), required for raw files.
+            dtype (Optional[str], optional): The sample type, required for raw files, e.g. "uint8".
+            brick_size (int, optional): Edge length of the bricks the volume is served in. Defaults to BRICK_SIZE.
+            quantize (Optional[str], optional): Serve the samples as "uint8" or "uint16", scaled from their min/max range.
+                Defaults to None, i.e. integer samples as they are and others as float32.
+            quantize_scale (str, optional): Scale by the range of the whole "volume" or of each "brick" (more precise,
+                see brick_range()). Defaults to "volume".
+            statistics (bool, optional): Send the value and gradient magnitude histograms with the scene, computed
+                by prepare() when the volume is added to it (see statistics()). Defaults to False.
+        """
+        super().__init__(material=None, **kwargs) # rendered by the viewer's volume shader
+        if not isinstance(brick_size, int) or brick_size < 2:
+            raise ValueError("brick_size must be an integer of at least 2")
         self.file_path = file_path
         self.width = width
         self.height = height
         self.depth = depth
+        self.shape = tuple(shape) if shape is not None else None
+        self.dtype = dtype
+        self.brick_size = brick_size
+
+        if quantize is not None and quantize not in Volume.quantize_types:
+            raise ValueError(f"quantize must be one of {Volume.quantize_types} or None")
+        if quantize_scale not in Volume.quantize_scales:
+            raise ValueError(f"quantize_scale must be one of {Volume.quantize_scales}")
+        self.quantize = quantize
+        self.quantize_scale = quantize_scale
+        self.statistics_enabled = bool(statistics)
+
+    def has_source(self) -> bool:
+        """Check whether the server serves the volume data, i.e. the file exists locally."""
+        return os.path.exists(self.file_path)
+
+    def data(self):
+        """Get the volume data, opened once without loading it into memory (see open_volume).
+
+        Returns:
+            The volume, indexed [x, y, z].
+        """
+        key = (self.file_path, self.shape, self.dtype)
+        cached = getattr(self, "_source_cache", None)
+        if cached is None or cached[0] != key:
+            cached = (key, open_volume(self.file_path, self.shape, self.dtype))
+            self._source_cache = cached
+        return cached[1]
+
+    def pyramid_level(self, level: int):
+        """Get a level of the volume's pyramid. Level 0 is the (memory-mapped) volume itself, coarser levels halve the
+        previous one by mean pooling and are kept in memory once computed.
+
+        Args:
+            level (int): The level.
+
+        Raises:
+            ValueError: If the level doesn't exist.
+
+        Returns:
+            The volume at that level, indexed [x, y, z].
+        """
+        data = self.data()
+        shapes = pyramid_shapes(data.shape, self.brick_size)
+        if not 0 <= level < len(shapes):
+            raise ValueError(f"Volume has no pyramid level {level}, expected 0 to {len(shapes) - 1}")
+
+        key = (self.file_path, self.shape, self.dtype, self.brick_size)
+        cached = getattr(self, "_pyramid_cache", None)
+        if cached is None or cached[0] != key:
+            cached = (key, [data])
+            self._pyramid_cache = cached
+        levels = cached[1]
+        while len(levels) <= level:
+            levels.append(self._downsample(levels[-1]))
+        return levels[level]
+
+    def _downsample(self, field) -> np.ndarray:
+        """Mean pooling, integer volumes keep their sample type on all levels."""
+        pooled = downsample(field, "mean")
+        if np.issubdtype(field.dtype, np.integer):
+            return np.round(pooled).astype(field.dtype)
+        return pooled
+
+    def brick(self, level: int, index: tuple) -> np.ndarray:
+        """Get a brick of a pyramid level, i.e. a sub-box of brick_size samples per axis (plus one overlapping sample).
+
+        Args:
+            level (int): The pyramid level.
+            index (tuple): The brick index along each axis.
+
+        Raises:
+            ValueError: If the level or brick doesn't exist.
+
+        Returns:
+            np.ndarray: The brick's samples, indexed [x, y, z]. Integer samples keep their type, others are float32.
+        """
+        field = self.pyramid_level(level)
+        values = np.asarray(field[brick_box(field.shape, index, self.brick_size)])
+        if self.quantize is not None:
+            return quantize(values, *self._quantize_range(level, index, values), self.quantize)
+        return values if np.issubdtype(values.dtype, np.integer) else values.astype(np.float32)
+
+    def value_range(self) -> Tuple[float, float]:
+        """Get the minimum and maximum sample of the volume, computed once."""
+        cached = getattr(self, "_range_cache", None)
+        if cached is None:
+            cached = self._range_cache = value_range(self.data())
+        return cached
+
+    def brick_range(self, level: int, index: tuple) -> Optional[Tuple[float, float]]:
+        """Get the range a quantized brick was scaled from, i.e. the sample 0 stands for its minimum and the type's
+        maximum for its maximum. Only bricks quantized by their own range (quantize_scale='brick') have one.
+
+        Args:
+            level (int): The pyramid level.
+            index (tuple): The brick index along each axis.
+
+        Returns:
+            Optional[Tuple[float, float]]: The brick's range, or None.
+        """
+        if self.quantize is None or self.quantize_scale != "brick":
+            return None
+        return self._quantize_range(level, index)
+
+    def _quantize_range(self, level: int, index: tuple, values: Optional[np.ndarray] = None) -> Tuple[float, float]:
+        if self.quantize_scale == "volume":
+            return self.value_range()
+        ranges = getattr(self, "_brick_range_cache", None)
+        if ranges is None:
+            ranges = self._brick_range_cache = {}
+        key = (level, tuple(index))
+        if key not in ranges:
+            if values is None:
+                field = self.pyramid_level(level)
+                values = np.asarray(field[brick_box(field.shape, index, self.brick_size)])
+            ranges[key] = (float(values.min()), float(values.max()))
+        return ranges[key]
+
+    def statistics(self) -> dict:
+        """Get the value range and histogram and the gradient magnitude range and histogram of the volume (see
+        volume_statistics), computed once.
+        """
+        cached = getattr(self, "_statistics_cache", None)
+        if cached is None:
+            cached = self._statistics_cache = volume_statistics(self.data())
+        return cached
+
+    def prepare(self):
+        """Compute the statistics (if enabled) ahead of time, so serializing the scene only reads them."""
+        if self.statistics_enabled and self.has_source():
+            self.statistics()
+
+    def pyramid_dict(self) -> dict:
+        """Describe the pyramid, i.e. the sample type (of all levels), the brick size and per level its shape and brick
+        counts. Quantized volumes add the volume's value range and how bricks are scaled.
+        """
+        data = self.data()
+        shapes = pyramid_shapes(data.shape, self.brick_size)
+        pyramid = {
+            "dtype": self.quantize or np.dtype(data.dtype).name,
+            "brick_size": self.brick_size,
+            "shapes": [list(shape) for shape in shapes],
+            "bricks": [list(brick_counts(shape, self.brick_size)) for shape in shapes]
+        }
+        if self.quantize is not None:
+            pyramid.update({"range": list(self.value_range()), "quantize_scale": self.quantize_scale})
+        return pyramid
+
+    def invalidate(self, lower: Optional[List[int]] = None, upper: Optional[List[int]] = None) -> List[Tuple[int, int, int]]:
+        """Mark a region of the volume as changed, e.g. after the file was written to. Coarser levels are updated
+        within the region only.
+
+        Args:
+            lower (Optional[List[int]], optional): The first changed sample along each axis. Defaults to the origin.
+            upper (Optional[List[int]], optional): The end (exclusive) of the changed samples. Defaults to the shape.
+
+        Returns:
+            List[Tuple[int, int, int]]: The changed (dirty) bricks of level 0.
+        """
+        previous_range = getattr(self, "_range_cache", None)
+        self._source_cache = None # reopen, in case the file was replaced rather than written to
+        self._range_cache = self._brick_range_cache = self._statistics_cache = None
+        data = self.data()
+        shape = np.asarray(data.shape)
+        lower = np.clip(np.zeros(3, dtype=int) if lower is None else np.asarray(lower, dtype=int), 0, shape)
+        upper = np.clip(shape if upper is None else np.asarray(upper, dtype=int), lower, shape)
+
+        cached = getattr(self, "_pyramid_cache", None)
+        if cached is not None and tuple(cached[1][0].shape) != tuple(data.shape):
+            self._pyramid_cache = cached = None # resized, recomputed on demand
+        if cached is not None:
+            levels = cached[1]
+            levels[0] = data
+            low, high = lower, upper
+            for level in range(1, len(levels)):
+                low, high = low // 2, (high + 1) // 2 # the pooled samples covering the region
+                previous = levels[level - 1]
+                block = previous[2 * low[0]:min(2 * high[0], previous.shape[0]), 2 * low[1]:min(2 * high[1], previous.shape[1]), 2 * low[2]:min(2 * high[2], previous.shape[2])]
+                levels[level][low[0]:high[0], low[1]:high[1], low[2]:high[2]] = self._downsample(block)
+
+        self.prepare() # the statistics of the new data
+        self.mark_dirty()
+        if self.quantize is not None and self.quantize_scale == "volume" and previous_range is not None and previous_range != self.value_range():
+            lower, upper = np.zeros(3, dtype=int), shape # all bricks are scaled differently now
+        if np.any(upper <= lower):
+            return []
+        # samples on a brick border are shared with the previous brick
+        first = np.maximum(lower - 1, 0) // self.brick_size
+        last = np.minimum((upper - 1) // self.brick_size, np.asarray(brick_counts(shape, self.brick_size)) - 1)
+        return [(int(i), int(j), int(k)) for i in range(first[0], last[0] + 1) for j in range(first[1], last[1] + 1) for k in range(first[2], last[2] + 1)]
 
     def to_dict(self):
-        return {
+        data = {
             "type": "Volume",
             "file_path": self.file_path,
             "width": self.width,
             "height": self.height,
             "depth": self.depth,
         }
-    
-    def distance_to(self, point):
+        if self.shape is not None:
+            data.update({"shape": list(self.shape), "dtype": self.dtype})
+        if self.brick_size != BRICK_SIZE:
+            data["brick_size"] = self.brick_size
+        if self.quantize is not None:
+            data.update({"quantize": self.quantize, "quantize_scale": self.quantize_scale})
+        if self.statistics_enabled:
+            data["statistics"] = True
+        if packing_mode() == "binary" and self.has_source(): # the viewer streams the bricks from the server
+            data["pyramid"] = self.pyramid_dict()
+            statistics = getattr(self, "_statistics_cache", None) # computed by prepare(), not on the request thread
+            if self.statistics_enabled and statistics is not None:
+                data["statistics"] = statistics
+        return data
+
+    def distance_to_many(self, points):
         # Bounding box distance calculation
         half_extents = np.array([self.width, self.height, self.depth]) * 0.5
-        clamped = np.maximum(np.abs(point) - half_extents, 0)
-        return np.linalg.norm(clamped)
+        clamped = np.maximum(np.abs(as_points(points)) - half_extents, 0)
+        return np.linalg.norm(clamped, axis=1)
+
+    def bounds(self):
+        half_extents = np.array([self.width, self.height, self.depth]) * 0.5
+        return -half_extents, half_extents
 
     def __repr__(self):
-        return f"Volume(file_path={self.file_path}, width={self.width}, height={self.height}, depth={self.depth})"
\ No newline at end of file
+        return f"Volume(file_path={self.file_path}, width={self.width}, height={self.height}, depth={self.depth})"
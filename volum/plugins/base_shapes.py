@@ -4,6 +4,7 @@ from volum.objects import Box
 from volum.objects import Sphere
 from volum.objects import Plane
 from volum.objects import Transform
+from volum.objects import ObjectArray
 from volum.objects import Cylinder
 from volum.objects import Line
 from volum.objects import Capsule
@@ -24,6 +25,7 @@ class BaseShapesPlugin(ScenePlugin):
         registry.register_type("Sphere", Sphere)
         registry.register_type("Plane", Plane)
         registry.register_type("Transform", Transform)
+        registry.register_type("ObjectArray", ObjectArray)
         registry.register_type("Cylinder", Cylinder)
         registry.register_type("Line", Line)
         registry.register_type("Capsule", Capsule)